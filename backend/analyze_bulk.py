@@ -0,0 +1,314 @@
+"""
+Analyze a directory tree of requirement documents offline.
+
+Every .txt/.pdf file under the input directory goes through the same
+FileProcessor -> MLPipeline -> AIAnalyzer pipeline as the API
+(services.analysis.AnalysisService), sharded across a process pool. Results
+are written as JSONL (one analysis per line) or as Parquet part files (one
+row per requirement; needs pyarrow). A checkpoint manifest records every
+file once its results are written, so an interrupted run resumes where it
+stopped; files whose size or modification time changed are analyzed again.
+The JSONL file is compacted when the run ends, keeping the latest record of
+each path; Parquet part files keep every analysis, so readers take the
+latest analyzed_at per path.
+
+Usage (from the backend directory):
+    python analyze_bulk.py specs/ --output results.jsonl
+    python analyze_bulk.py specs/ --format parquet --output results/ --workers 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from services.ai_analyzer import AIAnalyzer, DEFAULT_MAX_CONCURRENCY
+from services.analysis import AnalysisService
+from services.file_processor import FileProcessor, SUPPORTED_EXTENSIONS
+from services.ingestion import SpooledUpload, MAX_UPLOAD_BYTES, CHUNK_SIZE
+from services.ml_pipeline import MLPipeline
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _pyarrow_available = True
+except ImportError:
+    _pyarrow_available = False
+
+FILE_SUCCEEDED = "succeeded"
+FILE_FAILED = "failed"
+# Requirement rows per Parquet part file
+DEFAULT_ROWS_PER_PART = 100_000
+# Seconds between progress lines
+PROGRESS_INTERVAL = 10.0
+
+# Pipeline and event loop of a pool worker, set up by init_worker
+_worker_service: Optional[AnalysisService] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def worker_ai_concurrency(workers: int) -> int:
+    """Share of the AI_MAX_CONCURRENCY remote request budget each of workers processes gets (at least 1)."""
+    return max(1, int(os.getenv("AI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)) // workers)
+
+
+def init_worker(ai_concurrency: Optional[int] = None):
+    """Build one pipeline per worker process; its event loop is kept so AI clients stay usable."""
+    global _worker_service, _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    # Workers parse PDFs on a thread instead of starting a nested process pool
+    file_processor = FileProcessor(pdf_workers=1, pdf_pool_min_bytes=MAX_UPLOAD_BYTES + 1)
+    _worker_service = AnalysisService(file_processor, MLPipeline(), AIAnalyzer(max_concurrency=ai_concurrency))
+
+
+def analyze_path(root: str, relative_path: str) -> Dict[str, Any]:
+    """
+    Analyze one file in a worker.
+
+    Args:
+        root (str): Input directory.
+        relative_path (str): File path relative to root; used as the result filename.
+
+    Returns:
+        Dict[str, Any]: path, status, error, result (AnalysisResponse as a dict),
+        bytes and seconds.
+    """
+    start = time.perf_counter()
+    record = {"path": relative_path, "status": FILE_SUCCEEDED, "error": None, "result": None, "bytes": 0}
+    try:
+        with SpooledUpload(relative_path) as upload:
+            with open(os.path.join(root, relative_path), "rb") as handle:
+                while True:
+                    chunk = handle.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    upload.write(chunk)
+            record["bytes"] = upload.size
+            result = _worker_loop.run_until_complete(_worker_service.analyze(upload))
+        record["result"] = result.model_dump()
+    except Exception as e:
+        record["status"] = FILE_FAILED
+        record["error"] = getattr(e, "detail", None) or str(e)
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+def find_documents(root: str) -> List[str]:
+    """Supported files under root, as sorted relative paths."""
+    paths = []
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(tuple(SUPPORTED_EXTENSIONS)) and not filename.startswith("."):
+                paths.append(os.path.relpath(os.path.join(directory, filename), root))
+    return paths
+
+
+def file_signature(root: str, relative_path: str) -> Dict[str, int]:
+    stat = os.stat(os.path.join(root, relative_path))
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class Manifest:
+    """Append-only JSONL checkpoint of processed files."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["path"]] = entry
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def is_done(self, relative_path: str, signature: Dict[str, int], retry_failed: bool) -> bool:
+        """Whether a file was already processed in its current version."""
+        entry = self.entries.get(relative_path)
+        if entry is None or entry["size"] != signature["size"] or entry["mtime_ns"] != signature["mtime_ns"]:
+            return False
+        return not (retry_failed and entry["status"] == FILE_FAILED)
+
+    def commit(self, entries: List[Dict[str, Any]]):
+        """Record files whose results are durably written."""
+        for entry in entries:
+            self.entries[entry["path"]] = entry
+            self._handle.write(json.dumps(entry) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def close(self):
+        self._handle.close()
+
+
+class JsonlWriter:
+    """
+    One analysis record per line, appended so resumed runs extend the file.
+
+    A file analyzed again after it changed is appended a second time; close()
+    compacts the output so only the latest record of each path remains.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """Write a record; returns True once everything written so far is durable."""
+        self._handle.write(json.dumps(record) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        return True
+
+    def close(self):
+        self._handle.close()
+        self.compact()
+
+    def compact(self):
+        """Rewrite the file without superseded records, keeping line order; a no-op without duplicates."""
+        latest: Dict[str, int] = {}
+        records = 0
+        with open(self.path, "rb") as handle:
+            for offset, line in enumerate(handle):
+                if line.strip():
+                    latest[json.loads(line)["path"]] = offset
+                    records += 1
+        if len(latest) == records:
+            return
+        kept = set(latest.values())
+        with open(self.path, "rb") as handle, open(self.path + ".tmp", "wb") as output:
+            for offset, line in enumerate(handle):
+                if offset in kept:
+                    output.write(line)
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(self.path + ".tmp", self.path)
+
+
+class ParquetWriter:
+    """
+    One row per requirement, in numbered part files under a directory.
+
+    Rows are buffered and written rows_per_part at a time; a resumed run
+    adds new part files next to the existing ones.
+    """
+
+    SCHEMA = [
+        ("path", "string"), ("analyzed_at", "string"), ("id", "string"), ("text", "string"),
+        ("type", "string"), ("confidence", "int32"), ("ambiguity", "string"), ("suggestion", "string"),
+        ("cluster_id", "string")
+    ]
+
+    def __init__(self, directory: str, rows_per_part: int = DEFAULT_ROWS_PER_PART):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.rows_per_part = rows_per_part
+        self.schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in self.SCHEMA])
+        self._columns = {name: [] for name, _ in self.SCHEMA}
+        self._rows = 0
+        self._part = len([name for name in os.listdir(directory) if name.endswith(".parquet")])
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """Buffer a record's requirements; returns True when a part file was written."""
+        result = record["result"]
+        for requirement in (result["requirements"] if result else []):
+            self._columns["path"].append(record["path"])
+            self._columns["analyzed_at"].append(result["timestamp"])
+            for name in ("id", "text", "type", "confidence", "ambiguity", "suggestion", "cluster_id"):
+                self._columns[name].append(requirement[name])
+            self._rows += 1
+        if self._rows >= self.rows_per_part:
+            self._flush()
+            return True
+        return False
+
+    def close(self):
+        self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self.schema)
+        part_path = os.path.join(self.directory, f"part-{self._part:05d}.parquet")
+        pq.write_table(table, part_path + ".tmp")
+        os.replace(part_path + ".tmp", part_path)
+        self._part += 1
+        self._columns = {name: [] for name, _ in self.SCHEMA}
+        self._rows = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="directory to analyze recursively")
+    parser.add_argument("--output", default="results.jsonl", help="JSONL file, or directory for --format parquet")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--manifest", help="checkpoint manifest (default: <output>.manifest.jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--rows-per-part", type=int, default=DEFAULT_ROWS_PER_PART)
+    parser.add_argument("--retry-failed", action="store_true", help="analyze files that failed in a previous run again")
+    args = parser.parse_args()
+    if args.format == "parquet" and not _pyarrow_available:
+        parser.error("--format parquet needs pyarrow (pip install pyarrow)")
+
+    manifest = Manifest(args.manifest or args.output.rstrip("/\\") + ".manifest.jsonl")
+    paths = find_documents(args.input)
+    signatures = {path: file_signature(args.input, path) for path in paths}
+    todo = [path for path in paths if not manifest.is_done(path, signatures[path], args.retry_failed)]
+    print(f"Found {len(paths):,} documents, {len(paths) - len(todo):,} already done, "
+          f"analyzing {len(todo):,} with {args.workers} workers")
+    if not todo:
+        manifest.close()
+        return
+    writer = ParquetWriter(args.output, args.rows_per_part) if args.format == "parquet" else JsonlWriter(args.output)
+
+    totals = {"files": 0, "failed": 0, "bytes": 0, "requirements": 0}
+    uncommitted = []
+    futures = []
+    start = last_report = time.perf_counter()
+
+    def report(prefix: str):
+        elapsed = time.perf_counter() - start
+        print(f"{prefix} {totals['files']:,}/{len(todo):,} files ({totals['failed']:,} failed) in {elapsed:.1f}s: "
+              f"{totals['files'] / elapsed:.1f} files/s, {totals['requirements'] / elapsed:.0f} requirements/s, "
+              f"{totals['bytes'] / elapsed / 1e6:.2f} MB/s")
+
+    try:
+        # Workers split the remote request budget instead of each getting all of it
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                 initargs=(worker_ai_concurrency(args.workers),)) as executor:
+            futures = [executor.submit(analyze_path, args.input, path) for path in todo]
+            for future in as_completed(futures):
+                record = future.result()
+                totals["files"] += 1
+                totals["bytes"] += record["bytes"]
+                if record["status"] == FILE_FAILED:
+                    totals["failed"] += 1
+                    print(f"Failed {record['path']}: {record['error']}")
+                else:
+                    totals["requirements"] += len(record["result"]["requirements"])
+                uncommitted.append(dict(signatures[record["path"]], path=record["path"],
+                                        status=record["status"], error=record["error"]))
+                if writer.write(record):
+                    manifest.commit(uncommitted)
+                    uncommitted = []
+                if time.perf_counter() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.perf_counter()
+                    report("Progress:")
+    except KeyboardInterrupt:
+        for future in futures:
+            future.cancel()
+        print("Interrupted; rerun the same command to resume")
+        raise
+    finally:
+        writer.close()
+        manifest.commit(uncommitted)
+        manifest.close()
+    report("Done:")
+
+
+if __name__ == "__main__":
+    main()
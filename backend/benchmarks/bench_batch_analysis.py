@@ -0,0 +1,110 @@
+"""
+Benchmark for BatchAnalyzer against analyzing files one at a time.
+
+Builds synthetic spec documents of unique sentences and runs them through the
+full pipeline, with AI enhancement served by the local OpenAI stub server:
+first one document after another (what a client calling /api/analyze per
+file gets), then as one batch. Both runs start with empty caches and must
+produce identical requirements for every file.
+
+The stub answers without delay by default, so the run measures the CPU-bound
+stages, which the batch spreads over BATCH_WORKERS processes. With
+--latency-ms both runs are bounded by the shared AI_MAX_CONCURRENCY budget.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_batch_analysis [--files 24] [--sentences 400] [--latency-ms 0]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.bench_batch_classifier import build_unique_corpus
+from benchmarks.bench_openai_fanout import start_stub_server
+from services.ai_analyzer import AIAnalyzer
+from services.analysis import AnalysisService
+from services.batch import BatchAnalyzer
+from services.file_processor import FileProcessor
+from services.ingestion import SpooledUpload
+from services.ml_pipeline import MLPipeline
+
+
+def build_documents(files: int, sentences: int) -> list:
+    corpus = build_unique_corpus(files * sentences)
+    return [
+        (f"spec-{index:03d}.txt", (". ".join(corpus[index * sentences:(index + 1) * sentences]) + ".").encode())
+        for index in range(files)
+    ]
+
+
+def spool(documents: list) -> list:
+    uploads = []
+    for filename, content in documents:
+        upload = SpooledUpload(filename)
+        upload.write(content)
+        uploads.append(upload)
+    return uploads
+
+
+def new_service() -> AnalysisService:
+    return AnalysisService(FileProcessor(), MLPipeline(), AIAnalyzer())
+
+
+async def run_sequential(documents: list) -> tuple:
+    service = new_service()
+    uploads = spool(documents)
+    start = time.perf_counter()
+    results = [await service.analyze(upload) for upload in uploads]
+    elapsed = time.perf_counter() - start
+    await service.ai_analyzer.aclose()
+    for upload in uploads:
+        upload.close()
+    return elapsed, results
+
+
+async def run_batch(documents: list, batch_analyzer: BatchAnalyzer) -> tuple:
+    service = new_service()
+    batch_analyzer.analysis = service
+    uploads = spool(documents)
+    start = time.perf_counter()
+    response = await batch_analyzer.analyze(uploads)
+    elapsed = time.perf_counter() - start
+    await service.ai_analyzer.aclose()
+    for upload in uploads:
+        upload.close()
+    return elapsed, [file_result.result for file_result in response.files]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=24)
+    parser.add_argument("--sentences", type=int, default=400)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.pop("HF_API_KEY", None)
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = start_stub_server(args.latency_ms)
+    documents = build_documents(args.files, args.sentences)
+
+    batch_analyzer = BatchAnalyzer(None)
+    # Start the worker processes outside the timed run
+    list(batch_analyzer._get_executor().map(abs, range(batch_analyzer.workers)))
+    sequential_time, sequential_results = asyncio.run(run_sequential(documents))
+    batch_time, batch_results = asyncio.run(run_batch(documents, batch_analyzer))
+    batch_analyzer.shutdown()
+
+    for sequential, batch in zip(sequential_results, batch_results):
+        assert batch is not None, "a file failed in the batch run"
+        assert sequential.requirements == batch.requirements, f"{batch.filename} differs between runs"
+    requirements = sum(len(result.requirements) for result in batch_results)
+    print(f"Files: {args.files} x {args.sentences} sentences ({requirements:,} requirements), "
+          f"stub latency: {args.latency_ms}ms, {batch_analyzer.workers} worker(s), "
+          f"{batch_analyzer.max_concurrency} documents in flight")
+    print(f"One at a time: {sequential_time:.2f}s")
+    print(f"Batch:         {batch_time:.2f}s")
+    print(f"Speedup:       {sequential_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark for MLPipeline.classify_batch against the per-sentence classifier.
+
+Classifies a synthetic corpus of unique sentences (so the keyword scan cache
+does not help the per-sentence path) both ways and checks the resulting
+requirements are identical.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_batch_classifier [--sentences 100000]
+"""
+import argparse
+import random
+import string
+import time
+
+from benchmarks.bench_requirement_matcher import build_corpus
+from services.ml_pipeline import MLPipeline
+
+QUALIFIERS = [
+    '', '', '', 'within 2 seconds', 'in real-time', 'with high availability',
+    'in a simple and intuitive way', 'securely', 'for 500 concurrent users',
+    'with good performance', 'as appropriate', 'reliably and fast',
+]
+
+
+def build_unique_corpus(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for index, sentence in enumerate(build_corpus(size, seed)):
+        # A letters-only tag keeps every sentence distinct without adding digits
+        tag = ''
+        while True:
+            index, remainder = divmod(index, 26)
+            tag += string.ascii_lowercase[remainder]
+            if not index:
+                break
+        corpus.append(f"{sentence} {rng.choice(QUALIFIERS)} for team {tag}".replace('  ', ' '))
+    return corpus
+
+
+def per_sentence(pipeline: MLPipeline, sentences: list) -> list:
+    requirements = []
+    for sentence in sentences:
+        requirement = pipeline._extract_requirement(sentence, len(requirements) + 1)
+        if requirement:
+            requirements.append(requirement)
+    return requirements
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sentences', type=int, default=100_000)
+    args = parser.parse_args()
+
+    corpus = build_unique_corpus(args.sentences)
+    pipeline = MLPipeline()
+
+    loop_time, loop_results = timed(per_sentence, pipeline, corpus)
+    batch_time, batch_results = timed(pipeline.classify_batch, corpus)
+
+    assert loop_results == batch_results, "batch classifier disagrees with per-sentence path"
+    print(f"Corpus: {len(corpus):,} sentences ({len(batch_results):,} requirements)")
+    print(f"Per-sentence: {loop_time:.3f}s")
+    print(f"Batch:        {batch_time:.3f}s")
+    print(f"Speedup:      {loop_time / batch_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
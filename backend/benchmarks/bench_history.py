@@ -0,0 +1,127 @@
+"""
+Benchmark for HistoryStore listing queries on a large history.
+
+Fills a temporary history database with synthetic analyses, then times the
+first page, a deep page (via the cursor), the filename / content hash /
+time range filters and loading a full result by ID. Each listing query is
+checked to be served by an index without a sort step.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_history [--analyses 100000]
+"""
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from models.schemas import AnalysisResponse, Requirement
+from services.analysis import build_summary, collect_ambiguities
+from services.history import HistoryStore, SUMMARY_COLUMNS
+
+REQUIREMENTS_PER_ANALYSIS = 40
+QUERY_REPEATS = 200
+# Distinct result bodies, relabeled per analysis
+RESULT_TEMPLATES = 50
+
+
+def build_result(rng: random.Random, filename: str, timestamp: str) -> AnalysisResponse:
+    requirements = [
+        Requirement(
+            id=f"REQ-{index:03d}",
+            text=f"The system shall process request type {rng.randrange(10_000)} within {rng.randrange(1, 9)} seconds",
+            type=rng.choice(["Functional", "Non-Functional", "Ambiguous"]),
+            confidence=rng.randrange(50, 101),
+            ambiguity=rng.choice(["Low", "Medium", "High"]),
+            suggestion="Specify measurable acceptance criteria."
+        )
+        for index in range(1, REQUIREMENTS_PER_ANALYSIS + 1)
+    ]
+    return AnalysisResponse(
+        summary=build_summary(requirements),
+        requirements=requirements,
+        ambiguities=collect_ambiguities(requirements),
+        filename=filename,
+        timestamp=timestamp
+    )
+
+
+def fill(store: HistoryStore, count: int) -> list:
+    """Record count analyses over ~a year; returns their content hashes."""
+    rng = random.Random(11)
+    templates = [build_result(rng, "", "") for _ in range(RESULT_TEMPLATES)]
+    start = datetime(2025, 1, 1)
+    hashes = []
+    for index in range(count):
+        filename = f"spec-{rng.randrange(count // 10 or 1)}.txt"
+        timestamp = (start + timedelta(seconds=index * 300)).isoformat()
+        content_hash = hashlib.sha256(f"{filename}:{index % (count // 3 or 1)}".encode()).hexdigest()
+        result = templates[index % RESULT_TEMPLATES].model_copy(update={"filename": filename, "timestamp": timestamp})
+        store.record(result, content_hash)
+        hashes.append(content_hash)
+    return hashes
+
+
+def timed(func, repeats: int = QUERY_REPEATS) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    return (time.perf_counter() - start) / repeats, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--analyses', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The synthetic analyses are dated 2025, so retention is off
+        store = HistoryStore(os.path.join(directory, "history.db"), retention_days=0)
+        start = time.perf_counter()
+        hashes = fill(store, args.analyses)
+        fill_time = time.perf_counter() - start
+        size = os.path.getsize(os.path.join(directory, "history.db"))
+        print(f"History: {args.analyses:,} analyses x {REQUIREMENTS_PER_ANALYSIS} requirements, "
+              f"{size / 1e6:.0f}MB on disk, recorded in {fill_time:.1f}s "
+              f"({fill_time / args.analyses * 1e3:.2f}ms each)")
+
+        first_page = store.list_summaries()
+        cursor = first_page["next_cursor"]
+        for _ in range(args.analyses // 40):
+            cursor = store.list_summaries(cursor=cursor)["next_cursor"]
+        middle = store.list_summaries(limit=1, cursor=cursor)["items"][0]
+        queries = {
+            "first page": (lambda: store.list_summaries(), "", []),
+            "deep page (cursor)": (lambda: store.list_summaries(cursor=cursor),
+                                   "AND (timestamp, id) < (SELECT timestamp, id FROM analyses WHERE id = ?) ",
+                                   [cursor]),
+            "filename filter": (lambda: store.list_summaries(filename=middle["filename"]),
+                                "AND filename = ? ", [middle["filename"]]),
+            "content hash filter": (lambda: store.list_summaries(content_hash=hashes[0]),
+                                    "AND content_hash = ? ", [hashes[0]]),
+            "time range filter": (lambda: store.list_summaries(since=middle["timestamp"][:10],
+                                                               until=middle["timestamp"]),
+                                  "AND timestamp >= ? AND timestamp < ? ",
+                                  [middle["timestamp"][:10], middle["timestamp"]]),
+        }
+        for name, (query, where, params) in queries.items():
+            # Every listing is scoped to one client; the benchmark records without a client ID
+            plan = " | ".join(row[-1] for row in store._conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT {SUMMARY_COLUMNS} FROM analyses WHERE client_id IS ? {where}"
+                "ORDER BY timestamp DESC, id DESC LIMIT 21", [None] + params
+            ))
+            assert "USING INDEX" in plan and "TEMP B-TREE" not in plan, f"{name} is not ordered by an index: {plan}"
+            elapsed, page = timed(query)
+            assert page["items"], f"{name} returned no rows"
+            print(f"{name:<20} {elapsed * 1e3:7.3f}ms  ({len(page['items'])} items)")
+
+        elapsed, result = timed(lambda: store.get(middle["id"]))
+        assert result.filename == middle["filename"]
+        print(f"{'full result by ID':<20} {elapsed * 1e3:7.3f}ms")
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
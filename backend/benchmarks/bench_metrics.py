@@ -0,0 +1,98 @@
+"""
+Benchmark for the cost of the /metrics instrumentation.
+
+Times single histogram observations, then analyzes a set of small synthetic
+documents (local enhancement, no result cache hits) with recording switched
+on and with the recording methods replaced by no-ops, so the difference is
+what instrumentation adds per document; a handful of observations per
+document usually stays within run-to-run noise. Both runs must give
+identical requirements.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_metrics [--documents 200] [--sentences 50] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import time
+import timeit
+
+from benchmarks.bench_batch_classifier import build_unique_corpus
+from services import metrics
+from services.ai_analyzer import AIAnalyzer
+from services.analysis import AnalysisService
+from services.file_processor import FileProcessor
+from services.ingestion import SpooledUpload
+from services.ml_pipeline import MLPipeline
+
+RECORDING_METHODS = [
+    (metrics._HistogramChild, "observe"),
+    (metrics._CounterChild, "inc"),
+    (metrics._GaugeChild, "dec"),
+]
+
+
+def build_documents(count: int, sentences: int) -> list:
+    corpus = build_unique_corpus(count * sentences)
+    return [
+        (f"spec-{index:04d}.txt", (". ".join(corpus[index * sentences:(index + 1) * sentences]) + ".").encode())
+        for index in range(count)
+    ]
+
+
+async def analyze_all(documents: list) -> tuple:
+    service = AnalysisService(FileProcessor(), MLPipeline(), AIAnalyzer())
+    results = []
+    start = time.perf_counter()
+    for filename, content in documents:
+        with SpooledUpload(filename) as upload:
+            upload.write(content)
+            results.append(await service.analyze(upload))
+    return time.perf_counter() - start, [result.requirements for result in results]
+
+
+def timed_run(documents: list, recording: bool) -> tuple:
+    originals = [(owner, name, getattr(owner, name)) for owner, name in RECORDING_METHODS]
+    if not recording:
+        for owner, name, _ in originals:
+            setattr(owner, name, lambda self, *args: None)
+    try:
+        return asyncio.run(analyze_all(documents))
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5, help="alternating runs per mode; the fastest counts")
+    args = parser.parse_args()
+
+    for key in ("HF_API_KEY", "OPENAI_API_KEY"):
+        os.environ.pop(key, None)
+    calls = 1_000_000
+    histogram = metrics.Histogram("bench_seconds", "Benchmark histogram", ("stage",))
+    observe_ns = timeit.timeit(lambda: histogram.labels("txt").observe(0.004), number=calls) / calls * 1e9
+
+    documents = build_documents(args.documents, args.sentences)
+    timings = {True: [], False: []}
+    results = {}
+    for _ in range(args.rounds):
+        for recording in (False, True):
+            elapsed, results[recording] = timed_run(documents, recording)
+            timings[recording].append(elapsed)
+    assert results[True] == results[False], "instrumentation changed the analysis results"
+
+    baseline, instrumented = min(timings[False]), min(timings[True])
+    print(f"Labeled histogram observation: {observe_ns:.0f} ns")
+    print(f"Documents: {args.documents} x {args.sentences} sentences, best of {args.rounds} rounds")
+    print(f"Without recording: {baseline:.3f}s  {baseline / args.documents * 1e3:.3f} ms/document")
+    print(f"With recording:    {instrumented:.3f}s  {instrumented / args.documents * 1e3:.3f} ms/document")
+    print(f"Overhead:          {(instrumented - baseline) / args.documents * 1e6:+.1f} us/document "
+          f"({(instrumented / baseline - 1) * 100:+.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark for near-duplicate clustering before AI enhancement.
+
+Analyzes a synthetic spec, in which a share of the requirements are restated
+elsewhere with small edits, twice with the local OpenAI stub server answering:
+with near-duplicate clustering disabled (every requirement is its own remote
+call) and enabled (one call per cluster). Every requirement is sent to the
+stub (no local routing) and the enhancement cache starts empty. The stub
+answers every prompt alike, so both runs must give the same requirements
+apart from cluster_id.
+
+The clusters are then checked against a brute-force comparison of the exact
+shingle sets of every pair of requirements: recall is the share of pairs at
+or above DEDUP_THRESHOLD (same type, same numbers and negations) that were
+clustered, and every member must reach DEDUP_THRESHOLD against its
+cluster's first requirement.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_near_duplicates [--requirements 2000] [--duplicates 0.3] [--latency-ms 50]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from collections import defaultdict
+from itertools import combinations
+
+from benchmarks.bench_batch_classifier import build_unique_corpus
+from benchmarks.bench_openai_fanout import start_stub_server
+from services.ai_analyzer import AIAnalyzer
+from services.analysis import AnalysisService
+from services.file_processor import FileProcessor
+from services.ingestion import SpooledUpload
+from services.ml_pipeline import MLPipeline
+from services.near_duplicates import NEGATION_REGEX, NUMBER_REGEX, SHINGLE_SIZE, _normalize
+
+
+# Small edits a spec makes when it restates a requirement in another section
+RESTATEMENTS = [
+    lambda text: text.upper(),
+    lambda text: text.replace(" the ", " the  ", 1),
+    lambda text: text.replace("The ", "the ", 1),
+    lambda text: text + " as well",
+    lambda text: "Also, " + text[0].lower() + text[1:],
+]
+
+
+def build_document(count: int, duplicates: float, seed: int = 11) -> bytes:
+    pipeline = MLPipeline()
+    sentences = [sentence for sentence in build_unique_corpus(count * 3) if pipeline._is_requirement_sentence(sentence)]
+    rng = random.Random(seed)
+    restated = int(count * duplicates)
+    document = sentences[:count - restated]
+    for _ in range(restated):
+        original = rng.choice(document)
+        document.insert(rng.randrange(len(document) + 1), rng.choice(RESTATEMENTS)(original))
+    return (".\n".join(document) + ".").encode()
+
+
+async def analyze(content: bytes, dedup: bool) -> tuple:
+    os.environ["DEDUP_ENABLED"] = "true" if dedup else "false"
+    analyzer = AIAnalyzer()
+    # Send every requirement to the remote model
+    analyzer.route_min_confidence = 101
+    service = AnalysisService(FileProcessor(), MLPipeline(), analyzer)
+    with SpooledUpload("spec.txt") as upload:
+        upload.write(content)
+        start = time.perf_counter()
+        result = await service.analyze(upload)
+        elapsed = time.perf_counter() - start
+    await analyzer.aclose()
+    return elapsed, analyzer.usage["calls"], result
+
+
+def shingle_set(text: str) -> set:
+    data = _normalize(text).ljust(SHINGLE_SIZE)
+    return {data[index:index + SHINGLE_SIZE] for index in range(len(data) - SHINGLE_SIZE + 1)}
+
+
+def brute_force_pairs(requirements: list, threshold: float) -> list:
+    """Every pair of requirements whose exact shingle Jaccard similarity reaches the threshold."""
+    shingles = [shingle_set(requirement.text) for requirement in requirements]
+    keys = [
+        (requirement.type, tuple(NUMBER_REGEX.findall(requirement.text)),
+         tuple(NEGATION_REGEX.findall(requirement.text.casefold())))
+        for requirement in requirements
+    ]
+    pairs = []
+    for first, second in combinations(range(len(requirements)), 2):
+        if keys[first] != keys[second]:
+            continue
+        union = len(shingles[first] | shingles[second])
+        if len(shingles[first] & shingles[second]) >= threshold * union:
+            pairs.append((first, second))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requirements", type=int, default=2000)
+    parser.add_argument("--duplicates", type=float, default=0.3, help="fraction of requirements restated with small edits")
+    parser.add_argument("--latency-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.pop("HF_API_KEY", None)
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = start_stub_server(args.latency_ms)
+    content = build_document(args.requirements, args.duplicates)
+
+    plain_time, plain_calls, plain = asyncio.run(analyze(content, dedup=False))
+    dedup_time, dedup_calls, deduped = asyncio.run(analyze(content, dedup=True))
+    strip = lambda result: [requirement.model_copy(update={"cluster_id": None}) for requirement in result.requirements]
+    assert strip(plain) == strip(deduped), "clustered enhancement differs from per-requirement enhancement"
+
+    requirements = deduped.requirements
+    detector = MLPipeline().near_duplicates
+    start = time.perf_counter()
+    detector.assign_clusters(requirements)
+    cluster_time = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = brute_force_pairs(requirements, detector.threshold)
+    brute_time = time.perf_counter() - start
+
+    clusters = defaultdict(list)
+    for requirement in requirements:
+        if requirement.cluster_id is not None:
+            clusters[requirement.cluster_id].append(requirement)
+    cluster_of = {requirement.id: requirement.cluster_id for requirement in requirements}
+    found = sum(
+        1 for first, second in expected
+        if cluster_of[requirements[first].id] is not None
+        and cluster_of[requirements[first].id] == cluster_of[requirements[second].id]
+    )
+    recall = found / len(expected) if expected else 1.0
+    lowest = min((
+        len(shingle_set(member.text) & shingle_set(members[0].text)) / len(shingle_set(member.text) | shingle_set(members[0].text))
+        for members in clusters.values() for member in members[1:]
+    ), default=1.0)
+    assert lowest >= detector.threshold, f"a cluster member is only {lowest:.2f} similar to its representative"
+
+    print(f"Requirements: {len(requirements):,} in {len(clusters):,} clusters of 2+ "
+          f"({sum(len(members) for members in clusters.values()):,} clustered), stub latency: {args.latency_ms}ms")
+    print(f"Without clustering: {plain_time:.2f}s  {plain_calls:>5} remote calls")
+    print(f"With clustering:    {dedup_time:.2f}s  {dedup_calls:>5} remote calls")
+    print(f"Speedup:            {plain_time / dedup_time:.1f}x")
+    print(f"MinHash/LSH clustering: {cluster_time:.3f}s; brute-force pairwise check: {brute_time:.2f}s")
+    print(f"Recall of pairs at Jaccard >= {detector.threshold}: {found:,}/{len(expected):,} ({recall:.1%}); "
+          f"lowest Jaccard of a member to its cluster's first requirement: {lowest:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark AIAnalyzer's OpenAI path against the local stub server.
+
+Starts benchmarks.stub_openai_server in a background thread, points the
+OpenAI client at it and compares sequential enhancement (concurrency 1,
+equivalent to the previous one-by-one loop) with bounded concurrent fan-out,
+with and without batch prompting, and with routing of clear-cut requirements
+to the local heuristics.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_openai_fanout [--requirements 50] [--latency-ms 200] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+
+import uvicorn
+
+from benchmarks import stub_openai_server
+from models.schemas import Requirement
+from services.ai_analyzer import AIAnalyzer
+
+
+def start_stub_server(latency_ms: int) -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    stub_openai_server.app.state.latency_ms = latency_ms
+    config = uvicorn.Config(stub_openai_server.app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v1"
+
+
+def build_requirements(count: int) -> list:
+    # Two in three are clear-cut; the rest use vague wording
+    return [
+        Requirement(
+            id=f"REQ-{i:03d}",
+            text=f"The system shall export report number {i} as a PDF file.",
+            type="Functional",
+            confidence=95,
+            ambiguity="Low",
+            suggestion=""
+        ) if i % 3 else Requirement(
+            id=f"REQ-{i:03d}",
+            text=f"Report {i} should load fast and be easy to use.",
+            type="Non-Functional",
+            confidence=70,
+            ambiguity="Medium",
+            suggestion=""
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def run(concurrency: int, requirements: list, batch: bool = False, routed: bool = False) -> tuple:
+    analyzer = AIAnalyzer(max_concurrency=concurrency)
+    analyzer.batch_prompts = batch
+    if not routed:
+        # Send every requirement to the remote model
+        analyzer.route_min_confidence = 101
+    start = time.perf_counter()
+    enhanced = await analyzer.enhance_requirements(requirements)
+    elapsed = time.perf_counter() - start
+    await analyzer.aclose()
+    assert [r.id for r in enhanced] == [r.id for r in requirements], "result order changed"
+    assert not any(r.suggestion.startswith("OpenAI error") for r in enhanced), enhanced[0].suggestion
+    return elapsed, analyzer.usage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requirements", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    os.environ.pop("HF_API_KEY", None)
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = start_stub_server(args.latency_ms)
+    requirements = build_requirements(args.requirements)
+
+    runs = [
+        ("Sequential (concurrency 1):", run(1, requirements)),
+        (f"Fan-out (concurrency {args.concurrency}):", run(args.concurrency, requirements)),
+        (f"Batched (concurrency {args.concurrency}):", run(args.concurrency, requirements, batch=True)),
+        (f"Routed (concurrency {args.concurrency}):", run(args.concurrency, requirements, routed=True)),
+    ]
+    print(f"Requirements: {args.requirements}, stub latency: {args.latency_ms}ms")
+    baseline = None
+    for label, coroutine in runs:
+        elapsed, usage = asyncio.run(coroutine)
+        baseline = baseline or elapsed
+        print(f"{label:<30}{elapsed:.2f}s  {usage['calls']:>4} calls  "
+              f"{usage['prompt_tokens']:>6} prompt tokens  {baseline / elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
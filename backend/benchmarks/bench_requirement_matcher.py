@@ -0,0 +1,86 @@
+"""
+Micro-benchmark for MLPipeline._is_requirement_sentence.
+
+Compares the previous per-pattern ``re.search`` loop against the single
+compiled matcher on a synthetic corpus and checks both agree.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_requirement_matcher [--sentences 100000]
+"""
+import argparse
+import random
+import re
+import time
+
+from services.ml_pipeline import MLPipeline
+
+# The per-pattern list MLPipeline used before the single compiled matcher.
+LEGACY_PATTERNS = [
+    r'\b(the\s+)?system\s+(shall|should|must|will|can)\b',
+    r'\b(the\s+)?user\s+(shall|should|must|will|can)\b',
+    r'\busers?\s+(shall|should|must|will|can)\b',
+    r'\b(shall|should|must|will|can)\s+be\b',
+    r'\b(shall|should|must|will|can)\s+have\b',
+    r'\b(shall|should|must|will|can)\s+provide\b',
+    r'\b(shall|should|must|will|can)\s+support\b',
+    r'\b(shall|should|must|will|can)\s+allow\b',
+    r'\b(shall|should|must|will|can)\s+enable\b'
+]
+
+SUBJECTS = ['The system', 'The user', 'Users', 'The application', 'Operators', 'It', 'The report']
+MODALS = ['shall', 'should', 'must', 'will', 'can', 'might', 'is going to', 'usually']
+VERBS = ['be', 'have', 'provide', 'support', 'allow', 'enable', 'display', 'store', 'export']
+OBJECTS = [
+    'encrypted backups of all customer data',
+    'a dashboard with weekly usage statistics',
+    'single sign-on through the corporate identity provider',
+    'fast and intuitive navigation between screens',
+    'audit logs retained for at least 90 days',
+    'the uploaded document in PDF and TXT formats',
+]
+
+
+def build_corpus(size: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(SUBJECTS)} {rng.choice(MODALS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+        for _ in range(size)
+    ]
+
+
+def legacy_is_requirement_sentence(sentence: str) -> bool:
+    """The original implementation: one re.search per pattern."""
+    sentence_lower = sentence.lower()
+    for pattern in LEGACY_PATTERNS:
+        if re.search(pattern, sentence_lower):
+            return True
+    return False
+
+
+def timed(func, corpus):
+    start = time.perf_counter()
+    results = [func(sentence) for sentence in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sentences', type=int, default=100_000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.sentences)
+    pipeline = MLPipeline()
+
+    legacy_time, legacy_results = timed(legacy_is_requirement_sentence, corpus)
+    compiled_time, compiled_results = timed(pipeline._is_requirement_sentence, corpus)
+
+    assert legacy_results == compiled_results, "compiled matcher disagrees with legacy loop"
+    matched = sum(compiled_results)
+    print(f"Corpus: {len(corpus):,} sentences ({matched:,} requirements)")
+    print(f"Legacy loop:      {legacy_time:.3f}s")
+    print(f"Compiled matcher: {compiled_time:.3f}s")
+    print(f"Speedup:          {legacy_time / compiled_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark for RevisionAnalyzer against re-analyzing a whole revision.
+
+Analyzes a synthetic spec, edits a small fraction of its requirements
+(rewording some, deleting some, adding new ones), then analyzes the new
+revision twice with the local OpenAI stub server answering: from scratch,
+and as a revision of the first analysis. Every requirement is sent to the
+stub (no local routing) and the enhancement cache starts empty, so the
+remote calls show what each path re-sends. Both must give identical
+requirements.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_revision [--requirements 2000] [--changed 0.01] [--latency-ms 50]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.bench_batch_classifier import build_unique_corpus
+from benchmarks.bench_openai_fanout import start_stub_server
+from services.ai_analyzer import AIAnalyzer
+from services.analysis import AnalysisService
+from services.file_processor import FileProcessor
+from services.ingestion import SpooledUpload
+from services.ml_pipeline import MLPipeline
+from services.revision import RevisionAnalyzer
+
+
+def build_revisions(count: int, changed: float, seed: int = 5) -> tuple:
+    pipeline = MLPipeline()
+    sentences = [sentence for sentence in build_unique_corpus(count * 3) if pipeline._is_requirement_sentence(sentence)]
+    original, spare = sentences[:count], sentences[count:]
+    rng = random.Random(seed)
+    revised = list(original)
+    edits = max(1, int(count * changed))
+    for index in rng.sample(range(count), edits):
+        revised[index] = revised[index].replace("system", "platform", 1) + " at all times"
+    for index in sorted(rng.sample(range(count), edits // 2), reverse=True):
+        del revised[index]
+    for sentence in spare[:edits // 2]:
+        revised.insert(rng.randrange(len(revised)), sentence)
+    return original, revised
+
+
+def spool(filename: str, sentences: list) -> SpooledUpload:
+    upload = SpooledUpload(filename)
+    upload.write((".\n".join(sentences) + ".").encode())
+    return upload
+
+
+def new_service() -> AnalysisService:
+    analyzer = AIAnalyzer()
+    # Send every requirement to the remote model
+    analyzer.route_min_confidence = 101
+    return AnalysisService(FileProcessor(), MLPipeline(), analyzer)
+
+
+async def run(original: list, revised: list) -> dict:
+    service = new_service()
+    with spool("v1.txt", original) as upload:
+        first = await service.analyze(upload)
+    first = first.model_copy(update={"history_id": 1})
+
+    timings = {}
+    for label, analyze in [
+        ("full", lambda upload: new_service().analyze(upload)),
+        ("revision", lambda upload: RevisionAnalyzer(new_service()).analyze(upload, first)),
+    ]:
+        with spool("v2.txt", revised) as upload:
+            start = time.perf_counter()
+            response = await analyze(upload)
+            timings[label] = time.perf_counter() - start
+        timings[f"{label}_response"] = response
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requirements", type=int, default=2000)
+    parser.add_argument("--changed", type=float, default=0.01, help="fraction of requirements reworded")
+    parser.add_argument("--latency-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.pop("HF_API_KEY", None)
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = start_stub_server(args.latency_ms)
+    original, revised = build_revisions(args.requirements, args.changed)
+
+    timings = asyncio.run(run(original, revised))
+    full, revision = timings["full_response"], timings["revision_response"]
+    assert full.requirements == revision.result.requirements, "revision result differs from a full analysis"
+    diff = revision.diff
+    print(f"Requirements: {len(original):,} -> {len(full.requirements):,} "
+          f"({len(diff.modified)} modified, {len(diff.added)} added, {len(diff.removed)} removed), "
+          f"stub latency: {args.latency_ms}ms")
+    print(f"Full re-analysis: {timings['full']:.2f}s  {len(full.requirements):>5} requirements enhanced")
+    print(f"Revision:         {timings['revision']:.2f}s  {len(diff.modified) + len(diff.added):>5} requirements enhanced")
+    print(f"Speedup:          {timings['full'] / timings['revision']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Local OpenAI-compatible stub server for offline benchmarks.
+
+Serves ``POST /v1/chat/completions`` with a fixed JSON analysis after an
+artificial delay, so enhancement latency can be measured without network
+access or an API key. Batch prompts (one JSON requirement per line) get a
+JSON array with one analysis per requirement ID.
+
+Usage (from the backend directory):
+    STUB_LATENCY_MS=200 uvicorn benchmarks.stub_openai_server:app --port 8100
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=stub python main.py
+"""
+import asyncio
+import json
+import os
+import time
+
+from fastapi import FastAPI, Request
+
+STUB_LATENCY_MS = int(os.getenv("STUB_LATENCY_MS", "200"))
+STUB_ANALYSIS = {
+    "ambiguous_terms": [],
+    "ambiguity": "Low",
+    "suggestion": "Add measurable acceptance criteria."
+}
+
+app = FastAPI(title="OpenAI stub")
+app.state.latency_ms = STUB_LATENCY_MS
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await asyncio.sleep(app.state.latency_ms / 1000)
+    prompt = body["messages"][-1]["content"]
+    batch_ids = [
+        json.loads(line)["id"] for line in prompt.splitlines() if line.startswith('{"id"')
+    ]
+    if batch_ids:
+        content = json.dumps([dict(STUB_ANALYSIS, id=req_id) for req_id in batch_ids])
+    else:
+        content = json.dumps(STUB_ANALYSIS)
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
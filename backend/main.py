@@ -1,24 +1,96 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Request, Response, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import uvicorn
-from typing import List, Dict, Any
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, AsyncIterator, Optional
 import os
 from datetime import datetime
 import json
+import logging
 
 # Import our modules (we'll create these next)
 from services.file_processor import FileProcessor
 from services.ml_pipeline import MLPipeline
 from services.ai_analyzer import AIAnalyzer
-from models.schemas import AnalysisRequest, AnalysisResponse, Requirement
+from services.analysis import AnalysisService, build_summary, collect_ambiguities
+from services.history import HistoryStore, DEFAULT_HISTORY_DB, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, CLIENT_ID_MAX_LENGTH
+from services.jobs import JobQueue
+from services.batch import BatchAnalyzer
+from services.revision import RevisionAnalyzer
+from services.ingestion import ingest_upload, MAX_UPLOAD_BYTES
+from services.metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware, SERVICE_READY, SERVICE_UNAVAILABLE
+from models.schemas import (
+    AnalysisRequest, AnalysisResponse, BatchAnalysisResponse, HistoryPage, JobStatus, Requirement,
+    RevisionResponse
+)
+
+logger = logging.getLogger(__name__)
+
+# Initialize services
+file_processor = FileProcessor()
+ml_pipeline = MLPipeline()
+ai_analyzer = AIAnalyzer()
+history_store = HistoryStore(os.getenv("HISTORY_DB", DEFAULT_HISTORY_DB))
+analysis_service = AnalysisService(file_processor, ml_pipeline, ai_analyzer, history=history_store)
+job_queue = JobQueue(analysis_service)
+batch_analyzer = BatchAnalyzer(analysis_service)
+revision_analyzer = RevisionAnalyzer(analysis_service)
+
+# Counters the services already keep, read only when /metrics is scraped
+CACHES = {"result": analysis_service.result_cache, "enhancement": ai_analyzer.cache}
+REGISTRY.callback(
+    "counter", "clearreq_cache_hits_total", "Cache lookups that found an entry", ("cache",),
+    lambda: {(name,): cache.stats()["hits"] for name, cache in CACHES.items()}
+)
+REGISTRY.callback(
+    "counter", "clearreq_cache_misses_total", "Cache lookups that found no entry", ("cache",),
+    lambda: {(name,): cache.stats()["misses"] for name, cache in CACHES.items()}
+)
+REGISTRY.callback(
+    "gauge", "clearreq_cache_hit_ratio", "Share of cache lookups that found an entry since startup", ("cache",),
+    lambda: {(name,): cache.stats()["hit_rate"] for name, cache in CACHES.items()}
+)
+REGISTRY.callback(
+    "counter", "clearreq_ai_routed_requirements_total",
+    "Requirements resolved locally, sent remote, or served by their near-duplicate cluster", ("route",),
+    lambda: {(route,): count for route, count in ai_analyzer.routes.items()}
+)
+REGISTRY.callback(
+    "counter", "clearreq_llm_calls_total", "Remote model calls", (),
+    lambda: {(): ai_analyzer.usage["calls"]}
+)
+REGISTRY.callback(
+    "counter", "clearreq_llm_prompt_tokens_total", "Estimated prompt tokens sent to remote models", (),
+    lambda: {(): ai_analyzer.usage["prompt_tokens"]}
+)
+REGISTRY.callback(
+    "gauge", "clearreq_jobs", "Background jobs waiting or running", ("state",),
+    lambda: {("queued",): job_queue.stats()["queued"], ("running",): job_queue.stats()["running"]}
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background job workers; release pooled AI client connections and PDF/batch workers on shutdown"""
+    job_queue.start()
+    yield
+    await job_queue.stop()
+    await ai_analyzer.aclose()
+    file_processor.shutdown()
+    batch_analyzer.shutdown()
+    history_store.close()
 
 app = FastAPI(
     title="ClearReq API",
     description="AI-Driven Requirements Analyzer API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# In-flight and completed request counts for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Configure CORS for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -30,13 +102,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the frontend read the ETag and revalidate re-uploads with If-None-Match
+    expose_headers=["ETag"],
 )
 
-# Initialize services
-file_processor = FileProcessor()
-ml_pipeline = MLPipeline()
-ai_analyzer = AIAnalyzer()
-
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -44,81 +113,285 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Detailed health check"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0",
-        "services": {
-            "file_processor": "ready",
-            "ml_pipeline": "ready", 
-            "ai_analyzer": "ready"
-        }
+    """
+    Detailed health check
+
+    Each service reports ready, degraded (working with a fallback) or
+    unavailable; any unavailable service makes the response a 503.
+    """
+    services = {
+        "file_processor": file_processor.health(),
+        "ml_pipeline": ml_pipeline.health(),
+        "ai_analyzer": ai_analyzer.health(),
+        "job_queue": job_queue.health(),
+        "history": history_store.health()
     }
+    statuses = {service["status"] for service in services.values()}
+    if SERVICE_UNAVAILABLE in statuses:
+        status = "unhealthy"
+    elif statuses == {SERVICE_READY}:
+        status = "healthy"
+    else:
+        status = "degraded"
+    return JSONResponse(
+        status_code=503 if status == "unhealthy" else 200,
+        content={
+            "status": status,
+            "timestamp": datetime.now().isoformat(),
+            "version": "1.0.0",
+            "services": services
+        }
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in the text exposition format"""
+    return Response(REGISTRY.expose(), media_type=CONTENT_TYPE)
+
+def validate_upload(file: UploadFile):
+    """Reject unsupported file types and oversized uploads"""
+    # Validate file type
+    if not file.filename.lower().endswith(('.txt', '.pdf')):
+        raise HTTPException(
+            status_code=400, 
+            detail="Only .txt and .pdf files are supported"
+        )
+    
+    # Validate declared file size (10MB limit); ingest_upload enforces it while streaming
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=400,
+            detail="File size must be less than 10MB"
+        )
+
+def require_client_id(x_client_id: Optional[str]) -> str:
+    """Reject history access without an X-Client-Id; history is only kept per client"""
+    if not x_client_id:
+        raise HTTPException(status_code=400, detail="X-Client-Id header is required for history")
+    return x_client_id
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    opaque = lambda tag: tag[2:] if tag.startswith("W/") else tag
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or opaque(etag) in [opaque(tag) for tag in candidates]
 
 @app.post("/api/analyze", response_model=AnalysisResponse)
-async def analyze_requirements(file: UploadFile = File(...)):
+async def analyze_requirements(
+    response: Response,
+    file: UploadFile = File(...),
+    if_none_match: Optional[str] = Header(None),
+    x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)
+):
     """
     Analyze requirements from uploaded document
+
+    Results are cached by the SHA-256 of the uploaded bytes, the file type and
+    the pipeline/provider configuration, and tagged with that key as a weak
+    ETag (the timestamp, filename and history ID of the body still vary);
+    re-uploading identical content is served from the cache, and a matching
+    If-None-Match header returns 304 Not Modified.
     """
     try:
-        # Validate file type
-        if not file.filename.lower().endswith(('.txt', '.pdf')):
-            raise HTTPException(
-                status_code=400, 
-                detail="Only .txt and .pdf files are supported"
-            )
+        validate_upload(file)
         
-        # Validate file size (10MB limit)
-        if file.size > 10 * 1024 * 1024:
-            raise HTTPException(
-                status_code=400,
-                detail="File size must be less than 10MB"
-            )
-        
-        # Process the file
-        print(f"Processing file: {file.filename}")
-        
-        # Extract text from file
-        text_content = await file_processor.extract_text(file)
-        
-        # Extract requirements using ML
-        requirements = await ml_pipeline.extract_requirements(text_content)
-        
-        # Analyze with AI for suggestions and ambiguities
-        enhanced_requirements = await ai_analyzer.enhance_requirements(requirements)
-        
-        # Generate summary
-        summary = {
-            "total": len(enhanced_requirements),
-            "functional": len([r for r in enhanced_requirements if r.type == "Functional"]),
-            "nonFunctional": len([r for r in enhanced_requirements if r.type == "Non-Functional"]),
-            "ambiguities": len([r for r in enhanced_requirements if r.ambiguity in ["High", "Medium"]])
-        }
-        
-        # Identify ambiguities
-        ambiguities = [
-            {"id": r.id, "text": r.text, "severity": r.ambiguity}
-            for r in enhanced_requirements 
-            if r.ambiguity in ["High", "Medium"]
-        ]
-        
-        return AnalysisResponse(
-            summary=summary,
-            requirements=enhanced_requirements,
-            ambiguities=ambiguities,
-            filename=file.filename,
-            timestamp=datetime.now().isoformat()
-        )
+        # Stream the upload into a size-checked, seekable buffer
+        with await ingest_upload(file) as upload:
+            # Identical uploads under the same configuration are served from the result cache
+            etag = f'W/"{analysis_service.result_key(upload)}"'
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+            return await analysis_service.analyze(upload, client_id=x_client_id)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error processing file: {str(e)}")
+        logger.exception("Error processing file %s", file.filename)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
-@app.get("/api/history")
-async def get_analysis_history():
-    """Get analysis history (placeholder for now)"""
-    return {"history": []}
+@app.post("/api/analyze/stream")
+async def analyze_requirements_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)
+):
+    """
+    Analyze requirements from uploaded document, streaming results as they complete.
+
+    Emits one "requirement" frame per enhanced requirement, then a final
+    "summary" frame with the summary, ambiguities, filename, timestamp and
+    history ID.
+    Frames are newline-delimited JSON, or Server-Sent Events when the client
+    sends ``Accept: text/event-stream``.
+    """
+    validate_upload(file)
+    upload = await ingest_upload(file)
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+
+    def format_frame(event: str, data: Any) -> str:
+        payload = json.dumps(data)
+        if use_sse:
+            return f"event: {event}\ndata: {payload}\n\n"
+        return json.dumps({"event": event, "data": data}) + "\n"
+
+    async def frames() -> AsyncIterator[str]:
+        enhanced_requirements = []
+        try:
+            requirements = ml_pipeline.stream_requirements(file_processor.iter_text(upload))
+            async for requirement in ai_analyzer.stream_enhanced_requirements(requirements):
+                enhanced_requirements.append(requirement)
+                yield format_frame("requirement", requirement.model_dump())
+            result = analysis_service.record(AnalysisResponse(
+                summary=build_summary(enhanced_requirements),
+                requirements=enhanced_requirements,
+                ambiguities=collect_ambiguities(enhanced_requirements),
+                filename=file.filename,
+                timestamp=datetime.now().isoformat()
+            ), upload.sha256, x_client_id)
+            yield format_frame("summary", result.model_dump(exclude={"requirements"}))
+        except Exception as e:
+            logger.exception("Error streaming analysis of %s", file.filename)
+            yield format_frame("error", {"detail": f"Error processing file: {str(e)}"})
+
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(frames(), media_type=media_type, background=BackgroundTask(upload.close))
+
+@app.post("/api/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_requirements_batch(
+    files: List[UploadFile] = File(...),
+    x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)
+):
+    """
+    Analyze many documents at once.
+
+    Accepts .txt/.pdf files and/or .zip archives of them (up to BATCH_MAX_FILES
+    documents). Documents are analyzed concurrently; files that cannot be
+    analyzed are reported as failed without failing the batch.
+    """
+    try:
+        return await batch_analyzer.analyze_files(files, x_client_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error processing batch")
+        raise HTTPException(status_code=500, detail=f"Error processing batch: {str(e)}")
+
+@app.post("/api/analyze/revision", response_model=RevisionResponse)
+async def analyze_revision(
+    previous_id: int = Form(...),
+    file: UploadFile = File(...),
+    x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)
+):
+    """
+    Analyze a new revision of a previously analyzed document.
+
+    Requirements are aligned with the previous analysis (history ID
+    previous_id); unchanged ones reuse their previous results and only added
+    or modified ones are re-analyzed. Returns the full new analysis, recorded
+    in the history, plus an added/removed/modified diff. Requires the
+    X-Client-Id the previous analysis was made with.
+    """
+    try:
+        validate_upload(file)
+        previous = history_store.get(previous_id, require_client_id(x_client_id))
+        if previous is None:
+            raise HTTPException(status_code=404, detail="Previous analysis not found")
+        with await ingest_upload(file) as upload:
+            return await revision_analyzer.analyze(upload, previous, x_client_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error processing file %s", file.filename)
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+
+@app.post("/api/jobs", response_model=JobStatus, status_code=202)
+async def submit_analysis_job(
+    file: UploadFile = File(...),
+    x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)
+):
+    """
+    Queue a document for background analysis.
+
+    Returns the job immediately; poll GET /api/jobs/{job_id} for its status,
+    progress and, once it succeeds, the analysis results. Responds 503 when
+    JOB_QUEUE_DEPTH jobs are already waiting.
+    """
+    validate_upload(file)
+    upload = await ingest_upload(file)
+    try:
+        return job_queue.submit(upload, x_client_id)
+    except HTTPException:
+        upload.close()
+        raise
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatus)
+async def get_analysis_job(job_id: str):
+    """Get the status, progress and results of a background analysis job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/api/stats")
+async def get_stats():
+    """Cache hit/miss counters, remote model usage, local/remote routing counts, job queue depth and history size"""
+    return {
+        "result_cache": analysis_service.result_cache.stats(),
+        "enhancement_cache": ai_analyzer.cache.stats(),
+        "llm_usage": ai_analyzer.usage,
+        "routes": ai_analyzer.routes,
+        "jobs": job_queue.stats(),
+        "history": history_store.stats()
+    }
+
+@app.get("/api/history", response_model=HistoryPage)
+async def get_analysis_history(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+    filename: Optional[str] = None,
+    content_hash: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)
+):
+    """
+    List the calling client's past analyses, newest first, as summaries without requirements.
+
+    Analyses belong to the X-Client-Id they were made with; requires X-Client-Id.
+    Filter by exact filename, content hash and/or an ISO timestamp range;
+    pass the returned next_cursor to fetch the following page.
+    """
+    client_id = require_client_id(x_client_id)
+    return history_store.list_summaries(limit, cursor, filename, content_hash, since, until, client_id)
+
+@app.get("/api/history/{history_id}", response_model=AnalysisResponse)
+async def get_analysis_history_entry(
+    history_id: int,
+    x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)
+):
+    """Get the full results of one of the calling client's past analyses; requires X-Client-Id"""
+    result = history_store.get(history_id, require_client_id(x_client_id))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return result
+
+@app.delete("/api/history/{history_id}", status_code=204)
+async def delete_analysis_history_entry(
+    history_id: int,
+    x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)
+):
+    """Delete one of the calling client's past analyses; requires X-Client-Id"""
+    if not history_store.delete(history_id, require_client_id(x_client_id)):
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+@app.delete("/api/history", status_code=204)
+async def clear_analysis_history(x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)):
+    """Delete all of the calling client's past analyses; requires X-Client-Id"""
+    history_store.clear(require_client_id(x_client_id))
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
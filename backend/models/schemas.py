@@ -10,6 +10,7 @@ class Requirement(BaseModel):
     confidence: int = Field(..., ge=0, le=100, description="ML confidence score (0-100)")
     ambiguity: str = Field(..., description="Ambiguity level: Low, Medium, or High")
     suggestion: str = Field(..., description="AI-generated improvement suggestion")
+    cluster_id: Optional[str] = Field(None, description="ID of the first requirement of this requirement's near-duplicate cluster")
 
 class Summary(BaseModel):
     """Analysis summary statistics"""
@@ -35,6 +36,70 @@ class AnalysisResponse(BaseModel):
     ambiguities: List[Ambiguity] = Field(..., description="List of detected ambiguities")
     filename: str = Field(..., description="Original filename")
     timestamp: str = Field(..., description="Analysis timestamp")
+    history_id: Optional[int] = Field(None, description="ID of this analysis in the history store")
+
+class BatchFileResult(BaseModel):
+    """Analysis result of one file in a batch"""
+    filename: str = Field(..., description="Filename, or path inside the uploaded archive")
+    status: str = Field(..., description="File status: succeeded or failed")
+    error: Optional[str] = Field(None, description="Error detail if the file failed")
+    result: Optional[AnalysisResponse] = Field(None, description="Analysis results if the file succeeded")
+
+class BatchSummary(Summary):
+    """Combined statistics of a batch"""
+    files: int = Field(..., description="Number of files in the batch")
+    succeeded: int = Field(..., description="Number of files analyzed")
+    failed: int = Field(..., description="Number of files that could not be analyzed")
+
+class BatchAnalysisResponse(BaseModel):
+    """Response model for batch analysis"""
+    summary: BatchSummary = Field(..., description="Statistics combined across all files")
+    files: List[BatchFileResult] = Field(..., description="Per-file results in upload order")
+    timestamp: str = Field(..., description="Analysis timestamp")
+
+class ModifiedRequirement(BaseModel):
+    """Requirement changed between two revisions"""
+    previous: Requirement = Field(..., description="Requirement in the previous analysis")
+    current: Requirement = Field(..., description="Re-analyzed requirement in the new revision")
+    similarity: float = Field(..., ge=0, le=1, description="Text similarity of the two versions (0-1)")
+
+class RequirementDiff(BaseModel):
+    """Requirement-level differences between two revisions"""
+    added: List[Requirement] = Field(..., description="Requirements new in this revision")
+    removed: List[Requirement] = Field(..., description="Previous requirements no longer present")
+    modified: List[ModifiedRequirement] = Field(..., description="Requirements whose text changed")
+    unchanged: int = Field(..., description="Number of requirements reused from the previous analysis")
+
+class RevisionResponse(BaseModel):
+    """Response model for revision analysis"""
+    previous_id: int = Field(..., description="History ID of the previous analysis")
+    result: AnalysisResponse = Field(..., description="Full analysis of the new revision")
+    diff: RequirementDiff = Field(..., description="Changes since the previous analysis")
+
+class HistorySummary(BaseModel):
+    """Analysis history entry without the full results"""
+    id: int = Field(..., description="History ID; GET /api/history/{id} returns the full results")
+    filename: str = Field(..., description="Original filename")
+    content_hash: str = Field(..., description="SHA-256 of the uploaded bytes")
+    timestamp: str = Field(..., description="Analysis timestamp")
+    summary: Summary = Field(..., description="Analysis summary statistics")
+
+class HistoryPage(BaseModel):
+    """Page of analysis history, newest first"""
+    items: List[HistorySummary] = Field(..., description="Analysis summaries")
+    next_cursor: Optional[int] = Field(None, description="Cursor for the next page, or null on the last page")
+
+class JobStatus(BaseModel):
+    """Background analysis job status"""
+    job_id: str = Field(..., description="Job identifier")
+    filename: str = Field(..., description="Original filename")
+    status: str = Field(..., description="Job status: queued, running, succeeded, or failed")
+    stage: Optional[str] = Field(None, description="Pipeline stage: extracting, enhancing, or done")
+    progress: float = Field(..., ge=0, le=1, description="Fraction of the pipeline completed (0-1)")
+    error: Optional[str] = Field(None, description="Error detail if the job failed")
+    result: Optional[AnalysisResponse] = Field(None, description="Analysis results once the job succeeded")
+    created_at: str = Field(..., description="Submission timestamp")
+    updated_at: str = Field(..., description="Last status change timestamp")
 
 class HealthResponse(BaseModel):
     """Health check response"""
@@ -1,38 +1,24 @@
+import asyncio
+import hashlib
+import json
 import re
-import random
-from typing import List, Dict
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Tuple
 from models.schemas import Requirement
+from services.keyword_automaton import get_keyword_automaton, AMBIGUOUS_TERM
+from services.keywords import AMBIGUOUS_TERMS
+from services.cache import EnhancementCache, DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL_SECONDS
+from services.metrics import ENHANCEMENT_SECONDS, SERVICE_READY, SERVICE_DEGRADED
 import os
-import requests
+import time
+import httpx
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI
     _openai_available = True
 except ImportError:
     _openai_available = False
 
-# Constants for ambiguous terms and enhancement suggestions
-AMBIGUOUS_TERMS = {
-    'fast': 'Define specific response time (e.g., "under 2 seconds")',
-    'quick': 'Specify time constraints (e.g., "within 30 seconds")',
-    'efficient': 'Define efficiency metrics (e.g., "using less than 100MB RAM")',
-    'user-friendly': 'Define usability criteria (e.g., "completable in under 3 clicks")',
-    'intuitive': 'Specify user experience requirements (e.g., "follows standard UI patterns")',
-    'secure': 'Define security standards (e.g., "AES-256 encryption, HTTPS only")',
-    'reliable': 'Specify reliability metrics (e.g., "99.9% uptime")',
-    'scalable': 'Define scalability requirements (e.g., "support 10,000 concurrent users")',
-    'maintainable': 'Specify maintainability criteria (e.g., "modular architecture")',
-    'compatible': 'Define compatibility requirements (e.g., "works with Chrome 90+")',
-    'portable': 'Specify portability requirements (e.g., "runs on Windows, Mac, Linux")',
-    'robust': 'Define robustness criteria (e.g., "handles network failures gracefully")',
-    'stable': 'Specify stability requirements (e.g., "no crashes during normal operation")',
-    'good': 'Replace with specific, measurable criteria',
-    'better': 'Define improvement metrics',
-    'best': 'Specify optimal performance criteria',
-    'appropriate': 'Define what constitutes appropriateness',
-    'suitable': 'Specify suitability criteria',
-    'adequate': 'Define adequacy standards',
-    'reasonable': 'Specify reasonableness criteria'
-}
+# Constants for enhancement suggestions
 ENHANCEMENT_SUGGESTIONS = {
     'Functional': [
         'Add specific acceptance criteria for testing.',
@@ -55,6 +41,25 @@ ENHANCEMENT_SUGGESTIONS = {
         'Define compatibility requirements.'
     ]
 }
+OPENAI_MODEL = "gpt-4o"
+HF_API_URL = "https://api-inference.huggingface.co/models"
+HF_MODEL_IDS = ["tiiuae/falcon-7b-instruct", "gpt2"]
+HF_TIMEOUT_SECONDS = 30
+# Bump whenever _build_prompt changes so cached enhancement results are not reused
+PROMPT_VERSION = "1"
+DEFAULT_MAX_CONCURRENCY = 8
+# Batch prompting: pack several requirements into one LLM call (AI_BATCH_PROMPTS)
+DEFAULT_BATCH_TOKEN_BUDGET = 3000
+DEFAULT_BATCH_MAX_SIZE = 20
+BATCH_OUTPUT_TOKENS_PER_ITEM = 96
+AMBIGUITY_LEVELS = ("Low", "Medium", "High")
+# Provider names used in fallback suggestions when a remote call fails
+PROVIDER_LABELS = {"openai": "OpenAI", "huggingface": "Hugging Face"}
+# Hugging Face statuses that no other model will answer differently
+HF_AUTH_STATUSES = (401, 403)
+# Requirements at or above this confidence with no ambiguous terms skip the
+# remote model (AI_ROUTE_MIN_CONFIDENCE; above 100 sends everything remote)
+DEFAULT_ROUTE_MIN_CONFIDENCE = 90
 GENERAL_SUGGESTIONS = [
     "Consider adding measurable acceptance criteria.",
     "Define specific success metrics for this requirement.",
@@ -66,28 +71,177 @@ GENERAL_SUGGESTIONS = [
 class AIAnalyzer:
     """AI service for enhancing requirements with suggestions and ambiguity detection."""
 
-    def __init__(self):
+    def __init__(self, max_concurrency: Optional[int] = None, cache: Optional[EnhancementCache] = None):
         self.ambiguous_terms = AMBIGUOUS_TERMS
         self.enhancement_suggestions = ENHANCEMENT_SUGGESTIONS
+        self.keyword_automaton = get_keyword_automaton()
+        # Maximum number of remote model requests in flight at once (AI_MAX_CONCURRENCY)
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("AI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        )
+        self._request_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._openai_client = None
+        self._openai_api_key = None
+        self._http_client = None
+        # Remote enhancement results keyed by requirement content
+        # (ENHANCEMENT_CACHE_SIZE, ENHANCEMENT_CACHE_TTL, ENHANCEMENT_CACHE_DB)
+        self.cache = cache or EnhancementCache(
+            maxsize=int(os.getenv("ENHANCEMENT_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+            ttl=float(os.getenv("ENHANCEMENT_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS)),
+            db_path=os.getenv("ENHANCEMENT_CACHE_DB")
+        )
+        # Batch prompting packs requirements into one call up to a token budget
+        # (AI_BATCH_PROMPTS, AI_BATCH_TOKEN_BUDGET, AI_BATCH_MAX_SIZE)
+        self.batch_prompts = os.getenv("AI_BATCH_PROMPTS", "false").lower() in ("1", "true", "yes")
+        self.batch_token_budget = int(os.getenv("AI_BATCH_TOKEN_BUDGET", DEFAULT_BATCH_TOKEN_BUDGET))
+        self.batch_max_size = int(os.getenv("AI_BATCH_MAX_SIZE", DEFAULT_BATCH_MAX_SIZE))
+        # Salt for choosing among equivalent local suggestions (SUGGESTION_SEED);
+        # the same requirement text always gets the same suggestion
+        self.suggestion_seed = os.getenv("SUGGESTION_SEED", "")
+        # Remote calls made and estimated prompt tokens sent
+        self.usage = {"calls": 0, "batched_calls": 0, "prompt_tokens": 0}
+        self.route_min_confidence = int(os.getenv("AI_ROUTE_MIN_CONFIDENCE", DEFAULT_ROUTE_MIN_CONFIDENCE))
+        # Requirements resolved by local heuristics vs sent to the remote provider,
+        # and remote ones served by their near-duplicate cluster's representative
+        self.routes = {"local": 0, "remote": 0, "clustered": 0}
 
     async def enhance_requirements(self, requirements: List[Requirement]) -> List[Requirement]:
         """
         Enhance requirements with AI-generated suggestions and improved ambiguity detection.
         If HF_API_KEY is set, use Hugging Face Inference API; else, try OpenAI; else, use local heuristics.
+        Clear-cut requirements are resolved locally even when a remote provider is configured.
+        """
+        provider, api_key = self._select_provider()
+        started = time.perf_counter()
+        enhanced = await self._enhance_with_provider(requirements, provider, api_key)
+        ENHANCEMENT_SECONDS.labels(provider).observe(time.perf_counter() - started)
+        return enhanced
+
+    async def stream_enhanced_requirements(self, requirements: AsyncIterable[Requirement]) -> AsyncIterator[Requirement]:
+        """
+        Enhance requirements one at a time, yielding each as soon as it completes.
+
+        Args:
+            requirements (AsyncIterable[Requirement]): Requirements to enhance, e.g. MLPipeline.stream_requirements.
+
+        Yields:
+            Requirement: Enhanced requirements in input order.
         """
+        provider, api_key = self._select_provider()
+        # Keep up to max_concurrency requirements in flight, but always
+        # yield in input order.
+        pending = deque()
+        started = time.perf_counter()
+        try:
+            async for requirement in requirements:
+                pending.append(asyncio.ensure_future(
+                    self._enhance_with_provider([requirement], provider, api_key)
+                ))
+                while pending and (pending[0].done() or len(pending) >= self.max_concurrency):
+                    enhanced = await pending.popleft()
+                    yield enhanced[0]
+            while pending:
+                enhanced = await pending.popleft()
+                yield enhanced[0]
+            # One sample per streamed document, like enhance_requirements
+            ENHANCEMENT_SECONDS.labels(provider).observe(time.perf_counter() - started)
+        finally:
+            # The consumer went away (e.g. client disconnected); drop in-flight work.
+            for task in pending:
+                task.cancel()
+
+    def _select_provider(self) -> Tuple[str, Optional[str]]:
+        """Pick the enhancement provider from the configured API keys."""
         hf_api_key = os.getenv("HF_API_KEY")
         if hf_api_key:
-            return await self._enhance_with_huggingface(requirements, hf_api_key)
+            return "huggingface", hf_api_key
         openai_api_key = os.getenv("OPENAI_API_KEY")
         if openai_api_key and _openai_available:
-            return await self._enhance_with_openai(requirements, openai_api_key)
-        # fallback to local logic
+            return "openai", openai_api_key
+        return "local", None
+
+    async def _enhance_with_provider(self, requirements: List[Requirement], provider: str, api_key: Optional[str]) -> List[Requirement]:
+        """
+        Enhance requirements with the given provider.
+
+        Requirements that _resolve_locally accepts are handled by the local
+        heuristics; only the rest are sent to the remote provider, one per
+        near-duplicate cluster (see MLPipeline.extract_requirements). Results
+        keep input order.
+        """
+        if provider == "local":
+            remote_indices = []
+        else:
+            remote_indices = [
+                index for index, requirement in enumerate(requirements)
+                if not self._resolve_locally(requirement)
+            ]
+        self.routes["remote"] += len(remote_indices)
+        self.routes["local"] += len(requirements) - len(remote_indices)
+        # Near-duplicates share one remote call: when a cluster's first
+        # requirement is sent, its result is fanned out to the other members.
+        # Members are only checked against that requirement, so when it is
+        # resolved locally they are sent on their own.
+        representatives: Dict[str, int] = {}
+        sent_indices = []
+        for index in remote_indices:
+            cluster_id = requirements[index].cluster_id
+            if cluster_id is not None and cluster_id in representatives:
+                continue
+            if cluster_id is not None and requirements[index].id == cluster_id:
+                representatives[cluster_id] = index
+            sent_indices.append(index)
+        self.routes["clustered"] += len(remote_indices) - len(sent_indices)
+        remote = [requirements[index] for index in sent_indices]
+        enhanced_remote = []
+        if provider == "huggingface" and remote:
+            enhanced_remote = await self._enhance_with_huggingface(remote, api_key)
+        elif provider == "openai" and remote:
+            enhanced_remote = await self._enhance_with_openai(remote, api_key)
+        enhanced_by_index = dict(zip(sent_indices, enhanced_remote))
+        for index in remote_indices:
+            if index not in enhanced_by_index:
+                representative = enhanced_by_index[representatives[requirements[index].cluster_id]]
+                enhanced_by_index[index] = requirements[index].model_copy(update={
+                    "ambiguity": representative.ambiguity,
+                    "suggestion": representative.suggestion
+                })
+        # local logic for the rest
         enhanced_requirements = []
-        for requirement in requirements:
-            enhanced_req = await self._enhance_single_requirement(requirement)
+        for index, requirement in enumerate(requirements):
+            enhanced_req = enhanced_by_index.get(index)
+            if enhanced_req is None:
+                enhanced_req = await self._enhance_single_requirement(requirement)
             enhanced_requirements.append(enhanced_req)
         return enhanced_requirements
 
+    def config_key(self) -> str:
+        """Identify the provider, model and settings that shape enhancement, for whole-document result cache keys."""
+        provider, _ = self._select_provider()
+        model = {"openai": OPENAI_MODEL, "huggingface": ",".join(HF_MODEL_IDS)}.get(provider, "")
+        return "\x1f".join([
+            provider, model, PROMPT_VERSION, str(self.route_min_confidence), str(self.batch_prompts), self.suggestion_seed
+        ])
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Enhancement provider in use.
+
+        Degraded when an OpenAI key is configured but the openai package is
+        missing, so requirements silently fall back to local heuristics.
+        """
+        provider, _ = self._select_provider()
+        misconfigured = provider == "local" and bool(os.getenv("OPENAI_API_KEY")) and not _openai_available
+        return {"status": SERVICE_DEGRADED if misconfigured else SERVICE_READY, "provider": provider}
+
+    def _resolve_locally(self, requirement: Requirement) -> bool:
+        """Whether a requirement is clear-cut enough to skip the remote model."""
+        return (
+            requirement.confidence >= self.route_min_confidence
+            and requirement.ambiguity == "Low"
+            and not self._detect_ambiguous_terms(requirement.text)
+        )
+
     async def _enhance_single_requirement(self, requirement: Requirement) -> Requirement:
         """
         Enhance a single requirement with better suggestions and ambiguity detection.
@@ -109,108 +263,351 @@ class AIAnalyzer:
             type=requirement.type,
             confidence=requirement.confidence,
             ambiguity=new_ambiguity,
-            suggestion=enhanced_suggestion
+            suggestion=enhanced_suggestion,
+            cluster_id=requirement.cluster_id
+        )
+
+    def _build_prompt(self, req: Requirement) -> str:
+        """Build the single-requirement analysis prompt sent to remote models."""
+        return (
+            f"Requirement: {req.text}\n"
+            f"Type: {req.type}\n"
+            f"Confidence: {req.confidence}\n"
+            "\n"
+            "Analyze the above software requirement.\n"
+            "1. Detect and list any ambiguous terms or phrases.\n"
+            "2. Rate the overall ambiguity as Low, Medium, or High.\n"
+            "3. Suggest a concrete, measurable improvement.\n"
+            "Respond in JSON with keys: ambiguous_terms (list), ambiguity (str), suggestion (str)."
         )
 
+    def _get_openai_client(self, api_key: str) -> "AsyncOpenAI":
+        """Return the long-lived async OpenAI client, recreating it if the key changed."""
+        if self._openai_client is None or self._openai_api_key != api_key:
+            self._openai_client = AsyncOpenAI(api_key=api_key)
+            self._openai_api_key = api_key
+        return self._openai_client
+
     async def _enhance_with_openai(self, requirements: List[Requirement], api_key: str) -> List[Requirement]:
         """
         Use OpenAI API to enhance requirements with suggestions and ambiguity detection.
+        Requests run concurrently, bounded by max_concurrency; results keep input order.
+        In batch mode, several requirements share one request.
         """
-        client = OpenAI(api_key=api_key)
-        enhanced_requirements = []
-        for req in requirements:
-            prompt = (
-                f"Requirement: {req.text}\n"
-                f"Type: {req.type}\n"
-                f"Confidence: {req.confidence}\n"
-                "\n"
-                "Analyze the above software requirement.\n"
-                "1. Detect and list any ambiguous terms or phrases.\n"
-                "2. Rate the overall ambiguity as Low, Medium, or High.\n"
-                "3. Suggest a concrete, measurable improvement.\n"
-                "Respond in JSON with keys: ambiguous_terms (list), ambiguity (str), suggestion (str)."
+        client = self._get_openai_client(api_key)
+        if self.batch_prompts and len(requirements) > 1:
+            complete_batch = lambda batch: self._complete_openai(
+                client, self._build_batch_prompt(batch), BATCH_OUTPUT_TOKENS_PER_ITEM * len(batch),
+                parse=lambda content: self._parse_batch_response(content, batch)
             )
-            try:
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=256,
-                    temperature=0.2
+            # Batched requirements already missed the cache
+            enhance_one = lambda req: self._enhance_one_with_openai(client, req, check_cache=False)
+            return await self._enhance_batched(requirements, "openai", OPENAI_MODEL, complete_batch, enhance_one)
+        return list(await asyncio.gather(*(self._enhance_one_with_openai(client, req) for req in requirements)))
+
+    async def _complete_openai(self, client: "AsyncOpenAI", prompt: str, max_tokens: int, parse: Callable[[str], Any]) -> Any:
+        """Send one chat completion and parse its content."""
+        self._record_call(prompt)
+        async with self._request_semaphore:
+            response = await client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=0.2
+            )
+        return parse(response.choices[0].message.content)
+
+    async def _enhance_one_with_openai(self, client: "AsyncOpenAI", req: Requirement, check_cache: bool = True) -> Requirement:
+        """Enhance a single requirement with one OpenAI chat completion."""
+        cache_key = self.cache.make_key(req.text, req.type, "openai", OPENAI_MODEL, PROMPT_VERSION)
+        cached = self.cache.get(cache_key) if check_cache else None
+        if cached is not None:
+            return self._apply_cached_result(req, cached)
+        prompt = self._build_prompt(req)
+        try:
+            # Try to parse JSON from the response
+            result = await self._complete_openai(client, prompt, 256, parse=json.loads)
+            ambiguous_terms = result.get("ambiguous_terms", [])
+            ambiguity = result.get("ambiguity", "Medium")
+            suggestion = result.get("suggestion", "Consider making this requirement more specific.")
+            self.cache.set(cache_key, {"ambiguity": ambiguity, "suggestion": suggestion})
+        except Exception as e:
+            return self._apply_provider_error(req, "openai", e)
+        return Requirement(
+            id=req.id,
+            text=req.text,
+            type=req.type,
+            confidence=req.confidence,
+            ambiguity=ambiguity,
+            suggestion=suggestion,
+            cluster_id=req.cluster_id
+        )
+
+    def _apply_provider_error(self, req: Requirement, provider: str, error: Exception) -> Requirement:
+        """Build the fallback requirement reported when a remote call fails."""
+        return Requirement(
+            id=req.id,
+            text=req.text,
+            type=req.type,
+            confidence=req.confidence,
+            ambiguity="Medium",
+            suggestion=f"{PROVIDER_LABELS[provider]} error: {error}. Falling back to local suggestion.",
+            cluster_id=req.cluster_id
+        )
+
+    def _apply_cached_result(self, req: Requirement, cached: Dict[str, str]) -> Requirement:
+        """Build an enhanced requirement from a cached remote result."""
+        return Requirement(
+            id=req.id,
+            text=req.text,
+            type=req.type,
+            confidence=req.confidence,
+            ambiguity=cached["ambiguity"],
+            suggestion=cached["suggestion"],
+            cluster_id=req.cluster_id
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the long-lived pooled HTTP client, creating it on first use."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=HF_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
                 )
-                import json as _json
-                content = response.choices[0].message.content
-                # Try to parse JSON from the response
-                result = _json.loads(content)
-                ambiguous_terms = result.get("ambiguous_terms", [])
-                ambiguity = result.get("ambiguity", "Medium")
-                suggestion = result.get("suggestion", "Consider making this requirement more specific.")
-            except Exception as e:
-                ambiguous_terms = []
-                ambiguity = "Medium"
-                suggestion = f"OpenAI error: {e}. Falling back to local suggestion."
-            enhanced_requirements.append(Requirement(
-                id=req.id,
-                text=req.text,
-                type=req.type,
-                confidence=req.confidence,
-                ambiguity=ambiguity,
-                suggestion=suggestion
-            ))
-        return enhanced_requirements
+            )
+        return self._http_client
+
+    async def aclose(self):
+        """Close pooled connections; called from the FastAPI lifespan on shutdown."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        if self._openai_client is not None:
+            await self._openai_client.close()
+            self._openai_client = None
 
     async def _enhance_with_huggingface(self, requirements: List[Requirement], api_key: str) -> List[Requirement]:
         """
         Use Hugging Face Inference API to enhance requirements with suggestions and ambiguity detection.
         Try 'tiiuae/falcon-7b-instruct' first, fall back to 'gpt2' if unavailable.
+        Requests share one keep-alive connection pool and run concurrently, bounded by max_concurrency.
+        In batch mode, several requirements share one request.
         """
-        model_ids = ["tiiuae/falcon-7b-instruct", "gpt2"]
+        client = self._get_http_client()
         headers = {"Authorization": f"Bearer {api_key}"}
-        enhanced_requirements = []
-        for req in requirements:
-            prompt = (
-                f"Requirement: {req.text}\n"
-                f"Type: {req.type}\n"
-                f"Confidence: {req.confidence}\n"
-                "\n"
-                "Analyze the above software requirement.\n"
-                "1. Detect and list any ambiguous terms or phrases.\n"
-                "2. Rate the overall ambiguity as Low, Medium, or High.\n"
-                "3. Suggest a concrete, measurable improvement.\n"
-                "Respond in JSON with keys: ambiguous_terms (list), ambiguity (str), suggestion (str)."
+        if self.batch_prompts and len(requirements) > 1:
+            complete_batch = lambda batch: self._complete_huggingface(
+                client, headers, self._build_batch_prompt(batch),
+                parse=lambda content: self._parse_batch_response(content, batch),
+                parameters={"max_new_tokens": BATCH_OUTPUT_TOKENS_PER_ITEM * len(batch), "return_full_text": False}
             )
-            result = None
-            for model_id in model_ids:
-                api_url = f"https://api-inference.huggingface.co/models/{model_id}"
-                try:
-                    response = requests.post(api_url, headers=headers, json={"inputs": prompt}, timeout=30)
-                    response.raise_for_status()
-                    import json as _json
-                    content = response.json()
-                    if isinstance(content, list) and content and 'generated_text' in content[0]:
-                        result = _json.loads(content[0]['generated_text'])
-                    else:
-                        result = _json.loads(content)
-                    break  # Success, break out of model loop
-                except Exception as e:
-                    last_error = e
-                    continue  # Try next model
-            if result:
-                ambiguous_terms = result.get("ambiguous_terms", [])
-                ambiguity = result.get("ambiguity", "Medium")
-                suggestion = result.get("suggestion", "Consider making this requirement more specific.")
+            # Batched requirements already missed the cache
+            enhance_one = lambda req: self._enhance_one_with_huggingface(client, headers, req, check_cache=False)
+            model = ",".join(HF_MODEL_IDS)
+            return await self._enhance_batched(requirements, "huggingface", model, complete_batch, enhance_one)
+        return list(await asyncio.gather(*(
+            self._enhance_one_with_huggingface(client, headers, req) for req in requirements
+        )))
+
+    async def _complete_huggingface(self, client: httpx.AsyncClient, headers: Dict[str, str], prompt: str,
+                                    parse: Callable[[str], Any], parameters: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Query each Hugging Face model in turn until one returns a parseable response.
+
+        Authentication failures are raised at once, as every model would reject the key alike.
+        """
+        payload = {"inputs": prompt}
+        if parameters:
+            payload["parameters"] = parameters
+        last_error = None
+        for model_id in HF_MODEL_IDS:
+            api_url = f"{HF_API_URL}/{model_id}"
+            try:
+                self._record_call(prompt)
+                async with self._request_semaphore:
+                    response = await client.post(api_url, headers=headers, json=payload)
+                response.raise_for_status()
+                content = response.json()
+                if isinstance(content, list) and content and 'generated_text' in content[0]:
+                    return parse(content[0]['generated_text'])
+                return parse(content)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code in HF_AUTH_STATUSES:
+                    raise
+                last_error = e
+            except Exception as e:
+                last_error = e
+                continue  # Try next model
+        raise last_error
+
+    async def _enhance_one_with_huggingface(self, client: httpx.AsyncClient, headers: Dict[str, str], req: Requirement,
+                                            check_cache: bool = True) -> Requirement:
+        """Enhance a single requirement, trying each Hugging Face model in turn."""
+        cache_key = self.cache.make_key(req.text, req.type, "huggingface", ",".join(HF_MODEL_IDS), PROMPT_VERSION)
+        cached = self.cache.get(cache_key) if check_cache else None
+        if cached is not None:
+            return self._apply_cached_result(req, cached)
+        try:
+            result = await self._complete_huggingface(client, headers, self._build_prompt(req), parse=json.loads)
+            ambiguous_terms = result.get("ambiguous_terms", [])
+            ambiguity = result.get("ambiguity", "Medium")
+            suggestion = result.get("suggestion", "Consider making this requirement more specific.")
+            self.cache.set(cache_key, {"ambiguity": ambiguity, "suggestion": suggestion})
+        except Exception as e:
+            return self._apply_provider_error(req, "huggingface", e)
+        return Requirement(
+            id=req.id,
+            text=req.text,
+            type=req.type,
+            confidence=req.confidence,
+            ambiguity=ambiguity,
+            suggestion=suggestion,
+            cluster_id=req.cluster_id
+        )
+
+    def _build_batch_prompt(self, batch: List[Requirement]) -> str:
+        """Build one prompt covering several requirements, with the instructions stated once."""
+        items = "\n".join(
+            json.dumps({"id": req.id, "type": req.type, "confidence": req.confidence, "text": req.text})
+            for req in batch
+        )
+        return (
+            "Analyze each of the following software requirements (one JSON object per line).\n"
+            f"{items}\n"
+            "\n"
+            "For every requirement:\n"
+            "1. Detect and list any ambiguous terms or phrases.\n"
+            "2. Rate the overall ambiguity as Low, Medium, or High.\n"
+            "3. Suggest a concrete, measurable improvement.\n"
+            "Respond with a JSON array containing one object per requirement, with keys: "
+            "id (str, copied from the input), ambiguous_terms (list), ambiguity (str), suggestion (str)."
+        )
+
+    def _pack_batches(self, requirements: List[Requirement]) -> List[List[Requirement]]:
+        """
+        Greedily pack requirements into batches that fit the token budget.
+
+        Args:
+            requirements (List[Requirement]): Requirements to pack, in order.
+
+        Returns:
+            List[List[Requirement]]: Batches of at most batch_max_size requirements whose
+            estimated prompt plus answer tokens stay within batch_token_budget.
+        """
+        batches = []
+        batch, batch_tokens = [], 0
+        for req in requirements:
+            cost = self._estimate_tokens(req.text) + BATCH_OUTPUT_TOKENS_PER_ITEM
+            if batch and (batch_tokens + cost > self.batch_token_budget or len(batch) >= self.batch_max_size):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(req)
+            batch_tokens += cost
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _parse_batch_response(self, content: str, batch: List[Requirement]) -> Dict[str, Dict[str, str]]:
+        """
+        Extract per-requirement results from a batch response.
+
+        Args:
+            content (str): Model output expected to contain a JSON array.
+            batch (List[Requirement]): Requirements sent in the prompt.
+
+        Returns:
+            Dict[str, Dict[str, str]]: Valid results keyed by requirement ID; missing or
+            malformed items are left out so they can be retried individually.
+
+        Raises:
+            ValueError: If the response holds no JSON array (json.JSONDecodeError is one).
+        """
+        if not isinstance(content, str):
+            raise ValueError("Batch response is not text")
+        start, end = content.find("["), content.rfind("]")
+        if start == -1 or end < start:
+            raise ValueError("Batch response contains no JSON array")
+        items = json.loads(content[start:end + 1])
+        if not isinstance(items, list):
+            raise ValueError("Batch response is not a JSON array")
+        expected_ids = {req.id for req in batch}
+        results = {}
+        for item in items:
+            if not isinstance(item, dict) or item.get("id") not in expected_ids:
+                continue
+            ambiguity, suggestion = item.get("ambiguity"), item.get("suggestion")
+            if ambiguity in AMBIGUITY_LEVELS and isinstance(suggestion, str) and suggestion:
+                results[item["id"]] = {"ambiguity": ambiguity, "suggestion": suggestion}
+        return results
+
+    async def _enhance_batched(self, requirements: List[Requirement], provider: str, model: str,
+                               complete_batch: Callable[[List[Requirement]], Awaitable[Dict[str, Dict[str, str]]]],
+                               enhance_one: Callable[[Requirement], Awaitable[Requirement]]) -> List[Requirement]:
+        """Serve cached requirements, then enhance the rest in token-budgeted batches."""
+        enhanced = {}
+        misses = []
+        for req in requirements:
+            cached = self.cache.get(self.cache.make_key(req.text, req.type, provider, model, PROMPT_VERSION))
+            if cached is not None:
+                enhanced[req.id] = self._apply_cached_result(req, cached)
             else:
-                ambiguous_terms = []
-                ambiguity = "Medium"
-                suggestion = f"Hugging Face error: {last_error}. Falling back to local suggestion."
-            enhanced_requirements.append(Requirement(
-                id=req.id,
-                text=req.text,
-                type=req.type,
-                confidence=req.confidence,
-                ambiguity=ambiguity,
-                suggestion=suggestion
-            ))
-        return enhanced_requirements
+                misses.append(req)
+        batch_results = await asyncio.gather(*(
+            self._enhance_batch(batch, provider, model, complete_batch, enhance_one)
+            for batch in self._pack_batches(misses)
+        ))
+        for batch in batch_results:
+            for req in batch:
+                enhanced[req.id] = req
+        return [enhanced[req.id] for req in requirements]
+
+    async def _enhance_batch(self, batch: List[Requirement], provider: str, model: str,
+                             complete_batch: Callable[[List[Requirement]], Awaitable[Dict[str, Dict[str, str]]]],
+                             enhance_one: Callable[[Requirement], Awaitable[Requirement]]) -> List[Requirement]:
+        """
+        Enhance one batch with a single call.
+
+        An unparseable response is split in half and retried; items missing
+        from a partial response are retried individually. Transport, timeout
+        and authentication errors would fail the retries alike, so the whole
+        batch falls back at once.
+        """
+        if len(batch) == 1:
+            return [await enhance_one(batch[0])]
+        try:
+            self.usage["batched_calls"] += 1
+            results = await complete_batch(batch)
+        except ValueError:
+            middle = len(batch) // 2
+            halves = await asyncio.gather(
+                self._enhance_batch(batch[:middle], provider, model, complete_batch, enhance_one),
+                self._enhance_batch(batch[middle:], provider, model, complete_batch, enhance_one)
+            )
+            return halves[0] + halves[1]
+        except Exception as e:
+            return [self._apply_provider_error(req, provider, e) for req in batch]
+        missing = [req for req in batch if req.id not in results]
+        retried = {req.id: req for req in await asyncio.gather(*(enhance_one(req) for req in missing))}
+        enhanced = []
+        for req in batch:
+            if req.id in retried:
+                enhanced.append(retried[req.id])
+                continue
+            result = results[req.id]
+            self.cache.set(self.cache.make_key(req.text, req.type, provider, model, PROMPT_VERSION), result)
+            enhanced.append(self._apply_cached_result(req, result))
+        return enhanced
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Rough token estimate (about four characters per token)."""
+        return len(text) // 4 + 1
+
+    def _record_call(self, prompt: str):
+        """Count a remote call and its estimated prompt tokens."""
+        self.usage["calls"] += 1
+        self.usage["prompt_tokens"] += self._estimate_tokens(prompt)
 
     def _detect_ambiguous_terms(self, text: str) -> List[str]:
         """
@@ -222,12 +619,7 @@ class AIAnalyzer:
         Returns:
             List[str]: List of detected ambiguous terms.
         """
-        detected_terms = []
-        text_lower = text.lower()
-        for term in self.ambiguous_terms.keys():
-            if term.lower() in text_lower:
-                detected_terms.append(term)
-        return detected_terms
+        return self.keyword_automaton.scan(text.lower()).matched(AMBIGUOUS_TERM)
 
     def _generate_enhanced_suggestion(self, text: str, req_type: str, ambiguous_terms: List[str]) -> str:
         """
@@ -247,13 +639,29 @@ class AIAnalyzer:
                 suggestions.append(f"'{term}': {self.ambiguous_terms[term]}")
         if req_type in self.enhancement_suggestions:
             type_suggestions = self.enhancement_suggestions[req_type]
-            suggestions.append(random.choice(type_suggestions))
-        suggestions.append(random.choice(GENERAL_SUGGESTIONS))
+            suggestions.append(self._stable_choice(type_suggestions, text, req_type))
+        suggestions.append(self._stable_choice(GENERAL_SUGGESTIONS, text, "general"))
         if suggestions:
             return " | ".join(suggestions[:3])
         else:
             return "Consider adding more specific details and measurable criteria."
 
+    def _stable_choice(self, options: List[str], text: str, slot: str) -> str:
+        """
+        Pick an option from a hash of the text, so identical input gives identical output.
+
+        Args:
+            options (List[str]): Candidates to choose from.
+            text (str): Requirement text.
+            slot (str): Distinguishes independent choices for the same text.
+
+        Returns:
+            str: The chosen option.
+        """
+        material = "\x1f".join([self.suggestion_seed, slot, text])
+        digest = hashlib.sha256(material.encode("utf-8")).digest()
+        return options[int.from_bytes(digest[:8], "big") % len(options)]
+
     def _calculate_enhanced_ambiguity(self, ambiguous_terms: List[str]) -> str:
         """
         Calculate enhanced ambiguity level based on detected terms.
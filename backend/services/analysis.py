@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import os
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from fastapi import HTTPException
+from models.schemas import AnalysisResponse, Requirement
+from services.ai_analyzer import AIAnalyzer
+from services.cache import LRUCache
+from services.file_processor import FileProcessor
+from services.history import HistoryStore
+from services.ingestion import SpooledUpload, MAX_UPLOAD_BYTES
+from services.metrics import REGISTRY, DrainedSamples
+from services.ml_pipeline import MLPipeline
+
+# Whole-document results keyed by the uploaded bytes, file type and pipeline configuration
+DEFAULT_RESULT_CACHE_SIZE = 256
+DEFAULT_RESULT_CACHE_TTL_SECONDS = 24 * 3600
+
+# Pipeline stages reported to progress callbacks, with the fraction done when each starts
+STAGE_EXTRACTING = "extracting"
+STAGE_ENHANCING = "enhancing"
+STAGE_DONE = "done"
+STAGE_PROGRESS = {STAGE_EXTRACTING: 0.0, STAGE_ENHANCING: 0.5, STAGE_DONE: 1.0}
+
+ProgressCallback = Callable[[str, float], None]
+
+# FileProcessor and MLPipeline of a pool worker process, built on first use
+_worker_pipeline: Optional[Tuple[FileProcessor, MLPipeline]] = None
+
+def extract_in_worker(source: Union[str, bytes], filename: str) -> Tuple[List[Dict[str, Any]], DrainedSamples]:
+    """
+    Extract requirements from a document inside a process pool worker.
+
+    Args:
+        source (Union[str, bytes]): Path of a spooled upload, or its content.
+        filename (str): Original filename, which selects the parser.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], DrainedSamples]: The requirements as dicts, which
+        pickle back cheaply, and the stage metrics recorded in the worker.
+
+    Raises:
+        RuntimeError: If extraction fails (HTTPException does not survive pickling).
+    """
+    global _worker_pipeline
+    if _worker_pipeline is None:
+        # Forked workers inherit the parent's samples; only report their own
+        REGISTRY.drain()
+        # Workers parse PDFs on a thread instead of starting a nested process pool
+        _worker_pipeline = (FileProcessor(pdf_workers=1, pdf_pool_min_bytes=MAX_UPLOAD_BYTES + 1), MLPipeline())
+    file_processor, ml_pipeline = _worker_pipeline
+    if isinstance(source, str):
+        # Read the parent's spilled file in place rather than loading and re-buffering it
+        upload = SpooledUpload.from_path(filename, source)
+    else:
+        upload = SpooledUpload(filename, spool_bytes=len(source) + 1)
+        upload.write(source)
+    try:
+        with upload:
+            requirements = asyncio.run(ml_pipeline.extract_requirements(file_processor.iter_text(upload)))
+    except HTTPException as e:
+        raise RuntimeError(e.detail) from None
+    return [requirement.model_dump() for requirement in requirements], REGISTRY.drain()
+
+def build_summary(requirements: List[Requirement]) -> Dict[str, int]:
+    """Count requirements by type and ambiguity"""
+    return {
+        "total": len(requirements),
+        "functional": len([r for r in requirements if r.type == "Functional"]),
+        "nonFunctional": len([r for r in requirements if r.type == "Non-Functional"]),
+        "ambiguities": len([r for r in requirements if r.ambiguity in ["High", "Medium"]])
+    }
+
+def collect_ambiguities(requirements: List[Requirement]) -> List[Dict[str, str]]:
+    """List requirements with Medium or High ambiguity"""
+    return [
+        {"id": r.id, "text": r.text, "severity": r.ambiguity}
+        for r in requirements
+        if r.ambiguity in ["High", "Medium"]
+    ]
+
+class AnalysisService:
+    """
+    Runs the FileProcessor -> MLPipeline -> AIAnalyzer pipeline on an ingested upload.
+
+    Shared by the synchronous /api/analyze endpoint and the background job
+    workers, so both use the same whole-document result cache and record
+    every analysis in the same history store.
+    """
+
+    def __init__(self, file_processor: FileProcessor, ml_pipeline: MLPipeline, ai_analyzer: AIAnalyzer,
+                 result_cache: Optional[LRUCache] = None, history: Optional[HistoryStore] = None):
+        self.file_processor = file_processor
+        self.ml_pipeline = ml_pipeline
+        self.ai_analyzer = ai_analyzer
+        self.history = history
+        # RESULT_CACHE_SIZE entries, evicted least-recently-used or after RESULT_CACHE_TTL seconds
+        self.result_cache = result_cache or LRUCache(
+            maxsize=int(os.getenv("RESULT_CACHE_SIZE", DEFAULT_RESULT_CACHE_SIZE)),
+            ttl=float(os.getenv("RESULT_CACHE_TTL", DEFAULT_RESULT_CACHE_TTL_SECONDS))
+        )
+
+    def result_key(self, upload: SpooledUpload) -> str:
+        """
+        Build the result cache key of an upload.
+
+        Covers the content hash, the file extension (which selects the parser)
+        and the extraction and enhancement configuration, so changing the
+        engine, model or provider does not serve analyses made with the old one.
+
+        Returns:
+            str: Hex SHA-256 digest.
+        """
+        material = "\x1e".join([
+            upload.sha256, os.path.splitext(upload.filename)[1].lower(),
+            self.ml_pipeline.config_key(), self.ai_analyzer.config_key()
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def cached_result(self, upload: SpooledUpload) -> Optional[AnalysisResponse]:
+        """Return the cached analysis of identical content and configuration, relabeled with this upload's filename and time."""
+        cached = self.result_cache.get(self.result_key(upload))
+        if cached is None:
+            return None
+        return cached.model_copy(update={"filename": upload.filename, "timestamp": datetime.now().isoformat()})
+
+    def record(self, result: AnalysisResponse, content_hash: str, client_id: Optional[str] = None,
+               result_key: Optional[str] = None) -> AnalysisResponse:
+        """Add a result to the client's history, if there is a history store and a client, and tag it with its history ID."""
+        if self.history is None or client_id is None:
+            return result
+        history_id = self.history.record(result, content_hash, client_id, result_key)
+        return result.model_copy(update={"history_id": history_id})
+
+    def record_cached(self, cached: AnalysisResponse, upload: SpooledUpload, result_key: str,
+                      client_id: Optional[str] = None) -> AnalysisResponse:
+        """Tag a result cache hit with the client's existing history entry for it, recording one only if there is none."""
+        if self.history is None or client_id is None:
+            return cached
+        history_id = self.history.find(result_key, upload.filename, client_id)
+        if history_id is None:
+            return self.record(cached, upload.sha256, client_id, result_key)
+        return cached.model_copy(update={"history_id": history_id})
+
+    async def analyze(self, upload: SpooledUpload, progress: Optional[ProgressCallback] = None,
+                      executor: Optional[Executor] = None, client_id: Optional[str] = None) -> AnalysisResponse:
+        """
+        Analyze an ingested upload, serving identical content from the result cache.
+
+        Args:
+            upload (SpooledUpload): The buffered upload; the caller closes it.
+            progress (Optional[ProgressCallback]): Called with (stage, fraction done) as stages start.
+            executor (Optional[Executor]): Process pool to run text extraction and
+                classification in; by default they run on the event loop.
+            client_id (Optional[str]): Client whose history the analysis is recorded in.
+
+        Returns:
+            AnalysisResponse: Summary, requirements and ambiguities.
+        """
+        report = progress or (lambda stage, fraction: None)
+        result_key = self.result_key(upload)
+        cached = self.cached_result(upload)
+        if cached is not None:
+            report(STAGE_DONE, STAGE_PROGRESS[STAGE_DONE])
+            # Re-uploads reuse the history entry instead of adding one per cache hit
+            return self.record_cached(cached, upload, result_key, client_id)
+
+        # Extract requirements using ML, fed chunk by chunk from text extraction
+        report(STAGE_EXTRACTING, STAGE_PROGRESS[STAGE_EXTRACTING])
+        if executor is None:
+            requirements = await self.ml_pipeline.extract_requirements(self.file_processor.iter_text(upload))
+        else:
+            requirements = await self._extract_in_executor(upload, executor)
+
+        # Analyze with AI for suggestions and ambiguities
+        report(STAGE_ENHANCING, STAGE_PROGRESS[STAGE_ENHANCING])
+        enhanced_requirements = await self.ai_analyzer.enhance_requirements(requirements)
+
+        result = AnalysisResponse(
+            summary=build_summary(enhanced_requirements),
+            requirements=enhanced_requirements,
+            ambiguities=collect_ambiguities(enhanced_requirements),
+            filename=upload.filename,
+            timestamp=datetime.now().isoformat()
+        )
+        self.result_cache.set(result_key, result)
+        report(STAGE_DONE, STAGE_PROGRESS[STAGE_DONE])
+        return self.record(result, upload.sha256, client_id, result_key)
+
+    async def _extract_in_executor(self, upload: SpooledUpload, executor: Executor) -> List[Requirement]:
+        """Run extract_in_worker on an upload, passing spilled uploads by path."""
+        content = upload.open()
+        source = upload.path or content.read()
+        rows, samples = await asyncio.get_running_loop().run_in_executor(
+            executor, extract_in_worker, source, upload.filename
+        )
+        # Stage metrics recorded in the worker process count towards this one's /metrics
+        REGISTRY.merge(samples)
+        return [Requirement(**row) for row in rows]
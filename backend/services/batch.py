@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import os
+import posixpath
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Union
+from fastapi import HTTPException, UploadFile
+from models.schemas import BatchAnalysisResponse, BatchFileResult
+from services.analysis import AnalysisService
+from services.file_processor import SUPPORTED_EXTENSIONS
+from services.ingestion import SpooledUpload, ingest_upload, MAX_UPLOAD_BYTES, CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_EXTENSION = ".zip"
+FILE_SUCCEEDED = "succeeded"
+FILE_FAILED = "failed"
+# Files per batch, counting archive members (BATCH_MAX_FILES)
+DEFAULT_BATCH_MAX_FILES = 50
+# Size limit of an uploaded zip archive (BATCH_MAX_ARCHIVE_BYTES)
+DEFAULT_BATCH_MAX_ARCHIVE_BYTES = 100 * 1024 * 1024
+# Total decompressed size of the archive members in a batch (BATCH_MAX_EXPANDED_BYTES)
+DEFAULT_BATCH_MAX_EXPANDED_BYTES = 500 * 1024 * 1024
+# Errors a corrupt or unsupported member raises while it is decompressed
+MEMBER_READ_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError)
+
+# An ingested document, or a file that already failed
+BatchEntry = Union[SpooledUpload, BatchFileResult]
+
+def _failed(filename: str, detail: str) -> BatchFileResult:
+    return BatchFileResult(filename=filename, status=FILE_FAILED, error=detail)
+
+def _is_document(filename: str) -> bool:
+    return filename.lower().endswith(tuple(SUPPORTED_EXTENSIONS))
+
+def _too_many_files(max_files: int) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"A batch can contain at most {max_files} files")
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Archives in a batch can expand to at most {max_bytes // (1024 * 1024)}MB"
+    )
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, name: str,
+                 max_bytes: int = MAX_UPLOAD_BYTES) -> SpooledUpload:
+    """Decompress an archive member into a SpooledUpload, stopping once it exceeds max_bytes."""
+    upload = SpooledUpload(name)
+    try:
+        with archive.open(info) as member:
+            while True:
+                chunk = member.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                # Declared sizes can lie, so the limit is checked on the decompressed bytes
+                if upload.size + len(chunk) > max_bytes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File size must be less than {MAX_UPLOAD_BYTES // (1024 * 1024)}MB"
+                    )
+                upload.write(chunk)
+    except BaseException:
+        upload.close()
+        raise
+    return upload
+
+def expand_archive(archive_upload: SpooledUpload, max_files: int = DEFAULT_BATCH_MAX_FILES,
+                   max_bytes: int = DEFAULT_BATCH_MAX_EXPANDED_BYTES) -> List[BatchEntry]:
+    """
+    Turn a zip archive into batch entries, one per file.
+
+    Directories and hidden/macOS metadata files are skipped; unsupported,
+    oversized or unreadable members become failed entries. The file count is
+    checked against the central directory before anything is decompressed,
+    and decompression stops as soon as the members exceed max_bytes, so a zip
+    bomb is rejected without filling the disk.
+
+    Args:
+        archive_upload (SpooledUpload): The ingested archive.
+        max_files (int): Entries the batch still has room for.
+        max_bytes (int): Decompressed bytes the batch still has room for.
+
+    Returns:
+        List[BatchEntry]: Entries named "<archive>/<path in archive>".
+
+    Raises:
+        HTTPException: 400 if the archive holds more than max_files files,
+            413 if its members expand to more than max_bytes.
+    """
+    try:
+        archive = zipfile.ZipFile(archive_upload.open())
+    except zipfile.BadZipFile:
+        return [_failed(archive_upload.filename, "Not a valid zip archive")]
+    entries = []
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not (info.is_dir() or posixpath.basename(info.filename).startswith(".")
+                    or info.filename.startswith("__MACOSX/"))
+        ]
+        if len(members) > max_files:
+            raise _too_many_files(max_files)
+        remaining = max_bytes
+        try:
+            for info in members:
+                name = f"{archive_upload.filename}/{info.filename}"
+                if not _is_document(posixpath.basename(info.filename)):
+                    entries.append(_failed(name, "Only .txt and .pdf files are supported"))
+                    continue
+                # The per-file limit applies unless the batch budget is smaller
+                limit = min(MAX_UPLOAD_BYTES, remaining)
+                try:
+                    upload = _read_member(archive, info, name, limit)
+                except HTTPException as e:
+                    if limit < MAX_UPLOAD_BYTES:
+                        raise _too_large(max_bytes)
+                    entries.append(_failed(name, e.detail))
+                    continue
+                except MEMBER_READ_ERRORS as e:
+                    entries.append(_failed(name, f"Could not read file from archive: {str(e)}"))
+                    continue
+                remaining -= upload.size
+                entries.append(upload)
+        except BaseException:
+            close_entries(entries)
+            raise
+    return entries
+
+class BatchAnalyzer:
+    """
+    Analyzes many documents concurrently.
+
+    Up to BATCH_CONCURRENCY documents are in flight at once. Their text
+    extraction and classification run in a pool of BATCH_WORKERS processes,
+    so CPU-bound work scales with cores instead of queuing on the event loop,
+    while AI enhancement stays in this process, where every document shares
+    the AIAnalyzer's AI_MAX_CONCURRENCY request budget and enhancement cache.
+    """
+
+    def __init__(self, analysis: AnalysisService, workers: Optional[int] = None,
+                 max_concurrency: Optional[int] = None, max_files: Optional[int] = None):
+        self.analysis = analysis
+        self.workers = workers or int(os.getenv("BATCH_WORKERS", os.cpu_count() or 1))
+        # Twice the workers by default, so one document's AI calls overlap another's extraction
+        self.max_concurrency = max_concurrency or int(os.getenv("BATCH_CONCURRENCY", 2 * self.workers))
+        self.max_files = max_files or int(os.getenv("BATCH_MAX_FILES", DEFAULT_BATCH_MAX_FILES))
+        self.max_archive_bytes = int(os.getenv("BATCH_MAX_ARCHIVE_BYTES", DEFAULT_BATCH_MAX_ARCHIVE_BYTES))
+        self.max_expanded_bytes = int(os.getenv("BATCH_MAX_EXPANDED_BYTES", DEFAULT_BATCH_MAX_EXPANDED_BYTES))
+        self._executor = None
+
+    def shutdown(self):
+        """Stop the worker processes; called from the FastAPI lifespan on shutdown."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def ingest(self, files: List[UploadFile]) -> List[BatchEntry]:
+        """
+        Spool uploaded documents and expand zip archives.
+
+        Args:
+            files (List[UploadFile]): .txt/.pdf documents and/or .zip archives.
+
+        Returns:
+            List[BatchEntry]: One entry per document, in upload order; the caller closes the uploads.
+
+        Raises:
+            HTTPException: 400 if the batch holds more than max_files documents,
+                413 if its archives expand to more than max_expanded_bytes.
+        """
+        entries: List[BatchEntry] = []
+        expanded_bytes = 0
+        try:
+            for file in files:
+                filename = file.filename or "upload"
+                is_archive = filename.lower().endswith(ARCHIVE_EXTENSION)
+                if not is_archive and not _is_document(filename):
+                    entries.append(_failed(filename, "Only .txt, .pdf and .zip files are supported"))
+                    continue
+                try:
+                    upload = await ingest_upload(file, self.max_archive_bytes if is_archive else MAX_UPLOAD_BYTES)
+                except HTTPException as e:
+                    entries.append(_failed(filename, e.detail))
+                    continue
+                if is_archive:
+                    with upload:
+                        members = await asyncio.get_running_loop().run_in_executor(
+                            None, expand_archive, upload,
+                            self.max_files - len(entries), self.max_expanded_bytes - expanded_bytes
+                        )
+                    expanded_bytes += sum(entry.size for entry in members if isinstance(entry, SpooledUpload))
+                    entries.extend(members)
+                else:
+                    entries.append(upload)
+                if len(entries) > self.max_files:
+                    raise _too_many_files(self.max_files)
+        except BaseException:
+            close_entries(entries)
+            raise
+        return entries
+
+    async def analyze(self, entries: List[BatchEntry], client_id: Optional[str] = None) -> BatchAnalysisResponse:
+        """
+        Analyze ingested documents concurrently.
+
+        Args:
+            entries (List[BatchEntry]): Output of ingest(); failed entries are passed through.
+            client_id (Optional[str]): Client whose history the analyses are recorded in.
+
+        Returns:
+            BatchAnalysisResponse: Per-file results in input order and a combined summary.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        executor = self._get_executor()
+
+        async def analyze_entry(entry: BatchEntry) -> BatchFileResult:
+            if isinstance(entry, BatchFileResult):
+                return entry
+            async with semaphore:
+                try:
+                    result = await self.analysis.analyze(entry, executor=executor, client_id=client_id)
+                except Exception as e:
+                    detail = getattr(e, "detail", None) or str(e)
+                    logger.warning("Error processing file %s: %s", entry.filename, detail)
+                    return _failed(entry.filename, f"Error processing file: {detail}")
+            return BatchFileResult(filename=entry.filename, status=FILE_SUCCEEDED, result=result)
+
+        results = await asyncio.gather(*(analyze_entry(entry) for entry in entries))
+        return BatchAnalysisResponse(
+            summary=combine_summaries(results),
+            files=results,
+            timestamp=datetime.now().isoformat()
+        )
+
+    async def analyze_files(self, files: List[UploadFile], client_id: Optional[str] = None) -> BatchAnalysisResponse:
+        """Ingest and analyze uploaded files, releasing the spooled uploads afterwards."""
+        entries = await self.ingest(files)
+        try:
+            return await self.analyze(entries, client_id)
+        finally:
+            close_entries(entries)
+
+def close_entries(entries: List[BatchEntry]):
+    """Close the spooled uploads among batch entries."""
+    for entry in entries:
+        if isinstance(entry, SpooledUpload):
+            entry.close()
+
+def combine_summaries(results: List[BatchFileResult]) -> dict:
+    """Add up the summaries of the succeeded files and count files by status."""
+    combined = {"total": 0, "functional": 0, "nonFunctional": 0, "ambiguities": 0}
+    for file_result in results:
+        if file_result.result is not None:
+            for key, value in file_result.result.summary.model_dump().items():
+                combined[key] += value
+    succeeded = sum(1 for file_result in results if file_result.status == FILE_SUCCEEDED)
+    combined.update(files=len(results), succeeded=succeeded, failed=len(results) - succeeded)
+    return combined
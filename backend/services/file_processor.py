@@ -1,8 +1,16 @@
 import PyPDF2
+import asyncio
 import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from fastapi import UploadFile, HTTPException
-import re
-from typing import List
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple, Union
+from services.ingestion import SpooledUpload, ingest_upload
+from services.text_decoder import iter_decoded
+from services.text_normalizer import TextNormalizer, normalize_text
+from services.segmenter import iter_segments
+from services.metrics import Stopwatch, TEXT_EXTRACTION_SECONDS, SERVICE_READY, SERVICE_DEGRADED
 
 SUPPORTED_EXTENSIONS = ['.txt', '.pdf']
 REQUIREMENT_KEYWORDS = [
@@ -10,91 +18,191 @@ REQUIREMENT_KEYWORDS = [
     'system', 'user', 'shall be', 'must be', 'should be',
     'the system', 'the user', 'users can', 'system shall'
 ]
+# PDFs at least this large are parsed in a process pool (PDF_POOL_MIN_BYTES)
+DEFAULT_PDF_POOL_MIN_BYTES = 1024 * 1024
+# Smallest page range handed to one worker
+MIN_PAGES_PER_TASK = 8
+
+def _extract_pdf_pages(source: Union[str, bytes, BinaryIO], start: int, end: Optional[int] = None) -> List[str]:
+    """
+    Extract the text of pages [start, end); runs on a worker thread or in pool workers.
+
+    Args:
+        source: Path of a spooled upload, raw PDF bytes, or an open binary stream.
+        start (int): First page index.
+        end (Optional[int]): Page index to stop at; defaults to the last page.
+    """
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+    end = len(pdf_reader.pages) if end is None else end
+    return [pdf_reader.pages[index].extract_text() or "" for index in range(start, end)]
+
+def _count_or_extract_pdf_pages(source: BinaryIO, max_pages: int) -> Tuple[int, Optional[List[str]]]:
+    """
+    Count the pages of a PDF on a worker thread, extracting them in the same parse when there are few.
+
+    Returns:
+        Tuple[int, Optional[List[str]]]: The page count, and the page texts when
+        it is at most max_pages (None otherwise).
+    """
+    pdf_reader = PyPDF2.PdfReader(source)
+    page_count = len(pdf_reader.pages)
+    if page_count > max_pages:
+        return page_count, None
+    return page_count, [page.extract_text() or "" for page in pdf_reader.pages]
 
 class FileProcessor:
     """Service for processing uploaded files and extracting text content"""
     
-    def __init__(self):
+    def __init__(self, pdf_workers: Optional[int] = None, pdf_pool_min_bytes: Optional[int] = None):
         self.supported_extensions = SUPPORTED_EXTENSIONS
+        self.pdf_workers = pdf_workers or int(os.getenv("PDF_POOL_WORKERS", os.cpu_count() or 1))
+        self.pdf_pool_min_bytes = pdf_pool_min_bytes or int(
+            os.getenv("PDF_POOL_MIN_BYTES", DEFAULT_PDF_POOL_MIN_BYTES)
+        )
+        self._pdf_executor = None
+
+    def shutdown(self):
+        """Stop the PDF worker processes; called from the FastAPI lifespan on shutdown."""
+        if self._pdf_executor is not None:
+            self._pdf_executor.shutdown(cancel_futures=True)
+            self._pdf_executor = None
+
+    def health(self) -> Dict[str, Any]:
+        """Status of the PDF worker pool, which is degraded once a worker process has died."""
+        if self._pdf_executor is None:
+            pool = "idle"
+        elif getattr(self._pdf_executor, "_broken", False):
+            pool = "broken"
+        else:
+            pool = "running"
+        return {"status": SERVICE_DEGRADED if pool == "broken" else SERVICE_READY, "pdf_pool": pool}
     
-    async def extract_text(self, file: UploadFile) -> str:
+    async def extract_text(self, file: Union[UploadFile, SpooledUpload]) -> str:
         """
         Extract text content from uploaded file
         Supports .txt and .pdf files
+
+        Accepts an already ingested SpooledUpload, or an UploadFile which is
+        streamed through ingest_upload first.
         """
+        if isinstance(file, UploadFile):
+            with await ingest_upload(file) as upload:
+                return await self.extract_text(upload)
         try:
-            if file.filename.lower().endswith('.txt'):
-                return await self._extract_text_from_txt(file)
-            elif file.filename.lower().endswith('.pdf'):
-                return await self._extract_text_from_pdf(file)
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unsupported file type. Supported types: {', '.join(self.supported_extensions)}"
-                )
+            return "".join([chunk async for chunk in self.iter_text(file)])
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Error extracting text from file: {str(e)}"
             )
     
-    async def _extract_text_from_txt(self, file: UploadFile) -> str:
-        """Extract text from .txt file"""
-        try:
-            content = await file.read()
-            text = content.decode('utf-8')
-            return self._clean_text(text)
-        except UnicodeDecodeError:
-            # Try with different encoding
-            try:
-                content = await file.read()
-                text = content.decode('latin-1')
-                return self._clean_text(text)
-            except Exception as e:
-                raise Exception(f"Could not decode text file: {str(e)}")
+    async def iter_text(self, upload: SpooledUpload) -> AsyncIterator[str]:
+        """
+        Yield cleaned text of an ingested upload in chunks
+
+        TXT files are decoded and cleaned incrementally, so the output can feed
+        MLPipeline.stream_requirements directly; PDFs yield their full text.
+        Joining the chunks gives the same text as extract_text. Extraction time
+        is recorded per document.
+        """
+        if upload.filename.lower().endswith('.txt'):
+            async for chunk in self._iter_text_from_txt(upload):
+                yield chunk
+        elif upload.filename.lower().endswith('.pdf'):
+            started = time.perf_counter()
+            text = await self._extract_text_from_pdf(upload)
+            TEXT_EXTRACTION_SECONDS.labels("pdf").observe(time.perf_counter() - started)
+            yield text
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file type. Supported types: {', '.join(self.supported_extensions)}"
+            )
     
-    async def _extract_text_from_pdf(self, file: UploadFile) -> str:
-        """Extract text from .pdf file"""
+    async def _iter_text_from_txt(self, upload: SpooledUpload) -> AsyncIterator[str]:
+        """
+        Decode and clean a .txt file chunk by chunk
+
+        The encoding is detected once from the start of the file (BOM, UTF-16,
+        UTF-8 validity, else latin-1), so the file is read a single time with
+        bounded memory. Only decoding and cleaning are timed, not the
+        consumer's work between chunks or other requests run in between.
+        """
+        normalizer = TextNormalizer()
+        stopwatch = Stopwatch()
+        stopwatch.start()
+        for decoded in iter_decoded(upload.open()):
+            cleaned = normalizer.feed(decoded)
+            stopwatch.stop()
+            if cleaned:
+                yield cleaned
+            # Let other requests run between chunks of large files
+            await asyncio.sleep(0)
+            stopwatch.start()
+        cleaned = normalizer.flush()
+        stopwatch.stop()
+        TEXT_EXTRACTION_SECONDS.labels("txt").observe(stopwatch.elapsed)
+        if cleaned:
+            yield cleaned
+    
+    async def _extract_text_from_pdf(self, upload: SpooledUpload) -> str:
+        """
+        Extract text from .pdf file
+
+        Small PDFs are parsed once on a worker thread in this process. Large ones
+        are counted on a worker thread and, when they have enough pages, split
+        into page ranges parsed in parallel by a process pool; pages are
+        reassembled in order. No parsing runs on the event loop. Workers open
+        spooled uploads by path instead of receiving a copy of the bytes.
+        """
         try:
-            content = await file.read()
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-            
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+            loop = asyncio.get_running_loop()
+            pages = None
+            if upload.size < self.pdf_pool_min_bytes:
+                pages = await loop.run_in_executor(None, _extract_pdf_pages, upload.open(), 0)
+            else:
+                page_count, pages = await loop.run_in_executor(
+                    None, _count_or_extract_pdf_pages, upload.open(), 2 * MIN_PAGES_PER_TASK - 1
+                )
+            if pages is None:
+                executor = self._get_pdf_executor()
+                # In-memory uploads are pickled to each worker; spilled ones are opened by path
+                source = upload.path or upload.open().read()
+                tasks = min(self.pdf_workers, page_count // MIN_PAGES_PER_TASK)
+                bounds = [page_count * i // tasks for i in range(tasks + 1)]
+                ranges = await asyncio.gather(*(
+                    loop.run_in_executor(executor, _extract_pdf_pages, source, start, end)
+                    for start, end in zip(bounds, bounds[1:])
+                ))
+                pages = [page for page_range in ranges for page in page_range]
             
+            text = "".join(page_text + "\n" for page_text in pages if page_text)
             return self._clean_text(text)
         except Exception as e:
             raise Exception(f"Could not extract text from PDF: {str(e)}")
     
+    def _get_pdf_executor(self) -> ProcessPoolExecutor:
+        """Return the PDF process pool, starting it on first use."""
+        if self._pdf_executor is None:
+            self._pdf_executor = ProcessPoolExecutor(max_workers=self.pdf_workers)
+        return self._pdf_executor
+    
     def _clean_text(self, text: str) -> str:
         """
         Clean and preprocess extracted text
+
+        Removes special characters and collapses whitespace in a single pass,
+        keeping line and paragraph breaks (see services.text_normalizer).
         """
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters that might interfere with processing
-        text = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)]', '', text)
-        
-        # Normalize line breaks
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Remove empty lines
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        text = '\n'.join(lines)
-        
-        return text.strip()
+        return normalize_text(text)
     
     def extract_sentences(self, text: str) -> List[str]:
         """
         Split text into sentences for requirement extraction
         """
-        # Simple sentence splitting (can be improved with NLP libraries)
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+        # Shared segmenter: skips abbreviations, decimals and list markers
+        sentences = [" ".join(text[start:end].split()) for start, end in iter_segments(text)]
+        sentences = [s for s in sentences if len(s) > 10]
         return sentences
     
     def is_requirement_like(self, sentence: str) -> bool:
@@ -0,0 +1,236 @@
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from models.schemas import AnalysisResponse
+from services.metrics import SERVICE_READY, SERVICE_UNAVAILABLE
+
+# Next to the code rather than in the working directory (HISTORY_DB)
+DEFAULT_HISTORY_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "history.db")
+# Analyses older than this are deleted as new ones are recorded; 0 keeps them forever (HISTORY_RETENTION_DAYS)
+DEFAULT_HISTORY_RETENTION_DAYS = 90
+DEFAULT_PAGE_SIZE = 20
+# Longest X-Client-Id accepted
+CLIENT_ID_MAX_LENGTH = 128
+MAX_PAGE_SIZE = 100
+# zlib level for stored result JSON (results are written once, read rarely)
+RESULT_COMPRESSION_LEVEL = 6
+
+SUMMARY_COLUMNS = "id, filename, content_hash, timestamp, total, functional, non_functional, ambiguities"
+
+class HistoryStore:
+    """
+    Analysis history on SQLite.
+
+    Every analysis belongs to the client that made it (the X-Client-Id a
+    browser sends; the API records nothing for clients that send none), and
+    listing, loading and deleting only see the caller's analyses. Listings
+    read only the narrow `analyses` table, whose indexes on client and
+    timestamp, filename or content hash (each ending in the implicit rowid)
+    serve the filters and the newest-first order without sorting. Full
+    results live zlib-compressed in `analysis_results` and are loaded by ID.
+    Pages use keyset pagination: the cursor is the ID of the last item seen,
+    so deep pages cost the same as the first one. The database is opened on
+    first use, so importing the app creates no file.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_DB, retention_days: Optional[float] = None):
+        self.path = path
+        self.retention_days = retention_days if retention_days is not None else float(
+            os.getenv("HISTORY_RETENTION_DAYS", DEFAULT_HISTORY_RETENTION_DAYS)
+        )
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open and migrate the database on first use; callers hold the lock."""
+        if self._conn is not None:
+            return self._conn
+        if self.path != ":memory:" and os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT NOT NULL, content_hash TEXT NOT NULL, "
+            "timestamp TEXT NOT NULL, total INTEGER NOT NULL, functional INTEGER NOT NULL, "
+            "non_functional INTEGER NOT NULL, ambiguities INTEGER NOT NULL, client_id TEXT, result_key TEXT);"
+            "CREATE TABLE IF NOT EXISTS analysis_results ("
+            "id INTEGER PRIMARY KEY REFERENCES analyses(id) ON DELETE CASCADE, result BLOB NOT NULL);"
+        )
+        # Databases written before analyses were scoped to clients
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(analyses)")}
+        for column in ("client_id", "result_key"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE analyses ADD COLUMN {column} TEXT")
+        self._conn.executescript(
+            "DROP INDEX IF EXISTS idx_analyses_filename;"
+            "DROP INDEX IF EXISTS idx_analyses_content_hash;"
+            "CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses (timestamp);"
+            "CREATE INDEX IF NOT EXISTS idx_analyses_client ON analyses (client_id, timestamp);"
+            "CREATE INDEX IF NOT EXISTS idx_analyses_client_filename ON analyses (client_id, filename, timestamp);"
+            "CREATE INDEX IF NOT EXISTS idx_analyses_client_hash ON analyses (client_id, content_hash, timestamp);"
+            "CREATE INDEX IF NOT EXISTS idx_analyses_client_result_key ON analyses (client_id, result_key);"
+        )
+        self._conn.commit()
+        return self._conn
+
+    def record(self, result: AnalysisResponse, content_hash: str, client_id: Optional[str] = None,
+               result_key: Optional[str] = None) -> int:
+        """
+        Store an analysis, deleting analyses older than the retention period.
+
+        Args:
+            result (AnalysisResponse): The analysis results.
+            content_hash (str): SHA-256 of the uploaded bytes.
+            client_id (Optional[str]): Client the analysis belongs to.
+            result_key (Optional[str]): Result cache key it was stored under, for find().
+
+        Returns:
+            int: The history ID.
+        """
+        payload = zlib.compress(result.model_dump_json().encode("utf-8"), RESULT_COMPRESSION_LEVEL)
+        summary = result.summary
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                "INSERT INTO analyses (filename, content_hash, timestamp, total, functional, non_functional, "
+                "ambiguities, client_id, result_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result.filename, content_hash, result.timestamp, summary.total, summary.functional,
+                 summary.nonFunctional, summary.ambiguities, client_id, result_key)
+            )
+            conn.execute("INSERT INTO analysis_results (id, result) VALUES (?, ?)", (cursor.lastrowid, payload))
+            if self.retention_days:
+                cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+                conn.execute("DELETE FROM analyses WHERE timestamp < ?", (cutoff,))
+            conn.commit()
+        return cursor.lastrowid
+
+    def find(self, result_key: str, filename: str, client_id: Optional[str] = None) -> Optional[int]:
+        """ID of the client's latest analysis of a file stored under a result cache key, or None."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT id FROM analyses WHERE client_id IS ? AND result_key = ? AND filename = ? "
+                "ORDER BY id DESC LIMIT 1",
+                (client_id, result_key, filename)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def list_summaries(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[int] = None,
+                       filename: Optional[str] = None, content_hash: Optional[str] = None,
+                       since: Optional[str] = None, until: Optional[str] = None,
+                       client_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        List a client's analysis summaries, newest first.
+
+        Args:
+            limit (int): Page size, capped at MAX_PAGE_SIZE.
+            cursor (Optional[int]): next_cursor of the previous page.
+            filename (Optional[str]): Only analyses of this exact filename.
+            content_hash (Optional[str]): Only analyses of this content.
+            since (Optional[str]): Only analyses at or after this ISO timestamp.
+            until (Optional[str]): Only analyses before this ISO timestamp.
+            client_id (Optional[str]): Client whose analyses are listed.
+
+        Returns:
+            Dict[str, Any]: "items" (summaries) and "next_cursor" (None on the last page).
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        conditions = ["client_id IS ?"]
+        params: List[Any] = [client_id]
+        for column, value in [("filename", filename), ("content_hash", content_hash)]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(until)
+        if cursor is not None:
+            conditions.append("(timestamp, id) < (SELECT timestamp, id FROM analyses WHERE id = ?)")
+            params.append(cursor)
+        where = f"WHERE {' AND '.join(conditions)} "
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM analyses {where}ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (*params, limit + 1)
+            ).fetchall()
+        items = [self._summary(row) for row in rows[:limit]]
+        return {"items": items, "next_cursor": items[-1]["id"] if len(rows) > limit else None}
+
+    def get(self, history_id: int, client_id: Optional[str] = None) -> Optional[AnalysisResponse]:
+        """Load the full results of one of a client's analyses, or None if unknown."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT result FROM analysis_results WHERE id = ? "
+                "AND id IN (SELECT id FROM analyses WHERE id = ? AND client_id IS ?)",
+                (history_id, history_id, client_id)
+            ).fetchone()
+        if row is None:
+            return None
+        result = AnalysisResponse.model_validate_json(zlib.decompress(row[0]))
+        return result.model_copy(update={"history_id": history_id})
+
+    def delete(self, history_id: int, client_id: Optional[str] = None) -> bool:
+        """Delete one of a client's analyses; returns whether it existed."""
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute(
+                "DELETE FROM analyses WHERE id = ? AND client_id IS ?", (history_id, client_id)
+            ).rowcount
+            conn.commit()
+        return deleted > 0
+
+    def clear(self, client_id: str) -> int:
+        """
+        Delete every analysis of one client.
+
+        Returns:
+            int: Number of analyses deleted.
+        """
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute("DELETE FROM analyses WHERE client_id = ?", (client_id,)).rowcount
+            conn.commit()
+        return deleted
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def health(self) -> Dict[str, Any]:
+        """Whether the database answers queries."""
+        try:
+            with self._lock:
+                self._connection().execute("SELECT 1 FROM analyses LIMIT 1").fetchall()
+        except (sqlite3.Error, OSError) as e:
+            return {"status": SERVICE_UNAVAILABLE, "error": str(e)}
+        return {"status": SERVICE_READY}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._connection().execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        return {"size": size, "path": self.path}
+
+    @staticmethod
+    def _summary(row: tuple) -> Dict[str, Any]:
+        history_id, filename, content_hash, timestamp, total, functional, non_functional, ambiguities = row
+        return {
+            "id": history_id,
+            "filename": filename,
+            "content_hash": content_hash,
+            "timestamp": timestamp,
+            "summary": {
+                "total": total,
+                "functional": functional,
+                "nonFunctional": non_functional,
+                "ambiguities": ambiguities
+            }
+        }
@@ -0,0 +1,121 @@
+import hashlib
+import io
+import os
+import tempfile
+import time
+from typing import BinaryIO, Optional
+from fastapi import UploadFile, HTTPException
+from services.metrics import UPLOAD_READ_SECONDS
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+# Uploads larger than this are spilled from memory to a temporary file (UPLOAD_SPOOL_BYTES)
+DEFAULT_SPOOL_BYTES = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+class SpooledUpload:
+    """
+    An uploaded file streamed into a seekable buffer.
+
+    Small bodies stay in memory; once the body grows past spool_bytes it is
+    moved to a named temporary file, which pool workers open by path instead
+    of receiving a pickled copy of the content. The size and SHA-256 of the
+    content are computed while streaming.
+    """
+
+    def __init__(self, filename: str, spool_bytes: int = DEFAULT_SPOOL_BYTES):
+        self.filename = filename
+        self.size = 0
+        self.spool_bytes = spool_bytes
+        self._hasher = hashlib.sha256()
+        self._file = io.BytesIO()
+        self.on_disk = False
+
+    @classmethod
+    def from_path(cls, filename: str, path: str) -> "SpooledUpload":
+        """
+        Wrap an existing file, such as another process's spilled upload, without copying it.
+
+        The file is only read; closing the upload does not delete it. The
+        SHA-256 is not computed.
+        """
+        upload = cls(filename)
+        upload._file = open(path, "rb")
+        upload.size = os.path.getsize(path)
+        upload.on_disk = True
+        return upload
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 of the content written so far."""
+        return self._hasher.hexdigest()
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the temporary file, or None while the content is in memory."""
+        return self._file.name if self.on_disk else None
+
+    def write(self, chunk: bytes):
+        """Append a chunk, spilling to disk once spool_bytes is exceeded."""
+        if not self.on_disk and self.size + len(chunk) > self.spool_bytes:
+            spilled = tempfile.NamedTemporaryFile(prefix="clearreq-upload-", delete=True)
+            spilled.write(self._file.getvalue())
+            self._file = spilled
+            self.on_disk = True
+        self._file.write(chunk)
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+
+    def open(self) -> BinaryIO:
+        """Return the underlying file object, rewound to the start."""
+        self._file.flush()
+        self._file.seek(0)
+        return self._file
+
+    def close(self):
+        """Release the buffer (deleting any temporary file)."""
+        self._file.close()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+async def ingest_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES,
+                        spool_bytes: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> SpooledUpload:
+    """
+    Stream an upload into a SpooledUpload, enforcing the size limit as it arrives.
+
+    Args:
+        file (UploadFile): Incoming upload; its declared size may be None for chunked bodies.
+        max_bytes (int): Maximum accepted size in bytes.
+        spool_bytes (Optional[int]): In-memory threshold before spilling to disk.
+        chunk_size (int): Read size per chunk.
+
+    Returns:
+        SpooledUpload: The buffered upload; the caller must close it.
+    """
+    limit_error = HTTPException(
+        status_code=400,
+        detail=f"File size must be less than {max_bytes // (1024 * 1024)}MB"
+    )
+    if file.size is not None and file.size > max_bytes:
+        raise limit_error
+    started = time.perf_counter()
+    upload = SpooledUpload(
+        file.filename,
+        spool_bytes or int(os.getenv("UPLOAD_SPOOL_BYTES", DEFAULT_SPOOL_BYTES))
+    )
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            if upload.size + len(chunk) > max_bytes:
+                raise limit_error
+            upload.write(chunk)
+    except BaseException:
+        upload.close()
+        raise
+    UPLOAD_READ_SECONDS.observe(time.perf_counter() - started)
+    return upload
@@ -0,0 +1,236 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from services.analysis import AnalysisService
+from services.ingestion import SpooledUpload
+from services.metrics import SERVICE_READY, SERVICE_DEGRADED, SERVICE_UNAVAILABLE
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_QUEUE_DEPTH = 100
+# Finished jobs, with their results, are kept this long after they end (JOB_RETENTION)
+DEFAULT_JOB_RETENTION_SECONDS = 3600
+# Job records live in memory unless JOB_DB points at a file
+IN_MEMORY_DB = ":memory:"
+
+class JobStore:
+    """SQLite table of job status, progress and results."""
+
+    def __init__(self, path: str = IN_MEMORY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, filename TEXT NOT NULL, status TEXT NOT NULL, "
+            "stage TEXT, progress REAL NOT NULL DEFAULT 0, error TEXT, result TEXT, "
+            "created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)")
+        # Uploads of unfinished jobs do not survive a restart
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, error = ? WHERE status IN (?, ?)",
+            (JOB_FAILED, "Interrupted by a server restart", JOB_QUEUED, JOB_RUNNING)
+        )
+        self._conn.commit()
+
+    def create(self, job_id: str, filename: str):
+        """Insert a queued job."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, filename, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, filename, JOB_QUEUED, now, now)
+            )
+            self._conn.commit()
+
+    def update(self, job_id: str, **fields: Any):
+        """Set columns of a job and bump its updated_at."""
+        fields["updated_at"] = datetime.now().isoformat()
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job with its parsed result, or None if unknown.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, filename, status, stage, progress, error, result, created_at, updated_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, filename, status, stage, progress, error, result, created_at, updated_at = row
+        return {
+            "job_id": job_id,
+            "filename": filename,
+            "status": status,
+            "stage": stage,
+            "progress": progress,
+            "error": error,
+            "result": json.loads(result) if result else None,
+            "created_at": created_at,
+            "updated_at": updated_at
+        }
+
+    def purge(self, retention_seconds: float) -> int:
+        """
+        Delete finished jobs that ended more than retention_seconds ago.
+
+        Returns:
+            int: Number of jobs deleted.
+        """
+        cutoff = (datetime.now() - timedelta(seconds=retention_seconds)).isoformat()
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM jobs WHERE updated_at < ? AND status IN (?, ?)", (cutoff, JOB_SUCCEEDED, JOB_FAILED)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class JobQueue:
+    """
+    In-process background queue running analyses on a pool of asyncio workers.
+
+    Uploads wait in a bounded asyncio.Queue (JOB_QUEUE_DEPTH); JOB_WORKERS
+    workers run them through the AnalysisService, with text extraction and
+    classification in a pool of as many processes so CPU-bound work stays off
+    the event loop. Status, progress and results are kept in a JobStore
+    (JOB_DB, in memory by default), so no external services are needed;
+    finished jobs are purged JOB_RETENTION seconds after they end.
+    """
+
+    def __init__(self, analysis: AnalysisService, workers: Optional[int] = None,
+                 max_depth: Optional[int] = None, store: Optional[JobStore] = None,
+                 retention_seconds: Optional[float] = None):
+        self.analysis = analysis
+        self.workers = workers or int(os.getenv("JOB_WORKERS", DEFAULT_JOB_WORKERS))
+        self.max_depth = max_depth or int(os.getenv("JOB_QUEUE_DEPTH", DEFAULT_JOB_QUEUE_DEPTH))
+        self.store = store or JobStore(os.getenv("JOB_DB", IN_MEMORY_DB))
+        self.retention_seconds = retention_seconds or float(
+            os.getenv("JOB_RETENTION", DEFAULT_JOB_RETENTION_SECONDS)
+        )
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._tasks: List[asyncio.Task] = []
+        self._executor = None
+        self.running = 0
+
+    def start(self):
+        """Start the workers; called from the FastAPI lifespan."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers, stop their worker processes and release uploads that were still waiting."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        while not self._queue.empty():
+            job_id, upload, _ = self._queue.get_nowait()
+            upload.close()
+            self.store.update(job_id, status=JOB_FAILED, error="Server shut down before the job ran")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the extraction process pool, starting it on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def submit(self, upload: SpooledUpload, client_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue an ingested upload for analysis.
+
+        Args:
+            upload (SpooledUpload): The buffered upload; the queue closes it when done.
+            client_id (Optional[str]): Client whose history the analysis is recorded in.
+
+        Returns:
+            Dict[str, Any]: The queued job.
+
+        Raises:
+            HTTPException: 503 if the queue is full.
+        """
+        if self._queue.full():
+            raise HTTPException(status_code=503, detail="Job queue is full, please retry later")
+        # Expired results go as new jobs come in, so the store stays bounded
+        self.store.purge(self.retention_seconds)
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, upload.filename)
+        self._queue.put_nowait((job_id, upload, client_id))
+        return self.store.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job by ID."""
+        return self.store.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and worker usage."""
+        return {
+            "queued": self._queue.qsize(),
+            "running": self.running,
+            "workers": self.workers,
+            "max_depth": self.max_depth
+        }
+
+    def health(self) -> Dict[str, Any]:
+        """Live workers; degraded if some have died, unavailable if none are running."""
+        alive = sum(1 for task in self._tasks if not task.done())
+        if alive == self.workers:
+            status = SERVICE_READY
+        else:
+            status = SERVICE_DEGRADED if alive else SERVICE_UNAVAILABLE
+        return {"status": status, "workers_alive": alive, "queued": self._queue.qsize()}
+
+    async def _worker(self):
+        """Run queued jobs one at a time until cancelled."""
+        while True:
+            job_id, upload, client_id = await self._queue.get()
+            self.running += 1
+            try:
+                with upload:
+                    self.store.update(job_id, status=JOB_RUNNING)
+                    result = await self.analysis.analyze(
+                        upload,
+                        progress=lambda stage, fraction: self.store.update(job_id, stage=stage, progress=fraction),
+                        executor=self._get_executor(),
+                        client_id=client_id
+                    )
+                self.store.update(job_id, status=JOB_SUCCEEDED, result=result.model_dump_json())
+            except asyncio.CancelledError:
+                self.store.update(job_id, status=JOB_FAILED, error="Server shut down while the job was running")
+                raise
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                logger.warning("Error processing job %s: %s", job_id, detail)
+                self.store.update(job_id, status=JOB_FAILED, error=f"Error processing file: {detail}")
+            finally:
+                self.running -= 1
+                self._queue.task_done()
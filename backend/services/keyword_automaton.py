@@ -0,0 +1,131 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple
+from services.keywords import FUNCTIONAL_KEYWORDS, NON_FUNCTIONAL_KEYWORDS, AMBIGUOUS_KEYWORDS, AMBIGUOUS_TERMS
+
+# Categories of the shared automaton, one per keyword table
+FUNCTIONAL = 'functional'
+NON_FUNCTIONAL = 'non_functional'
+AMBIGUOUS = 'ambiguous'
+AMBIGUOUS_TERM = 'ambiguous_term'
+
+SCAN_CACHE_SIZE = 4096
+
+class KeywordHit(NamedTuple):
+    """A single keyword occurrence found in a scanned text."""
+    category: str
+    keyword: str
+    start: int
+
+class KeywordHits:
+    """Result of one automaton scan, queried by category."""
+
+    def __init__(self, hits: List[KeywordHit], order: Dict[str, Dict[str, int]]):
+        self.hits = hits
+        self._order = order
+
+    def matched(self, category: str) -> List[str]:
+        """
+        Distinct keywords of a category found in the text.
+
+        Args:
+            category (str): Keyword table name.
+
+        Returns:
+            List[str]: Matched keywords in the order of their source table.
+        """
+        found = {hit.keyword for hit in self.hits if hit.category == category}
+        return sorted(found, key=self._order[category].__getitem__)
+
+    def count(self, category: str) -> int:
+        """Number of distinct keywords of a category found in the text."""
+        return len({hit.keyword for hit in self.hits if hit.category == category})
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over several keyword tables.
+
+    Every table is compiled into one deterministic transition table, so a text
+    is scanned once, character by character, and all (overlapping) substring
+    occurrences of every keyword are reported, tagged by category and position.
+    This matches the semantics of ``keyword in text`` for each keyword.
+    """
+
+    def __init__(self, tables: Dict[str, Iterable[str]], cache_size: int = SCAN_CACHE_SIZE):
+        self._order = {}
+        goto = [{}]
+        outputs = [[]]
+        for category, keywords in tables.items():
+            self._order[category] = {}
+            for keyword in keywords:
+                if keyword in self._order[category]:
+                    continue
+                self._order[category][keyword] = len(self._order[category])
+                state = 0
+                for char in keyword:
+                    next_state = goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto.append({})
+                        outputs.append([])
+                        goto[state][char] = next_state
+                    state = next_state
+                outputs[state].append((category, keyword, len(keyword) - 1))
+        self._transitions, self._outputs = self._build(goto, outputs)
+        # Classifier, ambiguity scorer and term detector all scan the same
+        # sentence; caching the result means it is only walked once.
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    @staticmethod
+    def _build(goto: List[Dict[str, int]], outputs: List[list]):
+        """Compute failure links and fold them into a full transition table."""
+        fail = [0] * len(goto)
+        transitions = [None] * len(goto)
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                if state:
+                    fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+                queue.append(next_state)
+            # States are visited breadth-first, so the failure state's
+            # transitions are already complete here.
+            if state:
+                transitions[state] = {**transitions[fail[state]], **goto[state]}
+        return transitions, [tuple(output) for output in outputs]
+
+    def _scan(self, text: str) -> KeywordHits:
+        """
+        Scan text once and collect every keyword occurrence.
+
+        Args:
+            text (str): Text to scan; callers pass lower-cased text.
+
+        Returns:
+            KeywordHits: All hits tagged by category and start offset.
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        hits = []
+        for position, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                for category, keyword, offset in outputs[state]:
+                    hits.append(KeywordHit(category, keyword, position - offset))
+        return KeywordHits(hits, self._order)
+
+@lru_cache(maxsize=None)
+def get_keyword_automaton() -> KeywordAutomaton:
+    """Build (once) the automaton shared by MLPipeline and AIAnalyzer."""
+    return KeywordAutomaton({
+        FUNCTIONAL: FUNCTIONAL_KEYWORDS,
+        NON_FUNCTIONAL: NON_FUNCTIONAL_KEYWORDS,
+        AMBIGUOUS: AMBIGUOUS_KEYWORDS,
+        AMBIGUOUS_TERM: [term.lower() for term in AMBIGUOUS_TERMS],
+    })
@@ -0,0 +1,45 @@
+# Keyword tables shared by MLPipeline, AIAnalyzer and the keyword automaton
+
+# Requirement classification
+FUNCTIONAL_KEYWORDS = [
+    'shall', 'should', 'must', 'will', 'can', 'may',
+    'system shall', 'user shall', 'users can', 'system must',
+    'the system', 'the user', 'users will', 'system will'
+]
+NON_FUNCTIONAL_KEYWORDS = [
+    'performance', 'speed', 'fast', 'slow', 'response time',
+    'availability', 'uptime', 'reliability', 'security',
+    'scalability', 'maintainability', 'usability', 'accessibility',
+    'compatibility', 'portability', 'efficiency', 'throughput',
+    'latency', 'bandwidth', 'capacity', 'load', 'stress',
+    'concurrent', 'simultaneous', 'real-time', 'near real-time'
+]
+AMBIGUOUS_KEYWORDS = [
+    'intuitive', 'user-friendly', 'easy to use', 'simple',
+    'fast', 'quick', 'efficient', 'good', 'better', 'best',
+    'appropriate', 'suitable', 'adequate', 'reasonable',
+    'secure', 'safe', 'reliable', 'stable', 'robust'
+]
+# Ambiguous terms and how to make them measurable
+AMBIGUOUS_TERMS = {
+    'fast': 'Define specific response time (e.g., "under 2 seconds")',
+    'quick': 'Specify time constraints (e.g., "within 30 seconds")',
+    'efficient': 'Define efficiency metrics (e.g., "using less than 100MB RAM")',
+    'user-friendly': 'Define usability criteria (e.g., "completable in under 3 clicks")',
+    'intuitive': 'Specify user experience requirements (e.g., "follows standard UI patterns")',
+    'secure': 'Define security standards (e.g., "AES-256 encryption, HTTPS only")',
+    'reliable': 'Specify reliability metrics (e.g., "99.9% uptime")',
+    'scalable': 'Define scalability requirements (e.g., "support 10,000 concurrent users")',
+    'maintainable': 'Specify maintainability criteria (e.g., "modular architecture")',
+    'compatible': 'Define compatibility requirements (e.g., "works with Chrome 90+")',
+    'portable': 'Specify portability requirements (e.g., "runs on Windows, Mac, Linux")',
+    'robust': 'Define robustness criteria (e.g., "handles network failures gracefully")',
+    'stable': 'Specify stability requirements (e.g., "no crashes during normal operation")',
+    'good': 'Replace with specific, measurable criteria',
+    'better': 'Define improvement metrics',
+    'best': 'Specify optimal performance criteria',
+    'appropriate': 'Define what constitutes appropriateness',
+    'suitable': 'Specify suitability criteria',
+    'adequate': 'Define adequacy standards',
+    'reasonable': 'Specify reasonableness criteria'
+}
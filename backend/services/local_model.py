@@ -0,0 +1,300 @@
+import logging
+import re
+import zlib
+import numpy as np
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 2**FEATURE_BITS hashed feature columns
+DEFAULT_FEATURE_BITS = 18
+TOKEN_PATTERN = re.compile(r'\w+')
+MODEL_FORMAT_VERSION = 1
+# Heads of the model and their classes
+REQUIREMENT_CLASSES = ["Other", "Requirement"]
+TYPE_CLASSES = ["Functional", "Non-Functional", "Ambiguous"]
+AMBIGUITY_CLASSES = ["Low", "Medium", "High"]
+# Training defaults: full-batch gradient descent on the softmax loss
+DEFAULT_EPOCHS = 200
+DEFAULT_LEARNING_RATE = 2.0
+DEFAULT_L2 = 1e-4
+
+class SparseRows(NamedTuple):
+    """Feature rows in coordinate form: row i has values[k] at column indices[k] where row_ids[k] == i."""
+    row_ids: np.ndarray
+    indices: np.ndarray
+    values: np.ndarray
+    n_rows: int
+
+def hash_features(text: str, feature_bits: int = DEFAULT_FEATURE_BITS) -> List[int]:
+    """
+    Hash the n-gram features of a sentence into column indices.
+
+    Features are lower-cased word unigrams and bigrams plus character
+    trigrams of each word (with boundary markers, so "user-friendly" and
+    "friendliness" share evidence). CRC32 keeps the hashes stable across
+    processes, unlike hash().
+
+    Args:
+        text (str): Sentence text.
+        feature_bits (int): Number of hash bits.
+
+    Returns:
+        List[int]: Column index of every feature occurrence (with repeats).
+    """
+    mask = (1 << feature_bits) - 1
+    words = TOKEN_PATTERN.findall(text.lower())
+    features = [f"w:{word}" for word in words]
+    features += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+    for word in words:
+        marked = f"<{word}>"
+        features += [f"c:{marked[i:i + 3]}" for i in range(len(marked) - 2)]
+    return [zlib.crc32(feature.encode("utf-8")) & mask for feature in features]
+
+class LinearHead:
+    """Multinomial logistic regression over sparse rows."""
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, classes: Sequence[str]):
+        self.weights = weights
+        self.bias = bias
+        self.classes = list(classes)
+
+    def decision_function(self, rows: SparseRows) -> np.ndarray:
+        """Class scores, shape (n_rows, n_classes)."""
+        scores = np.tile(self.bias, (rows.n_rows, 1))
+        for column in range(len(self.classes)):
+            scores[:, column] += np.bincount(
+                rows.row_ids, weights=self.weights[rows.indices, column] * rows.values,
+                minlength=rows.n_rows
+            )
+        return scores
+
+    def predict_proba(self, rows: SparseRows) -> np.ndarray:
+        """Class probabilities, shape (n_rows, n_classes)."""
+        scores = self.decision_function(rows)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    @classmethod
+    def fit(cls, rows: SparseRows, labels: np.ndarray, classes: Sequence[str], n_features: int,
+            epochs: int = DEFAULT_EPOCHS, learning_rate: float = DEFAULT_LEARNING_RATE,
+            l2: float = DEFAULT_L2) -> "LinearHead":
+        """
+        Train a head with full-batch gradient descent.
+
+        Args:
+            rows (SparseRows): Training features.
+            labels (np.ndarray): Class index per row.
+            classes (Sequence[str]): Class names.
+            n_features (int): Number of feature columns.
+            epochs (int): Gradient steps.
+            learning_rate (float): Step size.
+            l2 (float): L2 regularization strength.
+
+        Returns:
+            LinearHead: The trained head.
+
+        Raises:
+            ValueError: If there are no rows or the labels hold fewer than two classes.
+        """
+        present = np.unique(labels)
+        if rows.n_rows == 0:
+            raise ValueError(f"No training examples for the {'/'.join(classes)} head")
+        if len(present) < 2:
+            raise ValueError(f"Training examples for the {'/'.join(classes)} head are all "
+                             f"{classes[int(present[0])]}; at least two classes are needed")
+        # Train on the columns that occur in the data, then scatter back
+        columns, compact_indices = np.unique(rows.indices, return_inverse=True)
+        compact = rows._replace(indices=compact_indices)
+        head = cls(
+            np.zeros((len(columns), len(classes)), dtype=np.float32),
+            np.zeros(len(classes), dtype=np.float32),
+            classes
+        )
+        targets = np.zeros((rows.n_rows, len(classes)))
+        targets[np.arange(rows.n_rows), labels] = 1.0
+        for _ in range(epochs):
+            residual = (head.predict_proba(compact) - targets) / rows.n_rows
+            gradient = np.stack([
+                np.bincount(compact.indices, weights=compact.values * residual[compact.row_ids, column],
+                            minlength=len(columns))
+                for column in range(len(classes))
+            ], axis=1)
+            head.weights -= (learning_rate * (gradient + l2 * head.weights)).astype(np.float32)
+            head.bias -= (learning_rate * residual.sum(axis=0)).astype(np.float32)
+        weights = np.zeros((n_features, len(classes)), dtype=np.float32)
+        weights[columns] = head.weights
+        head.weights = weights
+        return head
+
+class LocalPrediction(NamedTuple):
+    """Predictions for a batch of sentences."""
+    requirement_probability: np.ndarray
+    types: List[str]
+    type_probability: np.ndarray
+    ambiguity: List[str]
+
+class LocalModel:
+    """
+    Small local classifier: hashed n-gram TF-IDF features and three linear heads.
+
+    The heads detect requirements, assign Functional / Non-Functional /
+    Ambiguous and rate ambiguity Low / Medium / High. Inference hashes a
+    sentence's n-grams and sums the matching weight rows, so whole documents
+    are classified on CPU without calling a remote model.
+    """
+
+    def __init__(self, idf: np.ndarray, detector: LinearHead, typer: LinearHead, ambiguity: LinearHead,
+                 feature_bits: int = DEFAULT_FEATURE_BITS):
+        self.idf = idf
+        self.detector = detector
+        self.typer = typer
+        self.ambiguity = ambiguity
+        self.feature_bits = feature_bits
+
+    @staticmethod
+    def _count_rows(texts: Sequence[str], feature_bits: int) -> SparseRows:
+        """Hashed term counts per row (duplicate columns merged)."""
+        row_ids = []
+        indices = []
+        for row, text in enumerate(texts):
+            features = hash_features(text, feature_bits)
+            indices.extend(features)
+            row_ids.extend([row] * len(features))
+        keys = np.asarray(row_ids, dtype=np.int64) << feature_bits | np.asarray(indices, dtype=np.int64)
+        keys, counts = np.unique(keys, return_counts=True)
+        return SparseRows(
+            (keys >> feature_bits).astype(np.int64),
+            (keys & ((1 << feature_bits) - 1)).astype(np.int64),
+            counts.astype(np.float64),
+            len(texts)
+        )
+
+    @staticmethod
+    def _weight_rows(rows: SparseRows, idf: np.ndarray) -> SparseRows:
+        """Apply sublinear TF-IDF weighting and L2-normalize each row."""
+        values = (1.0 + np.log(rows.values)) * idf[rows.indices]
+        norms = np.sqrt(np.bincount(rows.row_ids, weights=values * values, minlength=rows.n_rows))
+        norms[norms == 0] = 1.0
+        return rows._replace(values=values / norms[rows.row_ids])
+
+    def vectorize(self, texts: Sequence[str]) -> SparseRows:
+        """
+        Turn sentences into TF-IDF weighted hashed feature rows.
+
+        Args:
+            texts (Sequence[str]): Sentences.
+
+        Returns:
+            SparseRows: One L2-normalized row per sentence.
+        """
+        return self._weight_rows(self._count_rows(texts, self.feature_bits), self.idf)
+
+    def predict(self, texts: Sequence[str]) -> LocalPrediction:
+        """
+        Classify a batch of sentences.
+
+        Args:
+            texts (Sequence[str]): Sentences.
+
+        Returns:
+            LocalPrediction: Requirement probabilities, types with their probability and ambiguity levels.
+        """
+        rows = self.vectorize(texts)
+        type_proba = self.typer.predict_proba(rows)
+        type_index = type_proba.argmax(axis=1)
+        return LocalPrediction(
+            self.detector.predict_proba(rows)[:, 1],
+            [self.typer.classes[index] for index in type_index.tolist()],
+            type_proba[np.arange(len(texts)), type_index],
+            [self.ambiguity.classes[index] for index in self.ambiguity.decision_function(rows).argmax(axis=1).tolist()]
+        )
+
+    @classmethod
+    def train(cls, examples: Iterable[Dict], feature_bits: int = DEFAULT_FEATURE_BITS,
+              epochs: int = DEFAULT_EPOCHS, learning_rate: float = DEFAULT_LEARNING_RATE,
+              l2: float = DEFAULT_L2) -> "LocalModel":
+        """
+        Train all three heads.
+
+        Args:
+            examples (Iterable[Dict]): Dicts with "text" and "is_requirement";
+                requirements also carry "type" and "ambiguity".
+            feature_bits (int): Number of hash bits.
+            epochs (int): Gradient steps per head.
+            learning_rate (float): Step size.
+            l2 (float): L2 regularization strength.
+
+        Returns:
+            LocalModel: The trained model.
+
+        Raises:
+            ValueError: If a head has no examples or only one class to learn from.
+        """
+        examples = list(examples)
+        n_features = 1 << feature_bits
+        counts = cls._count_rows([example["text"] for example in examples], feature_bits)
+        document_frequency = np.bincount(counts.indices, minlength=n_features)
+        idf = (np.log((1 + len(examples)) / (1 + document_frequency)) + 1).astype(np.float32)
+        rows = cls._weight_rows(counts, idf)
+
+        is_requirement = np.array([bool(example["is_requirement"]) for example in examples])
+        detector = LinearHead.fit(rows, is_requirement.astype(np.int64), REQUIREMENT_CLASSES,
+                                  n_features, epochs, learning_rate, l2)
+        requirement_rows = _select_rows(rows, is_requirement)
+        requirements = [example for example in examples if example["is_requirement"]]
+        typer = LinearHead.fit(
+            requirement_rows, np.array([TYPE_CLASSES.index(example["type"]) for example in requirements]),
+            TYPE_CLASSES, n_features, epochs, learning_rate, l2
+        )
+        ambiguity = LinearHead.fit(
+            requirement_rows, np.array([AMBIGUITY_CLASSES.index(example["ambiguity"]) for example in requirements]),
+            AMBIGUITY_CLASSES, n_features, epochs, learning_rate, l2
+        )
+        return cls(idf, detector, typer, ambiguity, feature_bits)
+
+    def save(self, path: str):
+        """Serialize the model to a compressed .npz file."""
+        arrays = {"format_version": np.array(MODEL_FORMAT_VERSION), "feature_bits": np.array(self.feature_bits),
+                  "idf": self.idf}
+        for name, head in [("detector", self.detector), ("typer", self.typer), ("ambiguity", self.ambiguity)]:
+            arrays[f"{name}_weights"] = head.weights
+            arrays[f"{name}_bias"] = head.bias
+            arrays[f"{name}_classes"] = np.array(head.classes)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalModel":
+        """
+        Load a model written by save().
+
+        Raises:
+            ValueError: If the file was written by an incompatible version.
+        """
+        with np.load(path) as arrays:
+            if int(arrays["format_version"]) != MODEL_FORMAT_VERSION:
+                raise ValueError(f"Unsupported local model format version {int(arrays['format_version'])}")
+            heads = [
+                LinearHead(arrays[f"{name}_weights"], arrays[f"{name}_bias"], arrays[f"{name}_classes"].tolist())
+                for name in ("detector", "typer", "ambiguity")
+            ]
+            return cls(arrays["idf"], *heads, feature_bits=int(arrays["feature_bits"]))
+
+def _select_rows(rows: SparseRows, mask: np.ndarray) -> SparseRows:
+    """Keep the rows where mask is True, renumbering them."""
+    new_ids = np.cumsum(mask) - 1
+    keep = mask[rows.row_ids]
+    return SparseRows(new_ids[rows.row_ids[keep]], rows.indices[keep], rows.values[keep], int(mask.sum()))
+
+def load_local_model(path: Optional[str]) -> Optional[LocalModel]:
+    """Load a model if path is set and exists; log and return None otherwise."""
+    if not path:
+        logger.warning("ML_ENGINE=local but LOCAL_MODEL_PATH is not set; using heuristics")
+        return None
+    try:
+        return LocalModel.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Could not load local model from %s: %s; using heuristics", path, e)
+        return None
@@ -0,0 +1,330 @@
+import bisect
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Upper bounds in seconds for stage latency histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds for requirements per document
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Service statuses reported by the health() methods behind /health
+SERVICE_READY = "ready"
+SERVICE_DEGRADED = "degraded"
+SERVICE_UNAVAILABLE = "unavailable"
+
+# Label values -> sample value, returned by callback metrics at scrape time
+SampleCallback = Callable[[], Dict[Tuple[str, ...], float]]
+# (metric name, label values, state) entries moved between processes by drain/merge
+DrainedSamples = List[Tuple[str, Tuple[str, ...], Any]]
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+class _CounterChild:
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def drain(self) -> Optional[float]:
+        with self._lock:
+            value, self.value = self.value, 0.0
+        return value or None
+
+    def merge(self, value: float):
+        self.inc(value)
+
+class _GaugeChild(_CounterChild):
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+class _HistogramChild:
+    def __init__(self, lock: threading.Lock, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        # One count per bucket (not cumulative); the last one is +Inf
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def drain(self) -> Optional[Tuple[List[int], float]]:
+        with self._lock:
+            counts, total = self.counts, self.sum
+            self.counts, self.sum = [0] * len(counts), 0.0
+        return (counts, total) if any(counts) else None
+
+    def merge(self, state: Tuple[List[int], float]):
+        counts, total = state
+        with self._lock:
+            self.counts = [mine + theirs for mine, theirs in zip(self.counts, counts)]
+            self.sum += total
+
+class Metric:
+    """
+    A named metric family with optional labels.
+
+    labels(*values) returns the child for one combination of label values;
+    metrics without labels also forward inc/dec/set/observe to their only child.
+    Children of the base (untyped) metric hold a value that can be set,
+    incremented and decremented, like a gauge's.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:
+        return _GaugeChild(self._lock)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+
+    def collect(self) -> List[str]:
+        lines = self.header()
+        for values, child in sorted(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self._lock, self.upper_bounds)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def collect(self) -> List[str]:
+        lines = self.header()
+        bucket_labels = self.labelnames + ("le",)
+        for values, child in sorted(self._children.items()):
+            with self._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for upper_bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(bucket_labels, values + (_format_value(upper_bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class CallbackMetric(Metric):
+    """A counter or gauge whose samples are read from a callback at scrape time, costing nothing in between."""
+
+    def __init__(self, kind: str, name: str, documentation: str, labelnames: Sequence[str], callback: SampleCallback):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+    def collect(self) -> List[str]:
+        lines = self.header()
+        for values, value in sorted(self.callback().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Metrics of this process, rendered in the Prometheus text format.
+
+    Recording a sample is a dict lookup and a locked add, so instrumentation
+    stays cheap on the request path; callback metrics read existing counters
+    (cache stats, queue depth) only when scraped.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        if not metric.labelnames and not isinstance(metric, CallbackMetric):
+            # Unlabeled metrics are exposed as zero before their first sample
+            metric.labels()
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, kind: str, name: str, documentation: str, labelnames: Sequence[str],
+                 callback: SampleCallback) -> CallbackMetric:
+        """Register a counter or gauge read from callback(), replacing any previous one of the same name."""
+        self._metrics.pop(name, None)
+        return self.register(CallbackMetric(kind, name, documentation, labelnames, callback))
+
+    def expose(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> DrainedSamples:
+        """
+        Take and reset the counter and histogram samples recorded so far.
+
+        Pool worker processes send the result back with their output, so the
+        parent process can merge() stages that ran in the worker.
+        """
+        drained = []
+        for metric in self._metrics.values():
+            if isinstance(metric, (Counter, Histogram)):
+                for values, child in list(metric._children.items()):
+                    state = child.drain()
+                    if state is not None:
+                        drained.append((metric.name, values, state))
+        return drained
+
+    def merge(self, drained: DrainedSamples):
+        """Add samples drained from another process."""
+        for name, values, state in drained:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.labels(*values).merge(state)
+
+class MetricsMiddleware:
+    """ASGI middleware counting in-flight and completed HTTP requests."""
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = {"code": 500}
+
+        async def send_with_status(message: Dict[str, Any]):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The matched route template keeps label values bounded (no IDs)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUESTS_TOTAL.labels(scope["method"], route, str(status["code"])).inc()
+
+class Stopwatch:
+    """Accumulates time spent in one stage across the resumptions of a streaming generator."""
+
+    __slots__ = ("elapsed", "_started")
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self._started = 0.0
+
+    def start(self):
+        self._started = time.perf_counter()
+
+    def stop(self):
+        self.elapsed += time.perf_counter() - self._started
+
+REGISTRY = MetricsRegistry()
+
+UPLOAD_READ_SECONDS = REGISTRY.histogram(
+    "clearreq_upload_read_seconds", "Time to stream an upload into its size-checked buffer"
+)
+TEXT_EXTRACTION_SECONDS = REGISTRY.histogram(
+    "clearreq_text_extraction_seconds", "Text extraction and cleaning time per document", ("format",)
+)
+SENTENCE_SPLIT_SECONDS = REGISTRY.histogram(
+    "clearreq_sentence_split_seconds", "Sentence segmentation time per document"
+)
+CLASSIFICATION_SECONDS = REGISTRY.histogram(
+    "clearreq_classification_seconds", "Requirement classification time per document", ("engine",)
+)
+ENHANCEMENT_SECONDS = REGISTRY.histogram(
+    "clearreq_enhancement_seconds",
+    "AI enhancement time per document (one enhance_requirements call, or a whole streamed document)", ("provider",)
+)
+REQUIREMENTS_PER_DOCUMENT = REGISTRY.histogram(
+    "clearreq_requirements_per_document", "Requirements extracted per document", buckets=COUNT_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "clearreq_http_requests_in_flight", "HTTP requests currently being served"
+)
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "clearreq_http_requests_total", "HTTP requests served", ("method", "route", "status")
+)
@@ -1,84 +1,401 @@
+import os
 import re
-import random
-from typing import List
+import numpy as np
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
 from models.schemas import Requirement
+from services.keyword_automaton import get_keyword_automaton, NON_FUNCTIONAL, AMBIGUOUS
+from services.keywords import FUNCTIONAL_KEYWORDS, NON_FUNCTIONAL_KEYWORDS, AMBIGUOUS_KEYWORDS
+from services.segmenter import iter_segments, resume_offset
+from services.local_model import load_local_model
+from services.near_duplicates import NearDuplicateDetector
+from services.metrics import (
+    Stopwatch, SENTENCE_SPLIT_SECONDS, CLASSIFICATION_SECONDS, REQUIREMENTS_PER_DOCUMENT,
+    SERVICE_READY, SERVICE_DEGRADED
+)
 
 # Constants for classification
-FUNCTIONAL_KEYWORDS = [
-    'shall', 'should', 'must', 'will', 'can', 'may',
-    'system shall', 'user shall', 'users can', 'system must',
-    'the system', 'the user', 'users will', 'system will'
-]
-NON_FUNCTIONAL_KEYWORDS = [
-    'performance', 'speed', 'fast', 'slow', 'response time',
-    'availability', 'uptime', 'reliability', 'security',
-    'scalability', 'maintainability', 'usability', 'accessibility',
-    'compatibility', 'portability', 'efficiency', 'throughput',
-    'latency', 'bandwidth', 'capacity', 'load', 'stress',
-    'concurrent', 'simultaneous', 'real-time', 'near real-time'
-]
-AMBIGUOUS_KEYWORDS = [
-    'intuitive', 'user-friendly', 'easy to use', 'simple',
-    'fast', 'quick', 'efficient', 'good', 'better', 'best',
-    'appropriate', 'suitable', 'adequate', 'reasonable',
-    'secure', 'safe', 'reliable', 'stable', 'robust'
-]
+MODAL_VERBS = ['shall', 'should', 'must', 'will', 'can']
+# Confidence adjustment for the strongest modal verb in a requirement
+MODAL_CONFIDENCE = {'shall': 5, 'must': 5, 'will': 0, 'should': -5, 'can': -5}
+# Confidence bonus for quantified requirements and penalty per vague keyword
+MEASURABLE_BONUS = 5
+AMBIGUITY_PENALTY = 5
+MIN_CONFIDENCE = 50
+MAX_CONFIDENCE = 100
+REQUIREMENT_SUBJECTS = ['system', 'user', 'users']
+REQUIREMENT_VERBS = ['be', 'have', 'provide', 'support', 'allow', 'enable']
+
+def _build_requirement_regex() -> re.Pattern:
+    """
+    Compile every requirement pattern into one factored expression.
+
+    Matches "<subject> <modal>" (e.g. "the system shall") or "<modal> <verb>"
+    (e.g. "must provide"), so each sentence is scanned once.
+    """
+    modals = '|'.join(MODAL_VERBS)
+    subjects = '|'.join(REQUIREMENT_SUBJECTS)
+    verbs = '|'.join(REQUIREMENT_VERBS)
+    return re.compile(
+        rf'\b(?:(?:{subjects})\s+(?:{modals})|(?:{modals})\s+(?:{verbs}))\b'
+    )
+
+REQUIREMENT_REGEX = _build_requirement_regex()
+MODAL_REGEX = re.compile(r'\b(?:' + '|'.join(MODAL_VERBS) + r')\b')
+MEASURABLE_REGEX = re.compile(r'\d+')
+# Second half of the "<modal> <verb>" requirement pattern, matched right after a modal
+REQUIREMENT_VERB_AFTER = re.compile(rf'\s+(?:{"|".join(REQUIREMENT_VERBS)})\b')
+# Sentences are joined with NUL (removed by text normalization) for batch scans,
+# so no keyword, modal or requirement pattern can match across two sentences
+ROW_SEPARATOR = '\x00'
+REQUIREMENT_TYPES = ["Functional", "Non-Functional", "Ambiguous"]
+TYPE_CONFIDENCE = [15, 10, -20]
+AMBIGUITY_LEVELS = ["Low", "Medium", "High"]
+SUGGESTIONS = {
+    "Functional": {
+        "Low": "Consider adding specific acceptance criteria for better testability.",
+        "Medium": "Add more specific details about the expected behavior.",
+        "High": "Define measurable criteria and specific implementation details."
+    },
+    "Non-Functional": {
+        "Low": "Consider adding specific performance metrics and thresholds.",
+        "Medium": "Define measurable performance criteria and acceptable ranges.",
+        "High": "Replace subjective terms with specific, measurable requirements."
+    },
+    "Ambiguous": {
+        "Low": "Replace subjective terms with objective, measurable criteria.",
+        "Medium": "Define what constitutes success with specific metrics.",
+        "High": "Completely rewrite with specific, measurable, and testable criteria."
+    }
+}
+MIN_SENTENCE_LENGTH = 10
+# Streamed text held back without a sentence boundary is cut into a sentence past this length
+MAX_SENTENCE_LENGTH = 20_000
+# Classification engines (ML_ENGINE); "local" needs a model trained with train_local_model.py
+HEURISTIC_ENGINE = "heuristic"
+LOCAL_ENGINE = "local"
+ML_ENGINES = (HEURISTIC_ENGINE, LOCAL_ENGINE)
+# Local model probability above which a sentence counts as a requirement
+LOCAL_REQUIREMENT_THRESHOLD = 0.5
+
+TextSource = Union[str, Iterable[str], AsyncIterable[str]]
+
+def _find_all(corpus: str, needle: str) -> List[int]:
+    """Offsets of every occurrence of a literal (str.find scans at C speed)."""
+    offsets = []
+    find = corpus.find
+    offset = find(needle)
+    while offset != -1:
+        offsets.append(offset)
+        offset = find(needle, offset + 1)
+    return offsets
+
+def _is_word_char(char: str) -> bool:
+    """Same definition of a word character as \\w / \\b in str patterns."""
+    return char.isalnum() or char == '_'
+
+def _find_words(corpus: str, word: str) -> List[int]:
+    """Offsets of whole-word occurrences of a word."""
+    end = len(word)
+    return [
+        offset for offset in _find_all(corpus, word)
+        if (offset == 0 or not _is_word_char(corpus[offset - 1]))
+        and (offset + end == len(corpus) or not _is_word_char(corpus[offset + end]))
+    ]
+
+def _follows_subject(corpus: str, offset: int) -> bool:
+    """Whether a modal verb at offset is preceded by whitespace and a requirement subject."""
+    end = offset
+    while end and corpus[end - 1].isspace():
+        end -= 1
+    if end == offset:
+        return False
+    for subject in REQUIREMENT_SUBJECTS:
+        start = end - len(subject)
+        if corpus.startswith(subject, start, end) and start >= 0 and (start == 0 or not _is_word_char(corpus[start - 1])):
+            return True
+    return False
+
+def _to_rows(offsets: List[int], row_starts: np.ndarray) -> np.ndarray:
+    """Map offsets in a ROW_SEPARATOR-joined corpus to row indices."""
+    return np.searchsorted(row_starts, offsets, side='right') - 1
+
+def _join_rows(rows: List[str]):
+    """Join rows with ROW_SEPARATOR, returning the corpus and each row's start offset."""
+    lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    row_starts = np.zeros(len(rows), dtype=np.int64)
+    np.cumsum(lengths[:-1] + 1, out=row_starts[1:])
+    return ROW_SEPARATOR.join(rows), row_starts, lengths
+
+async def _iter_chunks(source: TextSource) -> AsyncIterator[str]:
+    """Normalize a string, an iterable or an async iterable of text chunks."""
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, '__aiter__'):
+        async for chunk in source:
+            yield chunk
+    else:
+        for chunk in source:
+            yield chunk
 
 class MLPipeline:
     """Machine Learning pipeline for requirement extraction and classification."""
 
-    def __init__(self):
+    def __init__(self, engine: Optional[str] = None, model_path: Optional[str] = None):
         self.functional_keywords = FUNCTIONAL_KEYWORDS
         self.non_functional_keywords = NON_FUNCTIONAL_KEYWORDS
         self.ambiguous_keywords = AMBIGUOUS_KEYWORDS
+        self.keyword_automaton = get_keyword_automaton()
+        # Batch classification: one column per keyword used by the classifier
+        self._batch_keywords = list(dict.fromkeys(NON_FUNCTIONAL_KEYWORDS + AMBIGUOUS_KEYWORDS))
+        self._non_functional_columns = np.isin(self._batch_keywords, NON_FUNCTIONAL_KEYWORDS)
+        self._ambiguous_columns = np.isin(self._batch_keywords, AMBIGUOUS_KEYWORDS)
+        # Classification engine (ML_ENGINE, LOCAL_MODEL_PATH); falls back to
+        # heuristics when the local model cannot be loaded
+        self.engine = (engine or os.getenv("ML_ENGINE", HEURISTIC_ENGINE)).lower()
+        if self.engine not in ML_ENGINES:
+            raise ValueError(f"Unknown ML engine '{self.engine}'. Supported engines: {', '.join(ML_ENGINES)}")
+        self.requested_engine = self.engine
+        self.local_model = None
+        self.local_model_path = None
+        if self.engine == LOCAL_ENGINE:
+            self.local_model_path = model_path or os.getenv("LOCAL_MODEL_PATH")
+            self.local_model = load_local_model(self.local_model_path)
+            if self.local_model is None:
+                self.engine = HEURISTIC_ENGINE
+        # Near-duplicate clustering of extracted requirements (DEDUP_ENABLED, DEDUP_THRESHOLD)
+        self.near_duplicates = None
+        if os.getenv("DEDUP_ENABLED", "true").lower() in ("1", "true", "yes"):
+            self.near_duplicates = NearDuplicateDetector()
 
-    async def extract_requirements(self, text: str) -> List[Requirement]:
+    def health(self) -> Dict[str, Any]:
+        """Classification engine in use; degraded when the local model could not be loaded."""
+        return {
+            "status": SERVICE_READY if self.engine == self.requested_engine else SERVICE_DEGRADED,
+            "engine": self.engine,
+            "near_duplicates": self.near_duplicates is not None
+        }
+
+    def config_key(self) -> str:
+        """Identify the settings that shape extraction, for whole-document result cache keys."""
+        model = self.local_model_path if self.engine == LOCAL_ENGINE else ""
+        dedup = str(self.near_duplicates.threshold) if self.near_duplicates is not None else "off"
+        return "\x1f".join([self.engine, model, dedup])
+
+    async def extract_requirements(self, text: TextSource) -> List[Requirement]:
         """
         Extract requirements from text using pattern matching and heuristics.
 
+        Near-duplicate requirements are then clustered, so the AIAnalyzer
+        enhances each cluster once; stream_requirements yields requirements
+        before the whole document is seen and leaves cluster_id unset.
+
         Args:
-            text (str): The input text.
+            text (TextSource): The input text, or an (async) iterable of text chunks.
 
         Returns:
             List[Requirement]: List of extracted requirements.
         """
-        sentences = self._split_into_sentences(text)
-        requirements = []
+        requirements = [requirement async for requirement in self.stream_requirements(text)]
+        if self.near_duplicates is not None:
+            requirements = self.near_duplicates.assign_clusters(requirements)
+        return requirements
+
+    async def stream_requirements(self, text: TextSource) -> AsyncIterator[Requirement]:
+        """
+        Extract requirements incrementally, yielding each one as soon as its sentence closes.
+
+        Only the tail after the last confirmed sentence boundary is buffered, and
+        each chunk is scanned from where the previous scan stopped. A tail that
+        grows past MAX_SENTENCE_LENGTH without a boundary is cut off as a
+        sentence, so memory and scanning stay bounded regardless of document
+        size. IDs are assigned sequentially as in extract_requirements, and
+        sample requirements are yielded if none are found.
+        Splitting and classification time and the requirement count are recorded
+        once the whole document has been read.
+
+        Args:
+            text (TextSource): The input text, or an (async) iterable of text chunks.
+
+        Yields:
+            Requirement: Extracted requirements in document order.
+        """
+        buffer = ""
+        scan_from = 0
         req_id = 1
-        for sentence in sentences:
-            if self._is_requirement_sentence(sentence):
-                requirement = self._classify_requirement(sentence, f"REQ-{req_id:03d}")
-                if requirement:
-                    requirements.append(requirement)
-                    req_id += 1
-        if not requirements:
-            requirements = self._generate_sample_requirements()
+        splitting, classifying = Stopwatch(), Stopwatch()
+        async for chunk in _iter_chunks(text):
+            splitting.start()
+            buffer += chunk
+            consumed = 0
+            sentences = []
+            for start, end in iter_segments(buffer, final=False, scan_from=scan_from):
+                sentences.append(buffer[start:end])
+                consumed = end
+            buffer = buffer[consumed:]
+            if len(buffer) > MAX_SENTENCE_LENGTH:
+                sentences.extend(buffer[start:end] for start, end in iter_segments(buffer))
+                buffer = ""
+            scan_from = resume_offset(buffer)
+            sentences = self._filter_sentences(sentences)
+            splitting.stop()
+            classifying.start()
+            requirements = self.classify_batch(sentences, req_id)
+            classifying.stop()
+            for requirement in requirements:
+                yield requirement
+                req_id += 1
+        splitting.start()
+        sentences = self._split_into_sentences(buffer)
+        splitting.stop()
+        classifying.start()
+        requirements = self.classify_batch(sentences, req_id)
+        classifying.stop()
+        for requirement in requirements:
+            yield requirement
+            req_id += 1
+        SENTENCE_SPLIT_SECONDS.observe(splitting.elapsed)
+        CLASSIFICATION_SECONDS.labels(self.engine).observe(classifying.elapsed)
+        REQUIREMENTS_PER_DOCUMENT.observe(req_id - 1)
+        if req_id == 1:
+            for requirement in self._generate_sample_requirements():
+                yield requirement
+
+    def _extract_requirement(self, sentence: str, req_id: int) -> Optional[Requirement]:
+        """Classify a sentence if it looks like a requirement."""
+        if self._is_requirement_sentence(sentence):
+            return self._classify_requirement(sentence, f"REQ-{req_id:03d}")
+        return None
+
+    def classify_batch(self, sentences: List[str], start_id: int = 1) -> List[Requirement]:
+        """
+        Extract and classify requirements from many sentences at once with the configured engine.
+
+        Args:
+            sentences (List[str]): Filtered sentences, in document order.
+            start_id (int): Number of the first requirement ID.
+
+        Returns:
+            List[Requirement]: Requirements for the sentences that look like one.
+        """
+        if self.local_model is not None:
+            return self._classify_batch_local(sentences, start_id)
+        return self._classify_batch_heuristic(sentences, start_id)
+
+    def _classify_batch_local(self, sentences: List[str], start_id: int) -> List[Requirement]:
+        """
+        Classify sentences with the local linear model.
+
+        Confidence is the product of the requirement and type probabilities,
+        scaled to 50-100 like the heuristic score.
+        """
+        if not sentences:
+            return []
+        prediction = self.local_model.predict(sentences)
+        requirements = []
+        for row in np.flatnonzero(prediction.requirement_probability >= LOCAL_REQUIREMENT_THRESHOLD).tolist():
+            req_type = prediction.types[row]
+            ambiguity = prediction.ambiguity[row]
+            probability = prediction.requirement_probability[row] * prediction.type_probability[row]
+            requirements.append(Requirement(
+                id=f"REQ-{start_id + len(requirements):03d}",
+                text=sentences[row].strip(),
+                type=req_type,
+                confidence=max(MIN_CONFIDENCE, min(MAX_CONFIDENCE, int(round(100 * probability)))),
+                ambiguity=ambiguity,
+                suggestion=self._generate_suggestion(sentences[row], req_type, ambiguity)
+            ))
+        return requirements
+
+    def _classify_batch_heuristic(self, sentences: List[str], start_id: int) -> List[Requirement]:
+        """
+        Extract and classify requirements from many sentences with the keyword heuristics.
+
+        Equivalent to calling _extract_requirement on each sentence with
+        sequential IDs. The lower-cased sentences are joined into one corpus
+        and each modal verb and keyword is located with one str.find pass.
+        Matches are mapped back to rows with np.searchsorted, giving a boolean
+        sentence-by-keyword matrix, and type, ambiguity and confidence are then
+        computed for all rows with array operations.
+
+        Args:
+            sentences (List[str]): Filtered sentences, in document order.
+            start_id (int): Number of the first requirement ID.
+
+        Returns:
+            List[Requirement]: Requirements for the sentences that look like one.
+        """
+        if not sentences:
+            return []
+        lowered = [sentence.lower() for sentence in sentences]
+        corpus, row_starts, lengths = _join_rows(lowered)
+
+        # Requirement pattern and modal weights from whole-word modal occurrences
+        is_requirement = np.zeros(len(lowered), dtype=bool)
+        modal_weight = np.full(len(lowered), np.nan)
+        for modal in MODAL_VERBS:
+            offsets = _find_words(corpus, modal)
+            rows = _to_rows(offsets, row_starts)
+            modal_weight[rows] = np.fmax(modal_weight[rows], MODAL_CONFIDENCE[modal])
+            is_requirement[_to_rows([
+                offset for offset in offsets
+                if REQUIREMENT_VERB_AFTER.match(corpus, offset + len(modal)) or _follows_subject(corpus, offset)
+            ], row_starts)] = True
+        selected = np.flatnonzero(is_requirement)
+        if not len(selected):
+            return []
+
+        # Keyword feature matrix over the requirement rows only
+        corpus, row_starts, lengths = _join_rows([lowered[row] for row in selected.tolist()])
+        keyword_matrix = np.zeros((len(selected), len(self._batch_keywords)), dtype=bool)
+        for column, keyword in enumerate(self._batch_keywords):
+            keyword_matrix[_to_rows(_find_all(corpus, keyword), row_starts), column] = True
+        non_func_count = keyword_matrix[:, self._non_functional_columns].sum(axis=1)
+        ambiguous_count = keyword_matrix[:, self._ambiguous_columns].sum(axis=1)
+        measurable = np.zeros(len(selected), dtype=bool)
+        if corpus.isascii():
+            codes = np.frombuffer(corpus.encode('ascii'), dtype=np.uint8)
+            measurable[_to_rows(np.flatnonzero(codes - ord('0') < 10), row_starts)] = True
+        else:
+            measurable[_to_rows([match.start() for match in MEASURABLE_REGEX.finditer(corpus)], row_starts)] = True
+
+        types = np.where(non_func_count > 0, 1, np.where(ambiguous_count > 0, 2, 0))
+        ambiguity = np.minimum(ambiguous_count, 2)
+        confidence = 70 + np.select([lengths > 100, lengths < 30], [10, -10], 0)
+        confidence += np.asarray(TYPE_CONFIDENCE)[types]
+        confidence += np.nan_to_num(modal_weight[selected]).astype(np.int64)
+        confidence += np.where(measurable, MEASURABLE_BONUS, 0)
+        confidence -= AMBIGUITY_PENALTY * ambiguous_count
+        confidence = np.clip(confidence, MIN_CONFIDENCE, MAX_CONFIDENCE)
+
+        requirements = []
+        for number, row, req_type, level, score in zip(
+            range(start_id, start_id + len(selected)), selected.tolist(),
+            types.tolist(), ambiguity.tolist(), confidence.tolist()
+        ):
+            req_type = REQUIREMENT_TYPES[req_type]
+            level = AMBIGUITY_LEVELS[level]
+            requirements.append(Requirement(
+                id=f"REQ-{number:03d}",
+                text=sentences[row].strip(),
+                type=req_type,
+                confidence=score,
+                ambiguity=level,
+                suggestion=self._generate_suggestion(sentences[row], req_type, level)
+            ))
         return requirements
 
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
-        return sentences
+        return self._filter_sentences([text[start:end] for start, end in iter_segments(text)])
+
+    def _filter_sentences(self, parts: List[str]) -> List[str]:
+        """Collapse whitespace in sentence fragments (including line breaks) and drop ones too short to be requirements."""
+        sentences = [" ".join(s.split()) for s in parts]
+        return [s for s in sentences if len(s) > MIN_SENTENCE_LENGTH]
 
     def _is_requirement_sentence(self, sentence: str) -> bool:
         """Check if a sentence looks like a requirement."""
-        sentence_lower = sentence.lower()
-        requirement_patterns = [
-            r'\b(the\s+)?system\s+(shall|should|must|will|can)\b',
-            r'\b(the\s+)?user\s+(shall|should|must|will|can)\b',
-            r'\busers?\s+(shall|should|must|will|can)\b',
-            r'\b(shall|should|must|will|can)\s+be\b',
-            r'\b(shall|should|must|will|can)\s+have\b',
-            r'\b(shall|should|must|will|can)\s+provide\b',
-            r'\b(shall|should|must|will|can)\s+support\b',
-            r'\b(shall|should|must|will|can)\s+allow\b',
-            r'\b(shall|should|must|will|can)\s+enable\b'
-        ]
-        for pattern in requirement_patterns:
-            if re.search(pattern, sentence_lower):
-                return True
-        return False
+        return REQUIREMENT_REGEX.search(sentence.lower()) is not None
 
     def _classify_requirement(self, sentence: str, req_id: str) -> Requirement:
         """Classify requirement type and generate metadata."""
@@ -98,8 +415,9 @@ class MLPipeline:
 
     def _determine_requirement_type(self, sentence: str) -> str:
         """Determine if requirement is functional, non-functional, or ambiguous."""
-        non_func_count = sum(1 for keyword in self.non_functional_keywords if keyword in sentence)
-        ambiguous_count = sum(1 for keyword in self.ambiguous_keywords if keyword in sentence)
+        hits = self.keyword_automaton.scan(sentence)
+        non_func_count = hits.count(NON_FUNCTIONAL)
+        ambiguous_count = hits.count(AMBIGUOUS)
         if non_func_count > 0:
             return "Non-Functional"
         elif ambiguous_count > 0:
@@ -108,7 +426,14 @@ class MLPipeline:
             return "Functional"
 
     def _calculate_confidence(self, sentence: str, req_type: str) -> int:
-        """Calculate confidence score (0-100)."""
+        """
+        Calculate confidence score (50-100) from sentence features.
+
+        Deterministic: starts from the length and type adjustments, then adds
+        the weight of the strongest modal verb ("shall"/"must" over
+        "should"/"can"), a bonus for numbers (a measurable criterion) and a
+        penalty per vague keyword.
+        """
         base_confidence = 70
         if len(sentence) > 100:
             base_confidence += 10
@@ -120,12 +445,17 @@ class MLPipeline:
             base_confidence += 10
         else:
             base_confidence -= 20
-        confidence = base_confidence + random.randint(-10, 10)
-        return max(50, min(100, confidence))
+        modals = MODAL_REGEX.findall(sentence)
+        if modals:
+            base_confidence += max(MODAL_CONFIDENCE[modal] for modal in modals)
+        if MEASURABLE_REGEX.search(sentence):
+            base_confidence += MEASURABLE_BONUS
+        base_confidence -= AMBIGUITY_PENALTY * self.keyword_automaton.scan(sentence).count(AMBIGUOUS)
+        return max(MIN_CONFIDENCE, min(MAX_CONFIDENCE, base_confidence))
 
     def _determine_ambiguity(self, sentence: str) -> str:
         """Determine ambiguity level."""
-        ambiguous_count = sum(1 for keyword in self.ambiguous_keywords if keyword in sentence)
+        ambiguous_count = self.keyword_automaton.scan(sentence).count(AMBIGUOUS)
         if ambiguous_count >= 2:
             return "High"
         elif ambiguous_count == 1:
@@ -135,24 +465,7 @@ class MLPipeline:
 
     def _generate_suggestion(self, sentence: str, req_type: str, ambiguity: str) -> str:
         """Generate improvement suggestion."""
-        suggestions = {
-            "Functional": {
-                "Low": "Consider adding specific acceptance criteria for better testability.",
-                "Medium": "Add more specific details about the expected behavior.",
-                "High": "Define measurable criteria and specific implementation details."
-            },
-            "Non-Functional": {
-                "Low": "Consider adding specific performance metrics and thresholds.",
-                "Medium": "Define measurable performance criteria and acceptable ranges.",
-                "High": "Replace subjective terms with specific, measurable requirements."
-            },
-            "Ambiguous": {
-                "Low": "Replace subjective terms with objective, measurable criteria.",
-                "Medium": "Define what constitutes success with specific metrics.",
-                "High": "Completely rewrite with specific, measurable, and testable criteria."
-            }
-        }
-        return suggestions.get(req_type, {}).get(ambiguity, "Consider adding more specific details.")
+        return SUGGESTIONS.get(req_type, {}).get(ambiguity, "Consider adding more specific details.")
 
     def _generate_sample_requirements(self) -> List[Requirement]:
         """Generate sample requirements if none are found."""
@@ -0,0 +1,235 @@
+import os
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from models.schemas import Requirement
+
+# Character shingle length, in bytes of the normalized text
+SHINGLE_SIZE = 5
+# Signature layout for locality-sensitive hashing: NUM_BANDS bands of BAND_ROWS
+# minhashes. Pairs at the default threshold share a band with probability
+# above 0.9999, pairs below 0.5 similarity rarely do.
+NUM_BANDS = 20
+BAND_ROWS = 6
+NUM_PERMUTATIONS = NUM_BANDS * BAND_ROWS
+# Minimum estimated Jaccard similarity of the shingle sets for two
+# requirements to share a cluster (DEDUP_THRESHOLD)
+DEFAULT_DEDUP_THRESHOLD = 0.85
+# Fixed seed so signatures, and therefore clusters, are reproducible
+HASH_SEED = 1729
+# Candidate pairs compared per numpy pass, to bound memory on long documents
+VERIFY_BLOCK_SIZE = 1 << 15
+NUMBER_REGEX = re.compile(r'\d+(?:[.,]\d+)*')
+NEGATION_REGEX = re.compile(r"\b(?:not|never|no|without|cannot|nor)\b|n't")
+
+def _normalize(text: str) -> bytes:
+    """Collapse whitespace and case, as the enhancement cache does."""
+    return " ".join(text.split()).casefold().encode("utf-8")
+
+def _shingle_set(text: str) -> frozenset:
+    """Exact character shingles of the normalized text."""
+    data = _normalize(text).ljust(SHINGLE_SIZE)
+    return frozenset(data[index:index + SHINGLE_SIZE] for index in range(len(data) - SHINGLE_SIZE + 1))
+
+class _DisjointSet:
+    """Union-find over indices, with path halving."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, index: int) -> int:
+        parent = self.parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def union(self, first: int, second: int):
+        first, second = self.find(first), self.find(second)
+        # The lower index becomes the root, so each cluster is named after its first member
+        if first < second:
+            self.parent[second] = first
+        elif second < first:
+            self.parent[first] = second
+
+class NearDuplicateDetector:
+    """
+    Clusters near-duplicate requirements with MinHash and locality-sensitive hashing.
+
+    Each requirement becomes the set of character shingles of its normalized
+    text, summarized by a MinHash signature. Signatures are cut into bands and
+    only requirements sharing a band bucket are compared, so the work grows
+    roughly linearly with the number of requirements instead of with every
+    pair. Candidates are kept when their signatures agree on at least
+    threshold of the minhashes, they have the same type and they state the
+    same numbers and negations ("within 2 seconds" and "within 20 seconds",
+    "shall store" and "shall not store" stay apart). A requirement only joins
+    a cluster if its exact shingle similarity to the cluster's first
+    requirement reaches threshold, since the AIAnalyzer reuses that
+    requirement's enhancement for the whole cluster.
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = threshold or float(os.getenv("DEDUP_THRESHOLD", DEFAULT_DEDUP_THRESHOLD))
+        # Multiply-add-shift hash functions ((a * x + b) mod 2**64) >> 32, one per minhash
+        rng = np.random.default_rng(HASH_SEED)
+        self._a = rng.integers(0, np.iinfo(np.uint64).max, size=NUM_PERMUTATIONS, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, np.iinfo(np.uint64).max, size=NUM_PERMUTATIONS, dtype=np.uint64, endpoint=True)
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Compute MinHash signatures.
+
+        Args:
+            texts (Sequence[str]): Texts to summarize.
+
+        Returns:
+            np.ndarray: One row of NUM_PERMUTATIONS 32-bit minhashes per text.
+        """
+        if not texts:
+            return np.empty((0, NUM_PERMUTATIONS), dtype=np.uint32)
+        encoded = [_normalize(text).ljust(SHINGLE_SIZE) for text in texts]
+        lengths = np.fromiter((len(data) for data in encoded), dtype=np.int64, count=len(encoded))
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+        # Pack every window of SHINGLE_SIZE bytes into one integer, then fold it to 32 bits
+        packed = np.zeros(len(data) - SHINGLE_SIZE + 1, dtype=np.uint64)
+        for offset in range(SHINGLE_SIZE):
+            packed |= data[offset:len(data) - SHINGLE_SIZE + 1 + offset] << np.uint64(8 * offset)
+        packed = (packed ^ (packed >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+        # Keep only windows that lie within one text
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        offsets = np.concatenate(([0], np.cumsum(lengths - SHINGLE_SIZE + 1)[:-1]))
+        keep = np.ones(len(packed), dtype=bool)
+        for tail in range(1, SHINGLE_SIZE):
+            ends = starts[1:] - tail
+            keep[ends[ends >= 0]] = False
+        # Requirements share most of their wording, so each distinct shingle is hashed once
+        shingles, occurrences = np.unique(packed[keep], return_inverse=True)
+
+        signatures = np.empty((len(texts), NUM_PERMUTATIONS), dtype=np.uint32)
+        shift = np.uint64(32)
+        # One flat pass per hash function; broadcasting all of them at once is slower
+        for index in range(NUM_PERMUTATIONS):
+            hashed = ((shingles * self._a[index] + self._b[index]) >> shift).astype(np.uint32)
+            signatures[:, index] = np.minimum.reduceat(hashed[occurrences], offsets)
+        return signatures
+
+    def _candidate_pairs(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        Pairs of rows that share a bucket in at least one band.
+
+        Within a bucket each member is paired with the bucket's first member
+        and with its predecessor, keeping the pairs linear in the bucket size.
+
+        Returns:
+            np.ndarray: Unique (first, second) index pairs, first > second.
+        """
+        pairs = []
+        for band in range(NUM_BANDS):
+            rows = np.ascontiguousarray(signatures[:, band * BAND_ROWS:(band + 1) * BAND_ROWS])
+            keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * BAND_ROWS))).ravel()
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            same_bucket = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1]) + 1
+            if not len(same_bucket):
+                continue
+            new_bucket = np.ones(len(order), dtype=bool)
+            new_bucket[same_bucket] = False
+            bucket_start = np.maximum.accumulate(np.where(new_bucket, np.arange(len(order)), 0))
+            members = order[same_bucket]
+            pairs.append(np.stack([members, order[same_bucket - 1]], axis=1))
+            pairs.append(np.stack([members, order[bucket_start[same_bucket]]], axis=1))
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.concatenate(pairs)
+        count = len(signatures)
+        # Deduplicate as one integer per pair, which sorts far faster than rows
+        keys = np.unique(pairs.max(axis=1) * count + pairs.min(axis=1))
+        return np.stack(np.divmod(keys, count), axis=1)
+
+    def cluster(self, texts: Sequence[str], groups: Optional[Sequence[str]] = None) -> List[int]:
+        """
+        Group near-duplicate texts.
+
+        Args:
+            texts (Sequence[str]): Texts to cluster.
+            groups (Optional[Sequence[str]]): Optional label per text; texts with
+                different labels never share a cluster.
+
+        Returns:
+            List[int]: For each text, the index of the first text of its cluster
+            (its own index when it has no near-duplicate).
+        """
+        count = len(texts)
+        signatures = self.signatures(texts)
+        candidates = self._candidate_pairs(signatures)
+        # Texts may only match within the same group and with the same numbers and negations
+        keys: Dict[tuple, int] = {}
+        codes = np.fromiter((
+            keys.setdefault((groups[index] if groups is not None else None,
+                             tuple(NUMBER_REGEX.findall(text)),
+                             tuple(NEGATION_REGEX.findall(text.casefold()))), len(keys))
+            for index, text in enumerate(texts)
+        ), dtype=np.int64, count=count)
+        first, second = candidates[:, 0], candidates[:, 1]
+        agreement = np.zeros(len(candidates), dtype=np.int64)
+        step = VERIFY_BLOCK_SIZE
+        for start in range(0, len(candidates), step):
+            agreement[start:start + step] = np.count_nonzero(
+                signatures[first[start:start + step]] == signatures[second[start:start + step]], axis=1
+            )
+        similar = (codes[first] == codes[second]) & (agreement >= np.ceil(self.threshold * NUM_PERMUTATIONS))
+
+        # Similar pairs only link texts into components; a chain of small edits
+        # can connect texts far apart, so clusters are formed within each one
+        components = _DisjointSet(count)
+        for member, other in candidates[similar].tolist():
+            components.union(member, other)
+        members_by_component: Dict[int, List[int]] = defaultdict(list)
+        for index in range(count):
+            members_by_component[components.find(index)].append(index)
+
+        roots = list(range(count))
+        for members in members_by_component.values():
+            if len(members) < 2:
+                continue
+            # In document order, each text joins the representative it is most
+            # similar to, if any reaches the threshold exactly, or starts a cluster
+            shingles = {index: _shingle_set(texts[index]) for index in members}
+            representatives: List[int] = []
+            for index in members:
+                best, best_similarity = None, self.threshold
+                for representative in representatives:
+                    union = len(shingles[index] | shingles[representative])
+                    similarity = len(shingles[index] & shingles[representative]) / union
+                    if similarity >= best_similarity:
+                        best, best_similarity = representative, similarity
+                if best is None:
+                    representatives.append(index)
+                else:
+                    roots[index] = best
+        return roots
+
+    def assign_clusters(self, requirements: List[Requirement]) -> List[Requirement]:
+        """
+        Set cluster_id on requirements that have near-duplicates.
+
+        Args:
+            requirements (List[Requirement]): Requirements in document order.
+
+        Returns:
+            List[Requirement]: The requirements; members of a cluster of two or more
+            get the ID of its first requirement as cluster_id, the rest None.
+        """
+        roots = self.cluster(
+            [requirement.text for requirement in requirements],
+            [requirement.type for requirement in requirements]
+        )
+        sizes = np.bincount(roots, minlength=len(requirements)) if requirements else []
+        return [
+            requirement.model_copy(update={
+                "cluster_id": requirements[root].id if sizes[root] > 1 else None
+            })
+            for requirement, root in zip(requirements, roots)
+        ]
@@ -0,0 +1,199 @@
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from models.schemas import AnalysisResponse, ModifiedRequirement, RequirementDiff, RevisionResponse
+from services.analysis import AnalysisService, build_summary, collect_ambiguities
+from services.ingestion import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+# Requirements at least this similar (difflib ratio of the normalized text)
+# are reported as modified rather than removed + added (REVISION_MIN_SIMILARITY)
+DEFAULT_MIN_SIMILARITY = 0.6
+# Largest removed x added block compared pairwise; bigger rewrites count as removed + added
+MAX_FUZZY_PAIRS = 10_000
+
+def normalize_requirement_text(text: str) -> str:
+    """Collapse whitespace and case, as the enhancement cache does."""
+    return " ".join(text.split()).casefold()
+
+class Alignment(NamedTuple):
+    """How the requirements of two revisions correspond, by index."""
+    unchanged: List[Tuple[int, int]]
+    modified: List[Tuple[int, int, float]]
+    added: List[int]
+    removed: List[int]
+
+def _fuzzy_pairs(previous_keys: List[str], current_keys: List[str], removed: List[int], added: List[int],
+                 min_similarity: float) -> List[Tuple[int, int, float]]:
+    """Pair removed and added requirements of one diff block, most similar first."""
+    if not removed or not added or len(removed) * len(added) > MAX_FUZZY_PAIRS:
+        return []
+    candidates = []
+    matcher = SequenceMatcher(None, autojunk=False)
+    for previous_index in removed:
+        # SequenceMatcher caches its analysis of seq2, so the fixed side goes there
+        matcher.set_seq2(previous_keys[previous_index])
+        for current_index in added:
+            matcher.set_seq1(current_keys[current_index])
+            if matcher.real_quick_ratio() < min_similarity or matcher.quick_ratio() < min_similarity:
+                continue
+            similarity = matcher.ratio()
+            if similarity >= min_similarity:
+                candidates.append((-similarity, previous_index, current_index))
+    pairs = []
+    used_previous, used_current = set(), set()
+    for negative_similarity, previous_index, current_index in sorted(candidates):
+        if previous_index not in used_previous and current_index not in used_current:
+            used_previous.add(previous_index)
+            used_current.add(current_index)
+            pairs.append((previous_index, current_index, round(-negative_similarity, 4)))
+    return pairs
+
+def align_requirements(previous: List[str], current: List[str],
+                       min_similarity: float = DEFAULT_MIN_SIMILARITY) -> Alignment:
+    """
+    Align the requirement texts of two revisions.
+
+    Texts are compared by their normalized form. A sequence diff finds the
+    runs that stayed in place; requirements that moved elsewhere are matched
+    by exact normalized text, and the rest of each changed block is paired by
+    fuzzy similarity. The work is proportional to the document length plus
+    the size of the changed blocks.
+
+    Args:
+        previous (List[str]): Requirement texts of the previous revision.
+        current (List[str]): Requirement texts of the new revision.
+        min_similarity (float): Lowest similarity counted as a modification.
+
+    Returns:
+        Alignment: (previous, current) index pairs of unchanged and modified
+        requirements, and the indices of added and removed ones.
+    """
+    previous_keys = [normalize_requirement_text(text) for text in previous]
+    current_keys = [normalize_requirement_text(text) for text in current]
+    unchanged = []
+    blocks = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, previous_keys, current_keys, autojunk=False).get_opcodes():
+        if tag == "equal":
+            unchanged.extend(zip(range(i1, i2), range(j1, j2)))
+        else:
+            blocks.append((list(range(i1, i2)), list(range(j1, j2))))
+
+    # Requirements that only moved are unchanged, not removed + added
+    removed_by_key: Dict[str, List[int]] = defaultdict(list)
+    for block_removed, _ in blocks:
+        for previous_index in block_removed:
+            removed_by_key[previous_keys[previous_index]].append(previous_index)
+    moved = {}
+    for _, block_added in blocks:
+        for current_index in block_added:
+            candidates = removed_by_key.get(current_keys[current_index])
+            if candidates:
+                moved[current_index] = candidates.pop(0)
+    unchanged.extend((previous_index, current_index) for current_index, previous_index in moved.items())
+    moved_previous = set(moved.values())
+
+    modified, added, removed = [], [], []
+    for block_removed, block_added in blocks:
+        block_removed = [index for index in block_removed if index not in moved_previous]
+        block_added = [index for index in block_added if index not in moved]
+        pairs = _fuzzy_pairs(previous_keys, current_keys, block_removed, block_added, min_similarity)
+        modified.extend(pairs)
+        paired_previous = {previous_index for previous_index, _, _ in pairs}
+        paired_current = {current_index for _, current_index, _ in pairs}
+        removed.extend(index for index in block_removed if index not in paired_previous)
+        added.extend(index for index in block_added if index not in paired_current)
+    return Alignment(
+        sorted(unchanged, key=lambda pair: pair[1]),
+        sorted(modified, key=lambda pair: pair[1]),
+        sorted(added),
+        sorted(removed)
+    )
+
+class RevisionAnalyzer:
+    """
+    Re-analyzes a new revision of a document against a previous analysis.
+
+    The new revision is extracted and classified locally as usual, then
+    aligned with the previous requirements. Unchanged requirements reuse
+    their previous enhancement; only added and modified ones go through the
+    AIAnalyzer, so remote model cost follows the size of the change.
+    """
+
+    def __init__(self, analysis: AnalysisService, min_similarity: Optional[float] = None):
+        self.analysis = analysis
+        self.min_similarity = min_similarity or float(
+            os.getenv("REVISION_MIN_SIMILARITY", DEFAULT_MIN_SIMILARITY)
+        )
+
+    async def analyze(self, upload: SpooledUpload, previous: AnalysisResponse,
+                      client_id: Optional[str] = None) -> RevisionResponse:
+        """
+        Analyze an upload as a revision of a previous analysis.
+
+        Args:
+            upload (SpooledUpload): The new revision; the caller closes it.
+            previous (AnalysisResponse): The previous analysis, with its history_id.
+            client_id (Optional[str]): Client whose history the new analysis is recorded in.
+
+        Returns:
+            RevisionResponse: The full analysis of the new revision and the requirement diff.
+        """
+        current = await self.analysis.ml_pipeline.extract_requirements(
+            self.analysis.file_processor.iter_text(upload)
+        )
+        alignment = align_requirements(
+            [requirement.text for requirement in previous.requirements],
+            [requirement.text for requirement in current],
+            self.min_similarity
+        )
+        logger.debug("Revision %s of analysis %s: %d unchanged, %d modified, %d added, %d removed",
+                     upload.filename, previous.history_id, len(alignment.unchanged), len(alignment.modified),
+                     len(alignment.added), len(alignment.removed))
+
+        requirements = list(current)
+        for previous_index, current_index in alignment.unchanged:
+            # Keep the new ID, exact wording and cluster, reuse the previous enhancement
+            requirements[current_index] = previous.requirements[previous_index].model_copy(
+                update={
+                    "id": current[current_index].id,
+                    "text": current[current_index].text,
+                    "cluster_id": current[current_index].cluster_id
+                }
+            )
+        changed = sorted(alignment.added + [current_index for _, current_index, _ in alignment.modified])
+        enhanced = await self.analysis.ai_analyzer.enhance_requirements([current[index] for index in changed])
+        for index, requirement in zip(changed, enhanced):
+            requirements[index] = requirement
+
+        result = AnalysisResponse(
+            summary=build_summary(requirements),
+            requirements=requirements,
+            ambiguities=collect_ambiguities(requirements),
+            filename=upload.filename,
+            timestamp=datetime.now().isoformat()
+        )
+        result_key = self.analysis.result_key(upload)
+        self.analysis.result_cache.set(result_key, result)
+        result = self.analysis.record(result, upload.sha256, client_id, result_key)
+        return RevisionResponse(
+            previous_id=previous.history_id,
+            result=result,
+            diff=RequirementDiff(
+                added=[requirements[index] for index in alignment.added],
+                removed=[previous.requirements[index] for index in alignment.removed],
+                modified=[
+                    ModifiedRequirement(
+                        previous=previous.requirements[previous_index],
+                        current=requirements[current_index],
+                        similarity=similarity
+                    )
+                    for previous_index, current_index, similarity in alignment.modified
+                ],
+                unchanged=len(alignment.unchanged)
+            )
+        )
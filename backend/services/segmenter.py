@@ -0,0 +1,116 @@
+import re
+from typing import Iterator, Tuple
+
+# Words that end with a period without ending the sentence
+ABBREVIATIONS = {
+    'e.g', 'i.e', 'eg', 'ie', 'vs', 'cf', 'al', 'approx', 'incl', 'esp', 'resp',
+    'fig', 'ref', 'para', 'mr', 'mrs', 'ms', 'dr', 'u.s', 'u.k'
+}
+# Longest abbreviation looked at before a period
+MAX_ABBREVIATION_LENGTH = 8
+
+# Sentence terminators, or a line break
+CANDIDATE = re.compile(r'[.!?]+|\n')
+NON_SPACE = re.compile(r'\S')
+WORD_BEFORE_PERIOD = re.compile(r'[A-Za-z][A-Za-z.]*\Z')
+# Whitespace and stray terminators between segments
+GAP = re.compile(r'[\s.!?]*')
+# Bullets, "1." / "1.2." / "1.2 Title" / "2)" / "(a)" numbering and "REQ-123:" style
+# identifiers. Identifiers need their ':', '.' or ')' so that content such as
+# "AES-256 encryption" or "ISO-9001 compliance" is not mistaken for one.
+LIST_MARKER = re.compile(
+    r'(?:[-*+•]|\(?\d+[.)]|\d+(?:\.\d+)+(?:[.)]|(?=\s+[A-Z]))|\([a-zA-Z]\)|[a-z]\)'
+    r'|[A-Z][A-Z0-9]*-\d+(?:\.\d+)*[:.)])(?=\s)\s*'
+)
+# Line endings that signal the sentence continues on the next line
+CONTINUATION_CHARS = ',-('
+
+Span = Tuple[int, int]
+
+def _segment_start(text: str, position: int) -> int:
+    """Skip whitespace, stray terminators and list markers before a segment."""
+    while True:
+        position = GAP.match(text, position).end()
+        marker = LIST_MARKER.match(text, position)
+        if marker is None or marker.end() == position:
+            return position
+        position = marker.end()
+
+def _is_line_boundary(text: str, line_end: int, next_start: int) -> bool:
+    """Decide whether a single line break ends a segment."""
+    if LIST_MARKER.match(text, next_start):
+        return True
+    previous = text[line_end - 1] if line_end else ''
+    return text[next_start].isupper() and previous not in CONTINUATION_CHARS
+
+def resume_offset(text: str) -> int:
+    """
+    Offset from which iter_segments(text + more, final=False) can resume scanning.
+
+    Every candidate boundary before the trailing run of whitespace and
+    terminators was already decided by an incomplete scan of text, and more
+    text cannot change that decision.
+    """
+    offset = len(text)
+    while offset and (text[offset - 1].isspace() or text[offset - 1] in '.!?'):
+        offset -= 1
+    return offset
+
+def iter_segments(text: str, final: bool = True, scan_from: int = 0) -> Iterator[Span]:
+    """
+    Split text into sentences/clauses, yielding offsets instead of copies.
+
+    A segment ends at '.', '!' or '?' followed by whitespace, at a blank line,
+    or at a line break followed by a list item or a capitalized line. Periods
+    inside numbers ("Chrome 90.1"), after abbreviations ("e.g.") or not
+    followed by whitespace do not end a segment. List markers and "REQ-123:"
+    style prefixes are excluded from the segment, as are the terminators.
+    The text is scanned once, left to right.
+
+    Args:
+        text (str): Normalized text (see services.text_normalizer).
+        final (bool): Whether text is complete. When False, the trailing
+            segment and any boundary that depends on text not yet seen are
+            held back; callers keep text[last_end:] and append the next chunk.
+        scan_from (int): Where to look for the first boundary; pass
+            resume_offset() of the held-back text so it is not scanned again.
+
+    Yields:
+        Span: (start, end) offsets of each non-empty segment.
+    """
+    length = len(text)
+    start = _segment_start(text, 0)
+    position = max(start, scan_from)
+    while True:
+        match = CANDIDATE.search(text, position)
+        if match is None:
+            break
+        end, after = match.span()
+        position = after
+        is_newline = match.group() == '\n'
+        if not is_newline and after < length and not text[after].isspace():
+            continue
+        following = NON_SPACE.search(text, after)
+        if following is None:
+            # Whether this is a boundary depends on text not seen yet
+            break
+        next_start = following.start()
+        if is_newline:
+            if '\n' not in text[after:next_start] and not _is_line_boundary(text, end, next_start):
+                continue
+        elif match.group().endswith('.'):
+            word = WORD_BEFORE_PERIOD.search(text, max(start, end - MAX_ABBREVIATION_LENGTH), end)
+            if word is not None and word.group().lower() in ABBREVIATIONS:
+                continue
+        segment_end = end
+        while segment_end > start and text[segment_end - 1].isspace():
+            segment_end -= 1
+        if segment_end > start:
+            yield start, segment_end
+        start = position = _segment_start(text, after)
+    if final:
+        end = length
+        while end > start and (text[end - 1].isspace() or text[end - 1] in '.!?'):
+            end -= 1
+        if end > start:
+            yield start, end
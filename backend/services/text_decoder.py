@@ -0,0 +1,87 @@
+import codecs
+from typing import BinaryIO, Iterator, Tuple
+
+# Bytes inspected to pick an encoding before decoding starts
+SNIFF_BYTES = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+# Longest BOMs first: the UTF-32-LE BOM starts with the UTF-16-LE one
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+LATIN1_FALLBACK = 'clearreq-latin1-fallback'
+
+def _latin1_fallback(error: UnicodeDecodeError) -> Tuple[str, int]:
+    """Decode bytes that are not valid UTF-8 as latin-1 instead of failing."""
+    return error.object[error.start:error.end].decode('latin-1'), error.end
+
+codecs.register_error(LATIN1_FALLBACK, _latin1_fallback)
+
+def detect_encoding(prefix: bytes) -> Tuple[str, int]:
+    """
+    Detect the encoding of a text file from its first bytes.
+
+    Checks for a byte order mark, then for BOM-less UTF-16 (ASCII text with
+    NUL bytes in every other position, as exported by Word), then whether the
+    prefix is valid UTF-8; anything else is treated as latin-1.
+
+    Args:
+        prefix (bytes): The first bytes of the file.
+
+    Returns:
+        Tuple[str, int]: Encoding name and length of the BOM to skip.
+    """
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return encoding, len(bom)
+    sample = prefix[:4096]
+    if len(sample) >= 4:
+        even_nuls = sample[0::2].count(0)
+        odd_nuls = sample[1::2].count(0)
+        half = len(sample) // 2
+        if odd_nuls > half * 0.4 and even_nuls < half * 0.05:
+            return 'utf-16-le', 0
+        if even_nuls > half * 0.4 and odd_nuls < half * 0.05:
+            return 'utf-16-be', 0
+    try:
+        # final=False tolerates a multi-byte character cut off at the end of the prefix
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+        return 'utf-8', 0
+    except UnicodeDecodeError:
+        return 'latin-1', 0
+
+def iter_decoded(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Decode a binary stream incrementally in a single read.
+
+    The encoding is chosen from the first SNIFF_BYTES. For UTF-8, invalid
+    byte sequences found later in the file are decoded as latin-1 rather
+    than restarting the whole decode.
+
+    Args:
+        stream (BinaryIO): Binary stream positioned at the start of the file.
+        chunk_size (int): Bytes read per step.
+
+    Yields:
+        str: Decoded text chunks; memory use is bounded by chunk_size.
+    """
+    prefix = stream.read(max(SNIFF_BYTES, chunk_size))
+    encoding, bom_length = detect_encoding(prefix)
+    errors = LATIN1_FALLBACK if encoding == 'utf-8' else 'replace'
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    text = decoder.decode(prefix[bom_length:])
+    if text:
+        yield text
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
@@ -0,0 +1,115 @@
+import re
+
+# Characters kept besides word characters and whitespace
+ALLOWED_PUNCTUATION = '.,;:!?-()'
+# Line boundaries recognized by str.splitlines
+LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+def _build_symbol_table() -> dict:
+    """Translate table deleting ASCII characters that are not word characters, whitespace or allowed punctuation."""
+    return {
+        code: None for code in range(128)
+        if not (chr(code).isalnum() or chr(code) == '_' or chr(code).isspace()
+                or chr(code) in ALLOWED_PUNCTUATION)
+    }
+
+SYMBOL_TABLE = _build_symbol_table()
+SYMBOL_PATTERN = re.compile(r'[^\w\s' + re.escape(ALLOWED_PUNCTUATION) + r']+')
+
+def strip_symbols(text: str) -> str:
+    """
+    Remove special characters that might interfere with processing.
+
+    Pure-ASCII text (the common case) goes through str.translate, which has a
+    fast path for ASCII input; other text takes one compiled substitution.
+    """
+    if text.isascii():
+        return text.translate(SYMBOL_TABLE)
+    return SYMBOL_PATTERN.sub('', text)
+
+class TextNormalizer:
+    """
+    Text cleaner that can be fed a document in chunks.
+
+    Each chunk is visited once for symbol removal and once by the C-level
+    splitlines/split, which collapse whitespace without building a
+    full-size copy per rule. Spaces collapse to one, line breaks are kept as
+    '\\n' and blank lines become a '\\n\\n' paragraph break, so downstream
+    segmentation can still see line and paragraph boundaries. Text after the
+    last whitespace of a chunk is held back until the next one, so the output
+    does not depend on where the input was split.
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._started = False
+        # Line breaks seen since the last emitted word
+        self._breaks = 0
+
+    def feed(self, chunk: str) -> str:
+        """
+        Normalize the next chunk of text.
+
+        Args:
+            chunk (str): Raw text, continuing the previous chunk.
+
+        Returns:
+            str: Normalized text that can be emitted so far (possibly empty).
+        """
+        text = self._pending + strip_symbols(chunk)
+        # Cut after the last whitespace so no word is split; keep a trailing
+        # '\r' back in case the next chunk starts with '\n'
+        cut = len(text)
+        while cut and not text[cut - 1].isspace():
+            cut -= 1
+        if cut and text[cut - 1] == '\r':
+            cut -= 1
+        self._pending = text[cut:]
+        return self._normalize(text[:cut])
+
+    def flush(self) -> str:
+        """
+        Finish the document.
+
+        Returns:
+            str: Normalized remainder of the text; the document is stripped at both ends.
+        """
+        text = self._normalize(self._pending)
+        self._pending = ''
+        self._started = False
+        self._breaks = 0
+        return text
+
+    def _normalize(self, text: str) -> str:
+        """Collapse whitespace in text that ends on a word boundary."""
+        pieces = []
+        breaks = self._breaks
+        for index, line in enumerate(text.splitlines()):
+            if index:
+                breaks += 1
+            words = line.split()
+            if not words:
+                continue
+            if self._started:
+                pieces.append('\n\n' if breaks > 1 else '\n' if breaks else ' ')
+            self._started = True
+            pieces.append(' '.join(words))
+            breaks = 0
+        if text and text[-1] in LINE_BREAKS:
+            breaks += 1
+        self._breaks = breaks
+        return ''.join(pieces)
+
+def normalize_text(text: str) -> str:
+    """
+    Clean a whole document.
+
+    Args:
+        text (str): Raw extracted text.
+
+    Returns:
+        str: Text with symbols removed, spaces collapsed and line/paragraph
+        breaks preserved, stripped at both ends.
+    """
+    normalizer = TextNormalizer()
+    return normalizer.feed(text) + normalizer.flush()
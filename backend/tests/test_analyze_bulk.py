@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from analyze_bulk import FILE_SUCCEEDED, JsonlWriter, ParquetWriter, worker_ai_concurrency
+
+
+def make_record(path: str, texts: list, timestamp: str = "2026-01-01T00:00:00") -> dict:
+    requirements = [
+        {"id": f"REQ-{index:03d}", "text": text, "type": "Functional", "confidence": 90,
+         "ambiguity": "Low", "suggestion": None, "cluster_id": None}
+        for index, text in enumerate(texts, 1)
+    ]
+    return {"path": path, "status": FILE_SUCCEEDED, "error": None, "bytes": 0,
+            "result": {"requirements": requirements, "timestamp": timestamp}}
+
+
+def read_jsonl(path) -> list:
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_jsonl_keeps_the_latest_record_per_path(tmp_path):
+    output = tmp_path / "results.jsonl"
+    writer = JsonlWriter(str(output))
+    writer.write(make_record("a.txt", ["old"]))
+    writer.write(make_record("b.txt", ["b"]))
+    writer.close()
+    # A resumed run re-analyzes a.txt after it changed
+    writer = JsonlWriter(str(output))
+    writer.write(make_record("a.txt", ["new"]))
+    writer.close()
+
+    records = read_jsonl(output)
+    assert [record["path"] for record in records] == ["b.txt", "a.txt"]
+    assert records[1]["result"]["requirements"][0]["text"] == "new"
+
+
+def test_workers_split_the_ai_concurrency(monkeypatch):
+    monkeypatch.setenv("AI_MAX_CONCURRENCY", "8")
+    assert worker_ai_concurrency(4) == 2
+    assert worker_ai_concurrency(16) == 1
+
+
+def test_parquet_writes_one_row_per_requirement(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    writer = ParquetWriter(str(tmp_path), rows_per_part=3)
+    assert not writer.write(make_record("a.txt", ["one", "two"]))
+    assert writer.write(make_record("b.txt", ["three", "four"]))
+    writer.write(make_record("c.txt", []))
+    writer.write(dict(make_record("d.txt", []), result=None))
+    writer.write(make_record("e.txt", ["five"]))
+    writer.close()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["part-00000.parquet", "part-00001.parquet"]
+    table = pq.read_table(str(tmp_path))
+    assert table.num_rows == 5
+    assert table.column("path").to_pylist() == ["a.txt", "a.txt", "b.txt", "b.txt", "e.txt"]
+    assert table.column("text").to_pylist() == ["one", "two", "three", "four", "five"]
+    assert table.schema.field("confidence").type == "int32"
+
+    # A resumed run adds part files next to the existing ones
+    writer = ParquetWriter(str(tmp_path), rows_per_part=3)
+    writer.write(make_record("f.txt", ["six"]))
+    writer.close()
+    assert (tmp_path / "part-00002.parquet").exists()
@@ -0,0 +1,66 @@
+import io
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+from services.batch import expand_archive, FILE_FAILED
+from services.ingestion import SpooledUpload
+
+CONTENT = b"The system shall export reports as PDF."
+
+
+def make_archive(members: dict, compression: int = zipfile.ZIP_DEFLATED) -> SpooledUpload:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    upload = SpooledUpload("specs.zip")
+    upload.write(buffer.getvalue())
+    return upload
+
+
+def test_members_become_entries():
+    with make_archive({"a.txt": CONTENT, "docs/b.txt": CONTENT, "notes.md": b"x", "__MACOSX/._a.txt": b"x"}) as upload:
+        entries = expand_archive(upload)
+    assert [entry.filename for entry in entries] == ["specs.zip/a.txt", "specs.zip/docs/b.txt", "specs.zip/notes.md"]
+    assert entries[2].status == FILE_FAILED
+    for entry in entries[:2]:
+        assert entry.open().read() == CONTENT
+        entry.close()
+
+
+def test_file_count_is_checked_before_decompressing(monkeypatch):
+    monkeypatch.setattr("services.batch._read_member", lambda *args: pytest.fail("member was decompressed"))
+    with make_archive({f"{index}.txt": CONTENT for index in range(5)}) as upload:
+        with pytest.raises(HTTPException) as error:
+            expand_archive(upload, max_files=4)
+    assert error.value.status_code == 400
+
+
+def test_decompression_stops_at_the_byte_budget():
+    # Highly compressible members, like a zip bomb
+    members = {f"{index}.txt": b"a" * 1_000_000 for index in range(10)}
+    with make_archive(members) as upload:
+        assert upload.size < 100_000
+        with pytest.raises(HTTPException) as error:
+            expand_archive(upload, max_bytes=2_500_000)
+    assert error.value.status_code == 413
+
+
+def test_corrupt_member_fails_only_that_file():
+    with make_archive({"good.txt": CONTENT, "bad.txt": CONTENT * 50}) as upload:
+        data = bytearray(upload.open().read())
+    with zipfile.ZipFile(io.BytesIO(bytes(data))) as archive:
+        info = archive.getinfo("bad.txt")
+    # Garble the deflate stream of bad.txt, just past its local header
+    start = info.header_offset + 30 + len(info.filename) + len(info.extra)
+    data[start:start + 8] = b"\xff" * 8
+    corrupt = SpooledUpload("specs.zip")
+    corrupt.write(bytes(data))
+    with corrupt:
+        entries = expand_archive(corrupt)
+    assert entries[0].filename == "specs.zip/good.txt" and entries[0].open().read() == CONTENT
+    entries[0].close()
+    assert entries[1].status == FILE_FAILED
+    assert entries[1].error.startswith("Could not read file from archive")
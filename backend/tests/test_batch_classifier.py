@@ -0,0 +1,36 @@
+from benchmarks.bench_batch_classifier import build_unique_corpus, per_sentence
+from services.ml_pipeline import MLPipeline
+
+EDGE_CASES = [
+    "The system shall log in users",
+    "THE SYSTEM MUST ENCRYPT ALL DATA AT REST",
+    "Users can upload files up to 10 MB within 2 seconds",
+    "The interface should be user-friendly and fast",
+    "It will be reasonable, appropriate and adequate",
+    "Shall-not-be-parsed-as-a-modal sentence without spaces",
+    "This sentence has no modal verb at all",
+    "The user may optionally export reports; the system will retry on failure",
+    "Performance must be good, scalable and reliable for 500 concurrent users",
+    "",
+]
+
+
+def test_batch_matches_per_sentence_classification():
+    pipeline = MLPipeline(engine="heuristic")
+    corpus = build_unique_corpus(5000) + EDGE_CASES
+    assert pipeline.classify_batch(corpus) == per_sentence(pipeline, corpus)
+
+
+def test_batch_ids_continue_from_start_id():
+    pipeline = MLPipeline(engine="heuristic")
+    requirements = pipeline.classify_batch(EDGE_CASES, start_id=41)
+    assert [requirement.id for requirement in requirements] == [
+        f"REQ-{41 + index:03d}" for index in range(len(requirements))
+    ]
+    assert [requirement.model_copy(update={"id": None}) for requirement in requirements] == [
+        requirement.model_copy(update={"id": None}) for requirement in per_sentence(pipeline, EDGE_CASES)
+    ]
+
+
+def test_empty_batch():
+    assert MLPipeline(engine="heuristic").classify_batch([]) == []
@@ -0,0 +1,97 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+
+from models.schemas import Requirement
+from services.ai_analyzer import AIAnalyzer
+
+
+def make_requirements(count: int) -> list:
+    return [
+        Requirement(id=f"REQ-{index:03d}", text=f"The system shall export report {index} as PDF.",
+                    type="Functional", confidence=80, ambiguity="Low", suggestion="")
+        for index in range(count)
+    ]
+
+
+def make_analyzer() -> AIAnalyzer:
+    analyzer = AIAnalyzer()
+    analyzer.batch_prompts = True
+    return analyzer
+
+
+def answer(batch: list) -> dict:
+    return {req.id: {"ambiguity": "Low", "suggestion": f"Clarify {req.id}."} for req in batch}
+
+
+def run_batched(analyzer: AIAnalyzer, requirements: list, complete_batch) -> tuple:
+    singles = []
+
+    async def enhance_one(req):
+        singles.append(req.id)
+        return req.model_copy(update={"suggestion": "single"})
+
+    enhanced = asyncio.run(analyzer._enhance_batched(requirements, "openai", "model", complete_batch, enhance_one))
+    return enhanced, singles
+
+
+def test_unparseable_response_is_split_and_retried():
+    calls = []
+
+    async def complete_batch(batch):
+        calls.append(len(batch))
+        if len(batch) > 5:
+            raise json.JSONDecodeError("Expecting value", "", 0)
+        return answer(batch)
+
+    enhanced, singles = run_batched(make_analyzer(), make_requirements(20), complete_batch)
+    assert calls == [20, 10, 10, 5, 5, 5, 5]
+    assert singles == []
+    assert [req.suggestion for req in enhanced] == [f"Clarify REQ-{index:03d}." for index in range(20)]
+
+
+def test_transport_and_auth_errors_fail_the_batch_at_once():
+    for error in (httpx.ConnectTimeout("timed out"), PermissionError("401 Unauthorized")):
+        calls = []
+
+        async def complete_batch(batch):
+            calls.append(len(batch))
+            raise error
+
+        enhanced, singles = run_batched(make_analyzer(), make_requirements(20), complete_batch)
+        assert calls == [20]
+        assert singles == []
+        assert all(req.ambiguity == "Medium" and req.suggestion.startswith("OpenAI error:") for req in enhanced)
+
+
+def test_items_missing_from_a_response_are_retried_individually():
+    async def complete_batch(batch):
+        return answer(batch[1:])
+
+    enhanced, singles = run_batched(make_analyzer(), make_requirements(4), complete_batch)
+    assert singles == ["REQ-000"]
+    assert [req.suggestion for req in enhanced] == ["single", "Clarify REQ-001.", "Clarify REQ-002.", "Clarify REQ-003."]
+
+
+def test_each_requirement_is_looked_up_in_the_cache_once():
+    requirements = make_requirements(6)
+
+    async def create(**kwargs):
+        # Answer all but the first requirement of a batch; single prompts get a JSON object
+        prompt = kwargs["messages"][0]["content"]
+        if "JSON array" in prompt:
+            items = [json.loads(line) for line in prompt.splitlines() if line.startswith("{")]
+            content = json.dumps([{"id": item["id"], "ambiguity": "Low", "suggestion": "Batched."} for item in items[1:]])
+        else:
+            content = json.dumps({"ambiguous_terms": [], "ambiguity": "Low", "suggestion": "Single."})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    analyzer = make_analyzer()
+    analyzer._openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    analyzer._openai_api_key = "key"
+    enhanced = asyncio.run(analyzer._enhance_with_openai(requirements, "key"))
+    assert [req.suggestion for req in enhanced] == ["Single."] + ["Batched."] * 5
+    assert analyzer.cache.stats()["misses"] == len(requirements)
+    assert analyzer.usage["calls"] == 2
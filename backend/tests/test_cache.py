@@ -0,0 +1,61 @@
+import time
+
+from services.cache import EnhancementCache, LRUCache, SQLiteCache
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (3, 1)
+
+
+def test_lru_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_sqlite_cache_survives_reopening_and_expires(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path, ttl=10)
+    cache.set("a", {"ambiguity": "Low"})
+    cache.close()
+    reopened = SQLiteCache(path, ttl=10)
+    assert reopened.get("a") == {"ambiguity": "Low"}
+    monkeypatch.setattr(time, "time", lambda: 1e12)
+    assert reopened.get("a") is None
+    assert reopened.stats()["size"] == 0
+    reopened.close()
+
+
+def test_enhancement_cache_refills_memory_from_disk(tmp_path):
+    path = str(tmp_path / "cache.db")
+    key = EnhancementCache.make_key("The system shall log in.", "Functional", "openai", "gpt-4o", "1")
+    first = EnhancementCache(db_path=path)
+    first.set(key, {"ambiguity": "Low", "suggestion": "Add criteria."})
+    first.close()
+    second = EnhancementCache(db_path=path)
+    assert second.get(key) == {"ambiguity": "Low", "suggestion": "Add criteria."}
+    assert second.memory.get(key) is not None
+    assert second.stats()["hits"] == 2
+    second.close()
+
+
+def test_enhancement_keys_normalize_whitespace_and_case_only():
+    key = EnhancementCache.make_key("The system shall log in.", "Functional", "openai", "gpt-4o", "1")
+    assert EnhancementCache.make_key("  the SYSTEM  shall\nlog in. ", "Functional", "openai", "gpt-4o", "1") == key
+    assert EnhancementCache.make_key("The system shall log in.", "Non-Functional", "openai", "gpt-4o", "1") != key
+    assert EnhancementCache.make_key("The system shall log in.", "Functional", "openai", "gpt-4o", "2") != key
+    assert EnhancementCache.make_key("The system shall log out.", "Functional", "openai", "gpt-4o", "1") != key
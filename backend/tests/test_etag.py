@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+import pytest
+
+CONTENT = b"The system shall export reports as PDF. Users can reset their password by email."
+ORIGIN = "http://localhost:5173"
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setenv("HISTORY_DB", str(tmp_path / "history.db"))
+    monkeypatch.delenv("HF_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    import main
+    return TestClient(main.app)
+
+
+def analyze(client: TestClient, headers: dict):
+    return client.post("/api/analyze", files={"file": ("spec.txt", CONTENT, "text/plain")},
+                       headers=dict(headers, Origin=ORIGIN, **{"X-Client-Id": "etag-test"}))
+
+
+def test_cross_origin_clients_can_revalidate_with_the_etag(client):
+    first = analyze(client, {})
+    assert first.status_code == 200
+    assert "etag" in first.headers["access-control-expose-headers"].lower()
+    etag = first.headers["etag"]
+
+    second = analyze(client, {"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
@@ -0,0 +1,32 @@
+import asyncio
+
+from services.file_processor import FileProcessor, MIN_PAGES_PER_TASK
+from services.ingestion import SpooledUpload
+from tests.pdf_fixtures import build_pdf
+
+PAGES = [f"The system shall export report {index} as PDF." for index in range(2 * MIN_PAGES_PER_TASK + 3)]
+
+
+def extract(processor: FileProcessor, content: bytes, spool_bytes: int) -> str:
+    with SpooledUpload("spec.pdf", spool_bytes=spool_bytes) as upload:
+        upload.write(content)
+        try:
+            return asyncio.run(processor.extract_text(upload))
+        finally:
+            processor.shutdown()
+
+
+def test_small_and_pooled_pdf_extraction_agree():
+    content = build_pdf(PAGES)
+    threaded = extract(FileProcessor(), content, spool_bytes=len(content) + 1)
+    assert threaded.splitlines() == PAGES
+    pooled = FileProcessor(pdf_workers=2, pdf_pool_min_bytes=1)
+    assert extract(pooled, content, spool_bytes=len(content) + 1) == threaded
+    assert extract(FileProcessor(pdf_workers=2, pdf_pool_min_bytes=1), content, spool_bytes=1) == threaded
+
+
+def test_large_pdf_with_few_pages_is_parsed_on_a_thread():
+    content = build_pdf(PAGES[:3])
+    processor = FileProcessor(pdf_workers=2, pdf_pool_min_bytes=1)
+    assert extract(processor, content, spool_bytes=len(content) + 1).splitlines() == PAGES[:3]
+    assert processor.health()["pdf_pool"] == "idle"
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from models.schemas import AnalysisResponse
+from services.ai_analyzer import AIAnalyzer
+from services.analysis import AnalysisService, build_summary
+from services.file_processor import FileProcessor
+from services.history import HistoryStore
+from services.ingestion import SpooledUpload
+from services.ml_pipeline import MLPipeline
+
+CONTENT = b"The system shall export reports as PDF. Users can reset their password by email."
+
+
+def make_result(filename: str = "spec.txt", timestamp: str = None) -> AnalysisResponse:
+    return AnalysisResponse(
+        summary=build_summary([]),
+        requirements=[],
+        ambiguities=[],
+        filename=filename,
+        timestamp=timestamp or datetime.now().isoformat()
+    )
+
+
+def listed_ids(store: HistoryStore, client_id: str = None) -> list:
+    return [item["id"] for item in store.list_summaries(client_id=client_id)["items"]]
+
+
+def test_history_is_scoped_to_the_client(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    alice = store.record(make_result(), "hash-a", client_id="alice")
+    bob = store.record(make_result(), "hash-b", client_id="bob")
+    anonymous = store.record(make_result(), "hash-c")
+
+    assert listed_ids(store, "alice") == [alice]
+    assert listed_ids(store) == [anonymous]
+    assert store.get(bob, "alice") is None
+    assert store.get(bob, "bob") is not None
+    assert not store.delete(bob, "alice")
+
+    assert store.clear("alice") == 1
+    assert listed_ids(store, "alice") == []
+    assert listed_ids(store, "bob") == [bob]
+    assert listed_ids(store) == [anonymous]
+    store.close()
+
+
+def test_analyses_older_than_the_retention_are_purged(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), retention_days=30)
+    old = store.record(make_result(timestamp=(datetime.now() - timedelta(days=31)).isoformat()), "hash-old")
+    recent = store.record(make_result(), "hash-recent")
+    assert listed_ids(store) == [recent]
+    assert store.get(old) is None
+    assert store._conn.execute("SELECT COUNT(*) FROM analysis_results").fetchone()[0] == 1
+    store.close()
+
+
+def test_cache_hits_reuse_the_history_entry(monkeypatch, tmp_path):
+    monkeypatch.delenv("HF_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    store = HistoryStore(str(tmp_path / "history.db"))
+    service = AnalysisService(FileProcessor(), MLPipeline(), AIAnalyzer(), history=store)
+
+    def analyze(filename: str, client_id: str) -> AnalysisResponse:
+        with SpooledUpload(filename) as upload:
+            upload.write(CONTENT)
+            return asyncio.run(service.analyze(upload, client_id=client_id))
+
+    first = analyze("spec.txt", "alice")
+    assert analyze("spec.txt", "alice").history_id == first.history_id
+    assert analyze("spec.txt", "bob").history_id != first.history_id
+    assert analyze("renamed.txt", "alice").history_id != first.history_id
+    assert len(listed_ids(store, "alice")) == 2
+    store.close()
+
+
+def test_existing_databases_are_migrated(tmp_path):
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE analyses (id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT NOT NULL, "
+        "content_hash TEXT NOT NULL, timestamp TEXT NOT NULL, total INTEGER NOT NULL, functional INTEGER NOT NULL, "
+        "non_functional INTEGER NOT NULL, ambiguities INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO analyses (filename, content_hash, timestamp, total, functional, non_functional, ambiguities) "
+        "VALUES ('old.txt', 'hash', ?, 0, 0, 0, 0)", (datetime.now().isoformat(),)
+    )
+    conn.commit()
+    conn.close()
+
+    store = HistoryStore(path)
+    assert [item["filename"] for item in store.list_summaries()["items"]] == ["old.txt"]
+    store.record(make_result(), "hash", client_id="alice")
+    assert len(listed_ids(store, "alice")) == 1
+    store.close()
+
+
+def test_the_database_is_created_on_first_use(tmp_path):
+    path = tmp_path / "data" / "history.db"
+    subprocess.run([sys.executable, "-c", "import main"], check=True,
+                   env=dict(os.environ, HISTORY_DB=str(path)))
+    assert not path.exists()
+    store = HistoryStore(str(path))
+    assert not path.exists()
+    assert listed_ids(store, "alice") == []
+    assert path.exists()
+    store.close()
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setenv("HISTORY_DB", str(tmp_path / "history.db"))
+    monkeypatch.delenv("HF_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    import main
+    return main
+
+
+def test_history_requires_a_client_id(app):
+    client = TestClient(app.app)
+    analyzed = client.post("/api/analyze", files={"file": ("anonymous.txt", CONTENT, "text/plain")})
+    assert analyzed.status_code == 200
+    assert analyzed.json()["history_id"] is None
+    assert app.history_store.list_summaries(filename="anonymous.txt")["items"] == []
+    for method, url in [("GET", "/api/history"), ("GET", "/api/history/1"),
+                        ("DELETE", "/api/history/1"), ("DELETE", "/api/history")]:
+        response = client.request(method, url)
+        assert response.status_code == 400, url
+        assert response.json()["detail"] == "X-Client-Id header is required for history"
+    revision = client.post("/api/analyze/revision", data={"previous_id": "1"},
+                           files={"file": ("spec.txt", CONTENT, "text/plain")})
+    assert revision.status_code == 400
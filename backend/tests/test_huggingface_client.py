@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from models.schemas import Requirement
+from services.ai_analyzer import AIAnalyzer, HF_API_URL, HF_AUTH_STATUSES, HF_MODEL_IDS
+
+
+def make_requirements(start: int, count: int) -> list:
+    return [
+        Requirement(id=f"REQ-{index:03d}", text=f"The system shall export report {index} as PDF.",
+                    type="Functional", confidence=80, ambiguity="Low", suggestion="")
+        for index in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    """Route the analyzer's HTTP clients through a MockTransport, recording clients and requested URLs."""
+    monkeypatch.delenv("ENHANCEMENT_CACHE_DB", raising=False)
+    monkeypatch.delenv("AI_BATCH_PROMPTS", raising=False)
+    state = {"status": 200, "clients": [], "urls": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["urls"].append(str(request.url))
+        if state["status"] != 200:
+            return httpx.Response(state["status"], json={"error": "rejected"})
+        answer = {"ambiguity": "Low", "suggestion": "Add acceptance criteria.", "ambiguous_terms": []}
+        return httpx.Response(200, json=[{"generated_text": json.dumps(answer)}])
+
+    real_client = httpx.AsyncClient
+
+    class MockClient(real_client):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+            state["clients"].append(self)
+
+    monkeypatch.setattr(httpx, "AsyncClient", MockClient)
+    return state
+
+
+def test_one_pooled_client_serves_every_request(mock_http):
+    analyzer = AIAnalyzer()
+
+    async def run():
+        first = await analyzer._enhance_with_huggingface(make_requirements(0, 3), "key")
+        second = await analyzer._enhance_with_huggingface(make_requirements(3, 3), "key")
+        await analyzer.aclose()
+        return first + second
+
+    enhanced = asyncio.run(run())
+    assert [req.suggestion for req in enhanced] == ["Add acceptance criteria."] * 6
+    assert len(mock_http["urls"]) == 6
+    assert len(mock_http["clients"]) == 1
+    assert mock_http["clients"][0].is_closed
+    assert analyzer._http_client is None
+
+
+@pytest.mark.parametrize("status", HF_AUTH_STATUSES)
+def test_auth_failures_are_not_retried_on_other_models(mock_http, status):
+    mock_http["status"] = status
+    enhanced = asyncio.run(AIAnalyzer()._enhance_with_huggingface(make_requirements(0, 1), "bad-key"))
+    assert mock_http["urls"] == [f"{HF_API_URL}/{HF_MODEL_IDS[0]}"]
+    assert enhanced[0].suggestion.startswith("Hugging Face error")
+
+
+def test_other_failures_fall_back_to_the_next_model(mock_http):
+    mock_http["status"] = 503
+    asyncio.run(AIAnalyzer()._enhance_with_huggingface(make_requirements(0, 1), "key"))
+    assert mock_http["urls"] == [f"{HF_API_URL}/{model_id}" for model_id in HF_MODEL_IDS]
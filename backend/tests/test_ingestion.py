@@ -0,0 +1,56 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from services.analysis import extract_in_worker
+from services.ingestion import SpooledUpload, ingest_upload
+
+CONTENT = b"The system shall export reports as PDF.\n" * 100
+
+
+def ingest(content: bytes, **kwargs):
+    return asyncio.run(ingest_upload(UploadFile(io.BytesIO(content), filename="spec.txt"), chunk_size=256, **kwargs))
+
+
+def test_small_uploads_stay_in_memory():
+    with ingest(CONTENT, spool_bytes=len(CONTENT)) as upload:
+        assert upload.path is None
+        assert upload.size == len(CONTENT)
+        assert upload.sha256 == hashlib.sha256(CONTENT).hexdigest()
+        assert upload.open().read() == CONTENT
+
+
+def test_large_uploads_spill_to_a_temporary_file():
+    with ingest(CONTENT, spool_bytes=1000) as upload:
+        assert upload.open().read() == CONTENT
+        path = upload.path
+        assert path is not None
+        with open(path, "rb") as handle:
+            assert handle.read() == CONTENT
+    assert not os.path.exists(path)
+
+
+def test_spilled_uploads_are_read_in_place_by_path():
+    with ingest(CONTENT, spool_bytes=1000) as spilled:
+        spilled.open()  # flushes, as AnalysisService does before handing the path to a worker
+        with SpooledUpload.from_path("spec.txt", spilled.path) as upload:
+            assert upload.path == spilled.path
+            assert upload.size == len(CONTENT)
+            assert upload.open().read() == CONTENT
+        # Only the owner deletes the file
+        assert os.path.exists(spilled.path)
+        by_path, _ = extract_in_worker(spilled.path, "spec.txt")
+        assert os.path.exists(spilled.path)
+    by_content, _ = extract_in_worker(CONTENT, "spec.txt")
+    assert by_path == by_content
+    assert len(by_path) == 100
+
+
+def test_size_limit_is_enforced_while_streaming():
+    with pytest.raises(HTTPException) as error:
+        ingest(CONTENT, max_bytes=len(CONTENT) - 1)
+    assert error.value.status_code == 400
@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from services.ai_analyzer import AIAnalyzer
+from services.analysis import AnalysisService
+from services.file_processor import FileProcessor
+from services.ingestion import SpooledUpload
+from services.jobs import JOB_FAILED, JOB_SUCCEEDED, JobQueue, JobStore
+from services.ml_pipeline import MLPipeline
+
+CONTENT = b"The system shall export reports as PDF. Users can reset their password by email."
+
+
+def make_upload(filename: str = "spec.txt") -> SpooledUpload:
+    upload = SpooledUpload(filename)
+    upload.write(CONTENT)
+    return upload
+
+
+def test_jobs_run_in_worker_processes(monkeypatch):
+    monkeypatch.delenv("HF_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    service = AnalysisService(FileProcessor(), MLPipeline(), AIAnalyzer())
+    queue = JobQueue(service, workers=1)
+
+    async def run():
+        queue.start()
+        job = queue.submit(make_upload())
+        while queue.get(job["job_id"])["status"] not in (JOB_SUCCEEDED, JOB_FAILED):
+            await asyncio.sleep(0.01)
+        assert queue._executor is not None
+        await queue.stop()
+        return queue.get(job["job_id"])
+
+    job = asyncio.run(run())
+    assert job["status"] == JOB_SUCCEEDED
+    assert job["progress"] == 1.0
+    assert [requirement["text"] for requirement in job["result"]["requirements"]] == [
+        "The system shall export reports as PDF", "Users can reset their password by email",
+    ]
+
+
+def test_finished_jobs_are_purged_after_retention():
+    store = JobStore()
+    for job_id, status in (("old-done", JOB_SUCCEEDED), ("old-failed", JOB_FAILED), ("old-running", "running")):
+        store.create(job_id, "spec.txt")
+        store.update(job_id, status=status)
+    store._conn.execute("UPDATE jobs SET updated_at = ?", ((datetime.now() - timedelta(hours=2)).isoformat(),))
+    store.create("recent", "spec.txt")
+    store.update("recent", status=JOB_SUCCEEDED)
+
+    assert store.purge(3600) == 2
+    assert store.get("old-done") is None and store.get("old-failed") is None
+    assert store.get("old-running") is not None
+    assert store.get("recent") is not None
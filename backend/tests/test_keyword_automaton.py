@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+from services.keyword_automaton import (
+    AMBIGUOUS, AMBIGUOUS_TERM, FUNCTIONAL, NON_FUNCTIONAL, KeywordAutomaton, get_keyword_automaton
+)
+from services.keywords import AMBIGUOUS_KEYWORDS, AMBIGUOUS_TERMS, FUNCTIONAL_KEYWORDS, NON_FUNCTIONAL_KEYWORDS
+
+TABLES = {
+    FUNCTIONAL: FUNCTIONAL_KEYWORDS,
+    NON_FUNCTIONAL: NON_FUNCTIONAL_KEYWORDS,
+    AMBIGUOUS: AMBIGUOUS_KEYWORDS,
+    AMBIGUOUS_TERM: [term.lower() for term in AMBIGUOUS_TERMS],
+}
+SENTENCES = [
+    "the system shall respond fast",
+    # Overlapping keywords: "system shall" / "shall", "near real-time" / "real-time", "users can" / "can"
+    "users can view near real-time load in the system shall",
+    # Keywords inside other words match like a substring check: breakfast, download, unsafe, cannot, goods
+    "breakfast downloads are unsafe and cannot ship goods",
+    "an easy to use, user-friendly and robust portal with the best, better and good defaults",
+    "secure secure secure",
+    "",
+    "no keywords here",
+]
+
+
+def substring_matches(text: str, keywords) -> list:
+    """The per-keyword ``keyword in text`` check the automaton replaces."""
+    return [keyword for keyword in dict.fromkeys(keywords) if keyword in text]
+
+
+@pytest.mark.parametrize("text", SENTENCES)
+def test_hits_and_counts_match_substring_checks(text):
+    hits = get_keyword_automaton().scan(text)
+    for category, keywords in TABLES.items():
+        assert hits.matched(category) == substring_matches(text, keywords), category
+        assert hits.count(category) == len(substring_matches(text, keywords)), category
+
+
+def test_hits_report_every_overlapping_occurrence():
+    automaton = KeywordAutomaton({"words": ["he", "she", "his", "hers"]})
+    hits = automaton.scan("ushers")
+    assert sorted((hit.keyword, hit.start) for hit in hits.hits) == [("he", 2), ("hers", 2), ("she", 1)]
+    assert hits.matched("words") == ["he", "she", "hers"]
+
+
+def test_importing_the_automaton_first_has_no_cycle():
+    code = ("import services.keyword_automaton as k; k.get_keyword_automaton(); "
+            "import sys; assert 'services.ml_pipeline' not in sys.modules; "
+            "assert 'services.ai_analyzer' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,103 @@
+import asyncio
+import sys
+
+import numpy as np
+import pytest
+
+import train_local_model
+from benchmarks.bench_batch_classifier import build_unique_corpus
+from services.local_model import AMBIGUITY_CLASSES, TYPE_CLASSES, LocalModel
+from services.metrics import SERVICE_DEGRADED
+from services.ml_pipeline import HEURISTIC_ENGINE, LOCAL_ENGINE, MLPipeline
+
+FEATURE_BITS = 12
+EPOCHS = 50
+
+
+def labeled_examples(count: int = 300) -> list:
+    """Corpus sentences labeled by the heuristics, as train_local_model does for .txt inputs."""
+    pipeline = MLPipeline(engine=HEURISTIC_ENGINE)
+    examples = []
+    for sentence in build_unique_corpus(count):
+        requirement = pipeline._extract_requirement(sentence, 1)
+        example = {"text": sentence, "is_requirement": requirement is not None}
+        if requirement is not None:
+            example.update(type=requirement.type, ambiguity=requirement.ambiguity)
+        examples.append(example)
+    return examples
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("model") / "local_model.npz")
+    LocalModel.train(labeled_examples(), FEATURE_BITS, EPOCHS).save(path)
+    return path
+
+
+def test_saved_model_predicts_like_the_trained_one(tmp_path):
+    examples = labeled_examples()
+    model = LocalModel.train(examples, FEATURE_BITS, EPOCHS)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = LocalModel.load(path)
+
+    texts = [example["text"] for example in examples[:50]]
+    expected, actual = model.predict(texts), loaded.predict(texts)
+    np.testing.assert_allclose(actual.requirement_probability, expected.requirement_probability, rtol=1e-6)
+    assert actual.types == expected.types
+    assert actual.ambiguity == expected.ambiguity
+    detected = expected.requirement_probability >= 0.5
+    assert np.mean(detected == np.array([example["is_requirement"] for example in examples[:50]])) > 0.8
+
+
+def test_local_engine_classifies_documents(model_path):
+    pipeline = MLPipeline(engine=LOCAL_ENGINE, model_path=model_path)
+    assert pipeline.engine == LOCAL_ENGINE
+    text = ". ".join(build_unique_corpus(40)) + "."
+    requirements = asyncio.run(pipeline.extract_requirements(text))
+    assert requirements
+    assert [requirement.id for requirement in requirements] == [
+        f"REQ-{index:03d}" for index in range(1, len(requirements) + 1)
+    ]
+    for requirement in requirements:
+        assert requirement.text == requirement.text.strip() and requirement.text
+        assert requirement.type in TYPE_CLASSES
+        assert requirement.ambiguity in AMBIGUITY_CLASSES
+        assert 50 <= requirement.confidence <= 100
+        assert requirement.suggestion
+
+
+@pytest.mark.parametrize("path", [None, "missing_model.npz"])
+def test_local_engine_falls_back_to_heuristics(monkeypatch, path):
+    monkeypatch.setenv("ML_ENGINE", LOCAL_ENGINE)
+    if path is None:
+        monkeypatch.delenv("LOCAL_MODEL_PATH", raising=False)
+    else:
+        monkeypatch.setenv("LOCAL_MODEL_PATH", path)
+    pipeline = MLPipeline()
+    assert pipeline.engine == HEURISTIC_ENGINE
+    assert pipeline.local_model is None
+    assert pipeline.health()["status"] == SERVICE_DEGRADED
+    requirements = asyncio.run(pipeline.extract_requirements("The system shall export reports as PDF."))
+    assert [requirement.text for requirement in requirements] == ["The system shall export reports as PDF"]
+
+
+def test_training_needs_two_classes_per_head():
+    with pytest.raises(ValueError, match="No training examples"):
+        LocalModel.train([], FEATURE_BITS, EPOCHS)
+    requirements_only = [example for example in labeled_examples() if example["is_requirement"]]
+    with pytest.raises(ValueError, match="all Requirement"):
+        LocalModel.train(requirements_only, FEATURE_BITS, EPOCHS)
+    no_requirements = [example for example in labeled_examples() if not example["is_requirement"]]
+    with pytest.raises(ValueError, match="all Other"):
+        LocalModel.train(no_requirements, FEATURE_BITS, EPOCHS)
+
+
+def test_training_cli_writes_a_loadable_model(monkeypatch, tmp_path):
+    document = tmp_path / "spec.txt"
+    document.write_text(". ".join(build_unique_corpus(200)) + ".", encoding="utf-8")
+    output = tmp_path / "model.npz"
+    monkeypatch.setattr(sys, "argv", ["train_local_model.py", str(document), "--output", str(output),
+                                      "--feature-bits", str(FEATURE_BITS), "--epochs", str(EPOCHS)])
+    train_local_model.main()
+    assert LocalModel.load(str(output)).feature_bits == FEATURE_BITS
@@ -0,0 +1,40 @@
+import asyncio
+
+from services import metrics
+from services.ai_analyzer import AIAnalyzer
+from services.metrics import ENHANCEMENT_SECONDS
+from services.ml_pipeline import MLPipeline
+
+TEXT = "The system shall export reports as PDF. Users can reset their password by email. The system must respond quickly."
+
+
+def enhancement_samples() -> int:
+    return sum(ENHANCEMENT_SECONDS.labels("local").counts)
+
+
+def test_untyped_metrics_hold_a_value():
+    metric = metrics.Metric("test_untyped", "Untyped test metric", ("name",))
+    metric.labels("a").inc(2)
+    metric.labels("a").dec()
+    assert metric.collect()[-1] == 'test_untyped{name="a"} 1'
+
+
+def test_enhancement_time_is_recorded_once_per_document(monkeypatch):
+    monkeypatch.delenv("HF_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    pipeline, analyzer = MLPipeline(), AIAnalyzer()
+
+    async def text():
+        yield TEXT
+
+    async def run():
+        before = enhancement_samples()
+        await analyzer.enhance_requirements(await pipeline.extract_requirements(text()))
+        after_document = enhancement_samples()
+        streamed = [requirement async for requirement in
+                    analyzer.stream_enhanced_requirements(pipeline.stream_requirements(text()))]
+        return after_document - before, enhancement_samples() - after_document, len(streamed)
+
+    document_samples, stream_samples, streamed = asyncio.run(run())
+    assert streamed == 3
+    assert (document_samples, stream_samples) == (1, 1)
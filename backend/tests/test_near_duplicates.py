@@ -0,0 +1,48 @@
+from models.schemas import Requirement
+from services.near_duplicates import NearDuplicateDetector
+
+PASSWORDS = "The authentication service shall {}store user passwords in plaintext within the primary customer database cluster"
+REPORT = ("The reporting service shall generate a detailed monthly usage summary for every tenant account "
+          "and deliver it by email to all registered administrators before the fifth business day")
+
+
+def test_restated_requirements_share_a_cluster():
+    texts = [
+        "Users can export reports as PDF documents from the dashboard",
+        "The system shall respond within two seconds",
+        "users can export  reports as PDF documents from the dashboard.",
+    ]
+    assert NearDuplicateDetector().cluster(texts) == [0, 1, 0]
+
+
+def test_negations_and_numbers_stay_apart():
+    texts = [PASSWORDS.format(""), PASSWORDS.format("not "), PASSWORDS.format("never "), PASSWORDS.format("not ")]
+    assert NearDuplicateDetector().cluster(texts) == [0, 1, 2, 1]
+    texts = ["The system shall respond within 2 seconds under load", "The system shall respond within 20 seconds under load"]
+    assert NearDuplicateDetector().cluster(texts) == [0, 1]
+
+
+def test_members_are_similar_to_the_representative_itself():
+    # Each restatement is similar to the previous one, but the last is not similar to the first
+    restated = REPORT.replace("detailed monthly usage summary", "detailed monthly usage report")
+    texts = [REPORT, restated, restated.replace("fifth business day", "fifth working day")]
+    assert NearDuplicateDetector().cluster(texts) == [0, 0, 2]
+
+
+def test_groups_stay_apart():
+    texts = ["Users can export reports as PDF documents"] * 2
+    assert NearDuplicateDetector().cluster(texts, ["Functional", "Non-Functional"]) == [0, 1]
+
+
+def test_assign_clusters_names_clusters_after_their_first_requirement():
+    requirements = [
+        Requirement(id=f"REQ-{index:03d}", text=text, type="Functional", confidence=90, ambiguity="Low", suggestion="")
+        for index, text in enumerate([
+            "Users can export reports as PDF documents from the dashboard",
+            "The system shall respond within two seconds",
+            "Users can export reports as PDF documents from the dashboard.",
+        ], 1)
+    ]
+    clustered = NearDuplicateDetector().assign_clusters(requirements)
+    assert [requirement.cluster_id for requirement in clustered] == ["REQ-001", None, "REQ-001"]
+    assert NearDuplicateDetector().cluster([]) == []
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+from models.schemas import Requirement
+from services.ai_analyzer import AIAnalyzer
+
+REQUIREMENT_COUNT = 12
+MAX_CONCURRENCY = 4
+
+
+class FakeOpenAI:
+    """Answers each chat completion with the report number in its prompt, later requirements finishing first."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, max_tokens, temperature):
+        number = int(re.search(r"export report (\d+)", messages[0]["content"]).group(1))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001 * (REQUIREMENT_COUNT - number))
+        self.in_flight -= 1
+        self.completed.append(number)
+        content = json.dumps({"ambiguity": "Low", "suggestion": f"Clarify report {number}.", "ambiguous_terms": []})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_concurrent_fan_out_keeps_input_order(monkeypatch):
+    monkeypatch.delenv("ENHANCEMENT_CACHE_DB", raising=False)
+    monkeypatch.delenv("AI_BATCH_PROMPTS", raising=False)
+    analyzer = AIAnalyzer(max_concurrency=MAX_CONCURRENCY)
+    client = FakeOpenAI()
+    analyzer._openai_client, analyzer._openai_api_key = client, "key"
+    requirements = [
+        Requirement(id=f"REQ-{index:03d}", text=f"The system shall export report {index} as PDF.",
+                    type="Functional", confidence=80, ambiguity="Low", suggestion="")
+        for index in range(REQUIREMENT_COUNT)
+    ]
+
+    enhanced = asyncio.run(analyzer._enhance_with_openai(requirements, "key"))
+    assert [req.id for req in enhanced] == [req.id for req in requirements]
+    assert [req.suggestion for req in enhanced] == [f"Clarify report {index}." for index in range(REQUIREMENT_COUNT)]
+    # Requests overlapped (so they finished out of order) without exceeding the limit
+    assert client.completed != sorted(client.completed)
+    assert client.max_in_flight == MAX_CONCURRENCY
@@ -0,0 +1,50 @@
+import asyncio
+
+from services.ai_analyzer import AIAnalyzer
+from services.analysis import AnalysisService
+from services.file_processor import FileProcessor
+from services.ingestion import SpooledUpload
+from services.ml_pipeline import MLPipeline
+
+CONTENT = b"The system shall export reports as PDF. The system must respond quickly."
+
+
+def make_upload(filename: str) -> SpooledUpload:
+    upload = SpooledUpload(filename)
+    upload.write(CONTENT)
+    return upload
+
+
+def make_service() -> AnalysisService:
+    return AnalysisService(FileProcessor(), MLPipeline(), AIAnalyzer())
+
+
+def test_identical_content_is_served_from_the_cache(monkeypatch):
+    monkeypatch.delenv("HF_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    service = make_service()
+    with make_upload("spec.txt") as first, make_upload("copy.txt") as second:
+        result = asyncio.run(service.analyze(first))
+        cached = service.cached_result(second)
+    assert cached is not None
+    assert cached.filename == "copy.txt"
+    assert cached.requirements == result.requirements
+
+
+def test_key_covers_file_type_and_configuration(monkeypatch):
+    monkeypatch.delenv("HF_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    service = make_service()
+    with make_upload("spec.txt") as txt, make_upload("spec.pdf") as pdf, make_upload("renamed.txt") as renamed:
+        key = service.result_key(txt)
+        assert service.result_key(renamed) == key
+        assert service.result_key(pdf) != key
+        service.ai_analyzer.route_min_confidence += 1
+        assert service.result_key(txt) != key
+        service.ai_analyzer.route_min_confidence -= 1
+        monkeypatch.setenv("HF_API_KEY", "key")
+        assert service.result_key(txt) != key
+        monkeypatch.delenv("HF_API_KEY")
+        monkeypatch.setenv("DEDUP_ENABLED", "false")
+        service.ml_pipeline = MLPipeline()
+        assert service.result_key(txt) != key
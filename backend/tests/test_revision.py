@@ -0,0 +1,55 @@
+from services.revision import align_requirements
+
+PREVIOUS = [
+    "The system shall log in users with email and password.",
+    "The system shall export reports as PDF.",
+    "Users can reset their password by email.",
+    "The system must encrypt all data at rest.",
+    "Admins may delete inactive accounts.",
+]
+
+
+def test_identical_revisions_are_unchanged():
+    alignment = align_requirements(PREVIOUS, list(PREVIOUS))
+    assert alignment.unchanged == [(index, index) for index in range(len(PREVIOUS))]
+    assert (alignment.modified, alignment.added, alignment.removed) == ([], [], [])
+
+
+def test_whitespace_and_case_changes_are_unchanged():
+    current = [" ".join(text.upper().split()) + "  " for text in PREVIOUS]
+    assert align_requirements(PREVIOUS, current).unchanged == [(index, index) for index in range(len(PREVIOUS))]
+
+
+def test_moved_requirements_are_unchanged():
+    current = [PREVIOUS[3], PREVIOUS[0], PREVIOUS[1], PREVIOUS[2], PREVIOUS[4]]
+    alignment = align_requirements(PREVIOUS, current)
+    assert sorted(alignment.unchanged) == sorted([(3, 0), (0, 1), (1, 2), (2, 3), (4, 4)])
+    assert (alignment.modified, alignment.added, alignment.removed) == ([], [], [])
+
+
+def test_edits_additions_and_removals():
+    current = [
+        PREVIOUS[0],
+        "The system shall export reports as PDF and CSV.",
+        PREVIOUS[2],
+        "Operators can schedule nightly backups to S3.",
+        PREVIOUS[4],
+    ]
+    alignment = align_requirements(PREVIOUS, current)
+    assert alignment.unchanged == [(0, 0), (2, 2), (4, 4)]
+    assert [(previous, current) for previous, current, _ in alignment.modified] == [(1, 1)]
+    assert 0.6 <= alignment.modified[0][2] < 1
+    assert alignment.added == [3]
+    assert alignment.removed == [3]
+
+
+def test_duplicates_are_matched_one_to_one():
+    previous = [PREVIOUS[0], PREVIOUS[0]]
+    alignment = align_requirements(previous, [PREVIOUS[0]])
+    assert alignment.unchanged == [(0, 0)]
+    assert alignment.removed == [1]
+
+
+def test_empty_revisions():
+    assert align_requirements([], PREVIOUS).added == list(range(len(PREVIOUS)))
+    assert align_requirements(PREVIOUS, []).removed == list(range(len(PREVIOUS)))
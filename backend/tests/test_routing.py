@@ -0,0 +1,92 @@
+import asyncio
+
+from models.schemas import Requirement
+from services.ai_analyzer import AIAnalyzer
+
+
+def make_requirement(id: str, text: str, confidence: int = 70, cluster_id: str = None) -> Requirement:
+    return Requirement(id=id, text=text, type="Functional", confidence=confidence,
+                       ambiguity="Low", suggestion="", cluster_id=cluster_id)
+
+
+def make_analyzer(monkeypatch) -> tuple:
+    """An analyzer whose OpenAI provider answers each requirement with its own ID, recording what was sent."""
+    monkeypatch.delenv("AI_ROUTE_MIN_CONFIDENCE", raising=False)
+    analyzer = AIAnalyzer()
+    sent = []
+
+    async def fake_openai(requirements, api_key):
+        sent.extend(requirement.id for requirement in requirements)
+        return [requirement.model_copy(update={"ambiguity": "Medium", "suggestion": f"Remote {requirement.id}"})
+                for requirement in requirements]
+
+    analyzer._enhance_with_openai = fake_openai
+    return analyzer, sent
+
+
+def enhance(analyzer: AIAnalyzer, requirements: list) -> list:
+    return asyncio.run(analyzer._enhance_with_provider(requirements, "openai", "key"))
+
+
+def test_cluster_result_is_fanned_out_from_a_remote_root(monkeypatch):
+    analyzer, sent = make_analyzer(monkeypatch)
+    requirements = [
+        make_requirement("REQ-001", "Users can export reports as PDF documents", cluster_id="REQ-001"),
+        make_requirement("REQ-002", "Users can export reports as PDF documents.", cluster_id="REQ-001"),
+    ]
+    enhanced = enhance(analyzer, requirements)
+    assert sent == ["REQ-001"]
+    assert [requirement.suggestion for requirement in enhanced] == ["Remote REQ-001", "Remote REQ-001"]
+    assert analyzer.routes == {"local": 0, "remote": 2, "clustered": 1}
+
+
+def test_members_of_a_locally_resolved_root_are_sent_on_their_own(monkeypatch):
+    analyzer, sent = make_analyzer(monkeypatch)
+    requirements = [
+        make_requirement("REQ-001", "Users can export reports as PDF documents", confidence=95, cluster_id="REQ-001"),
+        make_requirement("REQ-002", "Users can export reports as PDF documents.", cluster_id="REQ-001"),
+        make_requirement("REQ-003", "users can export reports as PDF documents", cluster_id="REQ-001"),
+    ]
+    enhanced = enhance(analyzer, requirements)
+    assert sent == ["REQ-002", "REQ-003"]
+    assert not enhanced[0].suggestion.startswith("Remote")
+    assert [requirement.suggestion for requirement in enhanced[1:]] == ["Remote REQ-002", "Remote REQ-003"]
+    assert analyzer.routes == {"local": 1, "remote": 2, "clustered": 0}
+
+
+def test_clear_cut_requirements_stay_local(monkeypatch):
+    analyzer, sent = make_analyzer(monkeypatch)
+    requirements = [
+        make_requirement("REQ-001", "The system shall export reports as PDF", confidence=95),
+        make_requirement("REQ-002", "The system shall export reports as CSV", confidence=70),
+        make_requirement("REQ-003", "The system shall be fast", confidence=95),
+        make_requirement("REQ-004", "The system shall export reports as XML", confidence=95).model_copy(
+            update={"ambiguity": "Medium"}),
+    ]
+    enhanced = enhance(analyzer, requirements)
+    # Low confidence, an ambiguous term and a non-Low ambiguity each send a requirement remote
+    assert sent == ["REQ-002", "REQ-003", "REQ-004"]
+    assert not enhanced[0].suggestion.startswith("Remote")
+    assert analyzer.routes == {"local": 1, "remote": 3, "clustered": 0}
+
+
+def test_route_threshold_comes_from_the_environment(monkeypatch):
+    requirements = [make_requirement(f"REQ-00{index}", f"The system shall export report {index} as PDF",
+                                     confidence=confidence)
+                    for index, confidence in enumerate((60, 80, 100), 1)]
+    for threshold, expected in (("80", ["REQ-001"]), ("101", ["REQ-001", "REQ-002", "REQ-003"]), ("0", [])):
+        analyzer, sent = make_analyzer(monkeypatch)
+        monkeypatch.setenv("AI_ROUTE_MIN_CONFIDENCE", threshold)
+        analyzer.route_min_confidence = AIAnalyzer().route_min_confidence
+        enhance(analyzer, requirements)
+        assert sent == expected, threshold
+        assert analyzer.routes["remote"] == len(expected)
+        assert analyzer.routes["local"] == 3 - len(expected)
+
+
+def test_local_provider_routes_everything_locally(monkeypatch):
+    analyzer, sent = make_analyzer(monkeypatch)
+    requirements = [make_requirement("REQ-001", "The system shall be fast", confidence=60)]
+    asyncio.run(analyzer._enhance_with_provider(requirements, "local", None))
+    assert sent == []
+    assert analyzer.routes == {"local": 1, "remote": 0, "clustered": 0}
@@ -0,0 +1,62 @@
+import asyncio
+
+from services.file_processor import FileProcessor
+from services.ml_pipeline import MLPipeline
+from services.segmenter import iter_segments
+
+
+def segments(text: str, final: bool = True) -> list:
+    return [text[start:end] for start, end in iter_segments(text, final)]
+
+
+def test_splits_on_terminators_followed_by_whitespace():
+    assert segments("The system shall log in users. Users must reset passwords! Is it fast?") == [
+        "The system shall log in users", "Users must reset passwords", "Is it fast",
+    ]
+
+
+def test_keeps_decimals_versions_and_abbreviations():
+    text = "The app shall support Chrome 90.1, e.g. on desktop. Exports go to the U.S. office within 2.5 seconds."
+    assert segments(text) == [
+        "The app shall support Chrome 90.1, e.g. on desktop",
+        "Exports go to the U.S. office within 2.5 seconds",
+    ]
+
+
+def test_strips_list_markers_and_requirement_ids():
+    text = "1. The system shall log in users.\n2) Users can export reports.\n(a) Admins may delete accounts.\nREQ-12: Logs shall be kept."
+    assert segments(text) == [
+        "The system shall log in users", "Users can export reports", "Admins may delete accounts", "Logs shall be kept",
+    ]
+
+
+def test_keeps_identifier_like_content_at_sentence_start():
+    text = "AES-256 encryption shall be used for data at rest. SHA-256 hashes shall sign releases.\nISO-9001 audits must pass."
+    assert segments(text) == [
+        "AES-256 encryption shall be used for data at rest",
+        "SHA-256 hashes shall sign releases",
+        "ISO-9001 audits must pass",
+    ]
+    requirements = asyncio.run(MLPipeline().extract_requirements(text))
+    assert requirements[0].text.startswith("AES-256 encryption")
+
+
+def test_line_breaks():
+    text = "The system shall send\nan email.\nThe user must confirm,\nAnd then log in.\n\nlowercase after a blank line"
+    assert segments(text) == [
+        "The system shall send\nan email",
+        "The user must confirm,\nAnd then log in",
+        "lowercase after a blank line",
+    ]
+
+
+def test_holds_back_boundaries_until_final():
+    text = "The system shall log in users. Users must"
+    assert segments(text, final=False) == ["The system shall log in users"]
+    assert segments("The system shall log in users.", final=False) == []
+
+
+def test_extract_sentences_drops_short_fragments():
+    assert FileProcessor().extract_sentences("Short one. The system shall export reports as PDF.") == [
+        "The system shall export reports as PDF",
+    ]
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+from services.ai_analyzer import AIAnalyzer, ENHANCEMENT_SUGGESTIONS
+
+TEXTS = [f"The system shall export report {index} as PDF within {index} seconds" for index in range(50)]
+OPTIONS = ENHANCEMENT_SUGGESTIONS["Functional"]
+
+CHILD = """
+import json
+from services.ai_analyzer import AIAnalyzer, ENHANCEMENT_SUGGESTIONS
+texts = [f"The system shall export report {index} as PDF within {index} seconds" for index in range(50)]
+analyzer = AIAnalyzer()
+print(json.dumps([analyzer._stable_choice(ENHANCEMENT_SUGGESTIONS["Functional"], text, "Functional") for text in texts]))
+"""
+
+
+def choices(analyzer: AIAnalyzer) -> list:
+    return [analyzer._stable_choice(OPTIONS, text, "Functional") for text in TEXTS]
+
+
+def test_choice_is_the_same_across_runs_and_processes(monkeypatch):
+    monkeypatch.delenv("SUGGESTION_SEED", raising=False)
+    expected = choices(AIAnalyzer())
+    assert choices(AIAnalyzer()) == expected
+    # Spread over the options rather than pinned to one
+    assert len(set(expected)) > 1
+    # str hashing is salted per process; the choice must not depend on it
+    for hash_seed in ("1", "2"):
+        env = {key: value for key, value in os.environ.items() if key != "SUGGESTION_SEED"}
+        output = subprocess.run([sys.executable, "-c", CHILD], check=True, capture_output=True, text=True,
+                                env=dict(env, PYTHONHASHSEED=hash_seed)).stdout
+        assert json.loads(output) == expected
+
+
+def test_seed_and_slot_change_the_choice(monkeypatch):
+    monkeypatch.delenv("SUGGESTION_SEED", raising=False)
+    unseeded = choices(AIAnalyzer())
+    monkeypatch.setenv("SUGGESTION_SEED", "tenant-a")
+    seeded = AIAnalyzer()
+    assert choices(seeded) != unseeded
+    assert choices(seeded) == choices(AIAnalyzer())
+    assert [seeded._stable_choice(OPTIONS, text, "general") for text in TEXTS] != choices(seeded)
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+CONTENT = b"The system shall export reports as PDF. Users can reset their password by email."
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setenv("HISTORY_DB", str(tmp_path / "history.db"))
+    monkeypatch.delenv("HF_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    import main
+    return main
+
+
+def post_stream(app, headers: dict = None):
+    return TestClient(app.app).post("/api/analyze/stream", files={"file": ("spec.txt", CONTENT, "text/plain")},
+                                    headers=headers or {})
+
+
+def test_ndjson_frames_end_with_the_summary(app):
+    response = post_stream(app, {"X-Client-Id": "stream-test"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    frames = [json.loads(line) for line in response.text.splitlines()]
+    assert [frame["event"] for frame in frames] == ["requirement", "requirement", "summary"]
+    assert [frame["data"]["text"] for frame in frames[:2]] == [
+        "The system shall export reports as PDF", "Users can reset their password by email",
+    ]
+    summary = frames[-1]["data"]
+    assert summary["summary"]["total"] == 2
+    assert summary["filename"] == "spec.txt"
+    assert summary["history_id"] is not None
+    assert "requirements" not in summary
+
+
+def test_sse_frames(app):
+    response = post_stream(app, {"Accept": "text/event-stream", "X-Client-Id": "stream-test"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert [lines[0] for lines in events] == ["event: requirement", "event: requirement", "event: summary"]
+    assert all(lines[1].startswith("data: ") for lines in events)
+    assert json.loads(events[-1][1][len("data: "):])["summary"]["total"] == 2
+
+
+def test_errors_end_the_stream_with_an_error_frame(app, monkeypatch):
+    async def failing(text):
+        raise RuntimeError("extraction failed")
+        yield
+
+    monkeypatch.setattr(app.ml_pipeline, "stream_requirements", failing)
+    frames = [json.loads(line) for line in post_stream(app, {"X-Client-Id": "stream-test"}).text.splitlines()]
+    assert frames == [{"event": "error", "data": {"detail": "Error processing file: extraction failed"}}]
@@ -0,0 +1,47 @@
+import asyncio
+
+from services.ml_pipeline import MAX_SENTENCE_LENGTH, MLPipeline
+
+TEXT = (
+    "1. The system shall export reports as PDF, e.g. monthly summaries.\n"
+    "2. Users must reset their password by email within 2.5 minutes.\n"
+    "The app should support Chrome 90.1 and the U.S. locale! Is it fast?\n\n"
+    "REQ-7: Admins can delete inactive accounts\n"
+    "The service will be available 99.9% of the time."
+)
+
+
+def stream(pipeline: MLPipeline, source) -> list:
+    async def run():
+        return [requirement async for requirement in pipeline.stream_requirements(source)]
+    return asyncio.run(run())
+
+
+def test_chunked_extraction_matches_whole_text():
+    pipeline = MLPipeline(engine="heuristic")
+    whole = stream(pipeline, TEXT)
+    assert len(whole) == 4
+    # Every split point, including inside "e.g.", "2.5", "U.S." and between a period and its space
+    for split in range(1, len(TEXT)):
+        assert stream(pipeline, [TEXT[:split], TEXT[split:]]) == whole, f"split at {split}"
+    for size in (1, 3, 7, 64):
+        chunks = [TEXT[start:start + size] for start in range(0, len(TEXT), size)]
+        assert stream(pipeline, chunks) == whole, f"chunks of {size}"
+
+
+def test_sample_requirements_when_nothing_is_found():
+    pipeline = MLPipeline(engine="heuristic")
+    requirements = stream(pipeline, ["Meeting notes. ", "Nothing to see ", "here."])
+    assert requirements
+    assert [requirement.id for requirement in requirements] == [
+        f"REQ-{index:03d}" for index in range(1, len(requirements) + 1)
+    ]
+
+
+def test_run_on_text_is_cut_into_bounded_sentences():
+    pipeline = MLPipeline(engine="heuristic")
+    run_on = "the system shall log every event " * (3 * MAX_SENTENCE_LENGTH // 33)
+    chunks = [run_on[start:start + 4096] for start in range(0, len(run_on), 4096)]
+    requirements = stream(pipeline, chunks)
+    assert len(requirements) > 1
+    assert all(len(requirement.text) <= MAX_SENTENCE_LENGTH + 4096 for requirement in requirements)
@@ -0,0 +1,60 @@
+import codecs
+import io
+
+import pytest
+
+from services.text_decoder import detect_encoding, iter_decoded
+from services.text_normalizer import TextNormalizer, normalize_text
+
+TEXT = "The système shall log in users — über fast.\nÉtape 2: export reports.\n"
+
+
+def decode(data: bytes, chunk_size: int) -> str:
+    return "".join(iter_decoded(io.BytesIO(data), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("encoding,bom", [
+    ("utf-8", codecs.BOM_UTF8),
+    ("utf-16-le", codecs.BOM_UTF16_LE),
+    ("utf-16-be", codecs.BOM_UTF16_BE),
+    ("utf-32-le", codecs.BOM_UTF32_LE),
+    ("utf-32-be", codecs.BOM_UTF32_BE),
+])
+def test_byte_order_marks_are_detected_and_skipped(encoding, bom):
+    data = bom + TEXT.encode(encoding)
+    assert detect_encoding(data) == (encoding, len(bom))
+    assert decode(data, chunk_size=7) == TEXT
+
+
+def test_bom_less_utf16_and_plain_encodings():
+    assert detect_encoding(TEXT.encode("utf-16-le"))[0] == "utf-16-le"
+    assert detect_encoding(TEXT.encode("utf-16-be"))[0] == "utf-16-be"
+    assert detect_encoding(TEXT.encode("utf-8"))[0] == "utf-8"
+    assert detect_encoding("Ünïcödé requirements".encode("latin-1"))[0] == "latin-1"
+
+
+def test_multibyte_characters_split_across_chunks():
+    data = TEXT.encode("utf-8")
+    for chunk_size in (1, 2, 3, 5):
+        assert decode(data, chunk_size) == TEXT
+
+
+def test_invalid_utf8_after_the_sniffed_prefix_falls_back_to_latin1():
+    prefix = ("The system shall log in users. " * 3000).encode("utf-8")
+    data = prefix + "Café".encode("latin-1") + " ok".encode("utf-8")
+    assert decode(data, chunk_size=4096) == prefix.decode("utf-8") + "Café ok"
+
+
+RAW = "  The  system\tshall\r\nlog in users.\r\n\r\n\r\n  • Users   can\n\nexport ©reports.  \n"
+
+
+def test_normalizer_keeps_line_and_paragraph_breaks():
+    assert normalize_text(RAW) == "The system shall\nlog in users.\n\nUsers can\n\nexport reports."
+
+
+def test_normalizer_output_does_not_depend_on_chunking():
+    expected = normalize_text(RAW)
+    for size in (1, 2, 3, 7, 16):
+        normalizer = TextNormalizer()
+        pieces = [normalizer.feed(RAW[start:start + size]) for start in range(0, len(RAW), size)]
+        assert "".join(pieces) + normalizer.flush() == expected
@@ -0,0 +1,100 @@
+"""
+Train the local requirement classifier used by ML_ENGINE=local.
+
+Inputs are labeled JSONL files, one example per line:
+    {"text": "...", "is_requirement": true, "type": "Functional", "ambiguity": "Low"}
+and/or plain .txt documents, whose sentences are labeled by the keyword
+heuristics (a starting point until reviewed labels are available).
+
+Usage (from the backend directory):
+    python train_local_model.py specs/*.txt labeled.jsonl --output local_model.npz
+"""
+import argparse
+import json
+import random
+import time
+
+from services.local_model import (
+    LocalModel, DEFAULT_FEATURE_BITS, DEFAULT_EPOCHS, DEFAULT_LEARNING_RATE, DEFAULT_L2
+)
+from services.ml_pipeline import MLPipeline, HEURISTIC_ENGINE
+from services.text_decoder import iter_decoded
+from services.text_normalizer import normalize_text
+
+
+def load_jsonl(path: str) -> list:
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def label_document(path: str, pipeline: MLPipeline) -> list:
+    """Split a text document into sentences labeled by the heuristic pipeline."""
+    with open(path, "rb") as handle:
+        text = normalize_text("".join(iter_decoded(handle)))
+    examples = []
+    for sentence in pipeline._split_into_sentences(text):
+        requirement = pipeline._extract_requirement(sentence, 1)
+        example = {"text": sentence, "is_requirement": requirement is not None}
+        if requirement is not None:
+            example.update(type=requirement.type, ambiguity=requirement.ambiguity)
+        examples.append(example)
+    return examples
+
+
+def accuracy(model: LocalModel, examples: list) -> dict:
+    """Holdout accuracy of each head."""
+    if not examples:
+        return {}
+    prediction = model.predict([example["text"] for example in examples])
+    detected = prediction.requirement_probability >= 0.5
+    scores = {"requirement": sum(
+        bool(flag) == bool(example["is_requirement"]) for flag, example in zip(detected, examples)
+    ) / len(examples)}
+    requirements = [index for index, example in enumerate(examples) if example["is_requirement"]]
+    if requirements:
+        for head, predicted in [("type", prediction.types), ("ambiguity", prediction.ambiguity)]:
+            scores[head] = sum(predicted[index] == examples[index][head] for index in requirements) / len(requirements)
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("inputs", nargs="+", help=".jsonl labeled examples or .txt documents")
+    parser.add_argument("--output", default="local_model.npz")
+    parser.add_argument("--feature-bits", type=int, default=DEFAULT_FEATURE_BITS)
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    parser.add_argument("--learning-rate", type=float, default=DEFAULT_LEARNING_RATE)
+    parser.add_argument("--l2", type=float, default=DEFAULT_L2)
+    parser.add_argument("--holdout", type=float, default=0.1, help="fraction of examples kept for evaluation")
+    args = parser.parse_args()
+
+    pipeline = MLPipeline(engine=HEURISTIC_ENGINE)
+    examples = []
+    for path in args.inputs:
+        examples.extend(load_jsonl(path) if path.endswith(".jsonl") else label_document(path, pipeline))
+    random.Random(0).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout))
+    train, holdout = examples[:split], examples[split:]
+    print(f"Training on {len(train):,} sentences "
+          f"({sum(1 for example in train if example['is_requirement']):,} requirements), "
+          f"holding out {len(holdout):,}")
+
+    start = time.perf_counter()
+    try:
+        model = LocalModel.train(train, args.feature_bits, args.epochs, args.learning_rate, args.l2)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Trained in {time.perf_counter() - start:.1f}s")
+    for head, score in accuracy(model, holdout).items():
+        print(f"Holdout {head} accuracy: {score:.3f}")
+
+    sample = [example["text"] for example in (holdout or train)]
+    start = time.perf_counter()
+    model.predict(sample)
+    print(f"Inference: {(time.perf_counter() - start) / len(sample) * 1e6:.0f}us per sentence")
+    model.save(args.output)
+    print(f"Saved model to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,21 @@ const MAX_FILE_SIZE_MB = 10;
 const MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024;
 const HERO_LOGO_SIZE = 432; // px
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+const HISTORY_PAGE_SIZE = 20;
+const CLIENT_ID_KEY = 'clearreq-client-id';
+
+// History is kept per browser: the backend scopes analyses to this ID
+const getClientId = () => {
+  let clientId = localStorage.getItem(CLIENT_ID_KEY);
+  if (!clientId) {
+    clientId = window.crypto?.randomUUID
+      ? window.crypto.randomUUID()
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    localStorage.setItem(CLIENT_ID_KEY, clientId);
+  }
+  return clientId;
+};
+const CLIENT_HEADERS = { 'X-Client-Id': getClientId() };
 
 function App() {
   // File upload state
@@ -22,9 +37,12 @@ function App() {
   const [loading, setLoading] = useState(false);
   const [analysisResult, setAnalysisResult] = useState(null);
   const [history, setHistory] = useState([]);
+  const [historyCursor, setHistoryCursor] = useState(null);
   const [currentPage, setCurrentPage] = useState('home'); // 'home', 'results', 'history'
   const [searchQuery, setSearchQuery] = useState('');
   const fileInputRef = useRef();
+  // Last analysis and ETag per file, so re-analyzing an unchanged file is answered with 304
+  const analyzedFilesRef = useRef(new Map());
 
   // Filter requirements by search query (top-level, not inside renderResultsPage)
   const filteredRequirements = useMemo(() => {
@@ -37,18 +55,27 @@ function App() {
     );
   }, [analysisResult, searchQuery]);
 
-  // Load history from localStorage on mount
-  useEffect(() => {
-    const stored = localStorage.getItem('analysisHistory');
-    if (stored) {
-      setHistory(JSON.parse(stored));
+  // Load a page of history summaries from the API (full results are fetched on view)
+  const loadHistory = useCallback(async (cursor = null) => {
+    try {
+      const params = new URLSearchParams({ limit: HISTORY_PAGE_SIZE });
+      if (cursor !== null) params.set('cursor', cursor);
+      const response = await fetch(`${API_URL}/api/history?${params}`, { headers: CLIENT_HEADERS });
+      if (!response.ok) throw new Error('Failed to load history');
+      const page = await response.json();
+      setHistory(prev => (cursor === null ? page.items : [...prev, ...page.items]));
+      setHistoryCursor(page.next_cursor);
+    } catch (error) {
+      console.error('History error:', error);
     }
   }, []);
 
-  // Save history to localStorage when it changes
+  // Refresh history when the history page is opened
   useEffect(() => {
-    localStorage.setItem('analysisHistory', JSON.stringify(history));
-  }, [history]);
+    if (currentPage === 'history') {
+      loadHistory();
+    }
+  }, [currentPage, loadHistory]);
 
   // File validation
   const validateFile = useCallback((file) => {
@@ -112,26 +139,26 @@ function App() {
     try {
       const formData = new FormData();
       formData.append('file', selectedFile);
+      const fileKey = `${selectedFile.name}:${selectedFile.size}:${selectedFile.lastModified}`;
+      const previous = analyzedFilesRef.current.get(fileKey);
       const response = await fetch(`${API_URL}/api/analyze`, {
         method: 'POST',
+        headers: previous ? { ...CLIENT_HEADERS, 'If-None-Match': previous.etag } : CLIENT_HEADERS,
         body: formData,
       });
-      if (!response.ok) {
+      let result;
+      if (response.status === 304 && previous) {
+        result = previous.result;
+      } else if (!response.ok) {
         const errorData = await response.json();
         throw new Error(errorData.detail || 'Failed to analyze document');
+      } else {
+        result = await response.json();
+        const etag = response.headers.get('ETag');
+        if (etag) analyzedFilesRef.current.set(fileKey, { etag, result });
       }
-      const result = await response.json();
       setAnalysisResult(result);
       setCurrentPage('results');
-      setHistory(prev => [
-        {
-          id: Date.now(),
-          fileName: selectedFile.name,
-          timestamp: new Date().toISOString(),
-          result,
-        },
-        ...prev,
-      ]);
     } catch (error) {
       console.error('Analysis error:', error);
       setError(error.message || 'Failed to analyze document. Please try again.');
@@ -141,8 +168,15 @@ function App() {
   }, [selectedFile]);
 
   // Clear history
-  const handleClearHistory = useCallback(() => {
-    setHistory([]);
+  const handleClearHistory = useCallback(async () => {
+    try {
+      const response = await fetch(`${API_URL}/api/history`, { method: 'DELETE', headers: CLIENT_HEADERS });
+      if (!response.ok) throw new Error('Failed to clear history');
+      setHistory([]);
+      setHistoryCursor(null);
+    } catch (error) {
+      console.error('History error:', error);
+    }
   }, []);
 
   // Format date
@@ -401,9 +435,15 @@ function App() {
   );
 
   // Render History Page
-  const handleViewResult = useCallback((item) => {
-    setAnalysisResult(item.result);
-    setCurrentPage('results');
+  const handleViewResult = useCallback(async (item) => {
+    try {
+      const response = await fetch(`${API_URL}/api/history/${item.id}`, { headers: CLIENT_HEADERS });
+      if (!response.ok) throw new Error('Failed to load analysis');
+      setAnalysisResult(await response.json());
+      setCurrentPage('results');
+    } catch (error) {
+      console.error('History error:', error);
+    }
   }, []);
   const handleDownload = useCallback((item) => {
     // Stub: implement download logic if needed
@@ -416,6 +456,7 @@ function App() {
           onViewResult={handleViewResult}
           onDownload={handleDownload}
           onClear={handleClearHistory}
+          onLoadMore={historyCursor !== null ? () => loadHistory(historyCursor) : undefined}
         />
       </div>
     </div>
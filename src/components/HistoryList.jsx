@@ -1,7 +1,7 @@
 import React from 'react';
 import PropTypes from 'prop-types';
 
-const HistoryList = ({ history, onViewResult, onDownload, onClear }) => (
+const HistoryList = ({ history, onViewResult, onDownload, onClear, onLoadMore }) => (
   <div className="bg-white/60 backdrop-blur-lg rounded-2xl shadow-xl border border-gray-200 p-4">
     {history.length === 0 ? (
       <div className="p-8 flex flex-col items-center">
@@ -24,7 +24,7 @@ const HistoryList = ({ history, onViewResult, onDownload, onClear }) => (
           {history.map(item => (
             <li key={item.id} className="border-b last:border-b-0 py-3 flex flex-col sm:flex-row sm:items-center sm:justify-between">
               <div>
-                <span className="font-medium text-gray-700">{item.fileName}</span>
+                <span className="font-medium text-gray-700">{item.filename}</span>
                 <span className="ml-2 text-xs text-gray-400">{new Date(item.timestamp).toLocaleString()}</span>
               </div>
               <div className="mt-2 sm:mt-0 flex space-x-2">
@@ -44,6 +44,16 @@ const HistoryList = ({ history, onViewResult, onDownload, onClear }) => (
             </li>
           ))}
         </ul>
+        {onLoadMore && (
+          <div className="flex justify-center mt-4">
+            <button 
+              className="text-sm bg-white text-[#2563eb] border border-[#2563eb] px-4 py-2 rounded-lg shadow hover:bg-[#eff6ff] focus:outline-none focus-visible:ring-2 focus-visible:ring-[#2563eb] focus-visible:ring-offset-2 active:scale-95 transition-all duration-150"
+              onClick={onLoadMore}
+            >
+              Load More
+            </button>
+          </div>
+        )}
       </>
     )}
   </div>
@@ -53,7 +63,8 @@ HistoryList.propTypes = {
   history: PropTypes.array.isRequired,
   onViewResult: PropTypes.func.isRequired,
   onDownload: PropTypes.func.isRequired,
-  onClear: PropTypes.func.isRequired
+  onClear: PropTypes.func.isRequired,
+  onLoadMore: PropTypes.func
 };
 
 export default HistoryList; 
\ No newline at end of file